@@ -0,0 +1,281 @@
+"""Keyset (cursor) pagination for ``data_views.search_all_v2``.
+
+Deep pages used ``OFFSET (page - 1) * page_size`` over the seven-way UNION, so
+every request for page N ranked and discarded all rows of pages 1..N-1.
+
+The ORDER BY introduced in revision ``202604251100`` is rewritten as an
+all-ascending sort key so it can be compared with a single row constructor:
+
+    (bucket, case_rank_key, date_key, -rank, table_name, record_id)
+
+  - ``bucket``        -- 0 default, 1 leading Court Decisions (case_rank <= 5),
+                         2 "no data" Answers (unchanged demotion rules)
+  - ``case_rank_key`` -- ``-case_rank`` inside bucket 1, 0 elsewhere
+  - ``date_key``      -- days before 2000-01-01 when ``sort_by_date`` (NULL
+                         dates sort last), 0 otherwise
+  - ``-rank``         -- relevance, highest first
+
+The ordering is identical to the previous revision. Each returned row carries
+its key as ``sort_key`` (a JSONB array); passing the last row's key back as
+``after_key`` continues the listing with a row comparison instead of an
+OFFSET. ``page`` is ignored when ``after_key`` is set.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610170900"
+down_revision = "202604262200"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_ALL_V2_KEYSET = """
+DROP FUNCTION IF EXISTS data_views.search_all_v2(text, text[], text[], text[], integer, integer, boolean);
+
+CREATE OR REPLACE FUNCTION data_views.search_all_v2(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    page INT DEFAULT 1,
+    page_size INT DEFAULT 50,
+    sort_by_date BOOLEAN DEFAULT FALSE,
+    after_key JSONB DEFAULT NULL
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    sort_key JSONB
+) AS $$
+DECLARE
+    empty_term BOOLEAN := (search_term IS NULL OR btrim(search_term) = '');
+    offset_val INT := CASE WHEN after_key IS NULL THEN (page - 1) * page_size ELSE 0 END;
+BEGIN
+    RETURN QUERY
+    WITH matches AS (
+        SELECT sub.*
+        FROM (
+            SELECT
+                'Answers'::text AS table_name,
+                a.id AS record_id,
+                to_jsonb(a.*) || jsonb_build_object(
+                    'question', sv."Questions",
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN empty_term THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_answers a
+            JOIN data_views.answers sv ON sv.id = a.id
+            WHERE (empty_term OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Answers' = ANY(filter_tables))
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM p1q5x3pj29vkrdr."_nc_m2m_Jurisdictions_Answers" ja
+                  JOIN p1q5x3pj29vkrdr."Jurisdictions" j ON j.id = ja."Jurisdictions_id"
+                  WHERE ja."Answers_id" = a.id
+                    AND COALESCE(j."Irrelevant_", FALSE) = TRUE
+              )
+              AND (filter_jurisdictions IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_jurisdictions) AS jf
+                   WHERE sv."Jurisdictions" ILIKE '%'||jf||'%'
+              ))
+              AND (filter_themes IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_themes) AS tf
+                   WHERE sv."Themes" ILIKE '%'||tf||'%'
+              ))
+
+            UNION ALL
+
+            SELECT
+                'HCCH Answers'::text AS table_name,
+                ha.id AS record_id,
+                to_jsonb(ha.*) || jsonb_build_object(
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN empty_term THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_hcch_answers ha
+            JOIN data_views.hcch_answers sv ON sv.id = ha.id
+            WHERE (empty_term OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'HCCH Answers' = ANY(filter_tables))
+              AND (filter_themes IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_themes) AS tf
+                   WHERE sv."Themes" ILIKE '%'||tf||'%'
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Court Decisions'::text AS table_name,
+                cd.id AS record_id,
+                to_jsonb(cd.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN empty_term THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_court_decisions cd
+            JOIN data_views.court_decisions sv ON sv.id = cd.id
+            WHERE (empty_term OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Court Decisions' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_jurisdictions) AS jf
+                   WHERE sv."Jurisdictions" ILIKE '%'||jf||'%'
+              ))
+              AND (filter_themes IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_themes) AS tf
+                   WHERE sv."Themes" ILIKE '%'||tf||'%'
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Domestic Instruments'::text AS table_name,
+                di.id AS record_id,
+                to_jsonb(di.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions"
+                ) AS complete_record,
+                CASE WHEN empty_term THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_domestic_instruments di
+            JOIN data_views.domestic_instruments sv ON sv.id = di.id
+            WHERE (empty_term OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Domestic Instruments' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_jurisdictions) AS jf
+                   WHERE sv."Jurisdictions" ILIKE '%'||jf||'%'
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Regional Instruments'::text AS table_name,
+                ri.id AS record_id,
+                to_jsonb(ri.*) AS complete_record,
+                CASE WHEN empty_term THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_regional_instruments ri
+            JOIN data_views.regional_instruments sv ON sv.id = ri.id
+            WHERE (empty_term OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Regional Instruments' = ANY(filter_tables))
+
+            UNION ALL
+
+            SELECT
+                'International Instruments'::text AS table_name,
+                ii.id AS record_id,
+                to_jsonb(ii.*) AS complete_record,
+                CASE WHEN empty_term THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_international_instruments ii
+            JOIN data_views.international_instruments sv ON sv.id = ii.id
+            WHERE (empty_term OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'International Instruments' = ANY(filter_tables))
+
+            UNION ALL
+
+            SELECT
+                'Literature'::text AS table_name,
+                l.id AS record_id,
+                to_jsonb(l.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN empty_term THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_literature l
+            JOIN data_views.literature sv ON sv.id = l.id
+            WHERE (empty_term OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Literature' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_jurisdictions) AS jf
+                   WHERE sv."Jurisdictions" ILIKE '%'||jf||'%'
+              ))
+              AND (filter_themes IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_themes) AS tf
+                   WHERE sv."Themes" ILIKE '%'||tf||'%'
+              ))
+
+        ) AS sub
+    ),
+    keyed AS (
+        SELECT
+            m.*,
+            CASE
+                WHEN m.table_name = 'Answers'
+                     AND btrim(COALESCE(m.complete_record->>'answer', '')) ILIKE '%no data%'
+                THEN 2
+                WHEN m.table_name = 'Court Decisions'
+                     AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+                THEN 1
+                ELSE 0
+            END AS k_bucket,
+            CASE
+                WHEN m.table_name = 'Court Decisions'
+                     AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+                THEN -((m.complete_record->>'case_rank')::numeric)
+                ELSE 0
+            END AS k_case_rank,
+            CASE
+                WHEN NOT sort_by_date THEN 0
+                ELSE COALESCE(DATE '2000-01-01' - m.result_date, 2147483647)
+            END AS k_date,
+            (-m.rank)::real AS k_rank
+        FROM matches m
+    )
+    SELECT
+        k.table_name,
+        k.record_id,
+        k.complete_record,
+        k.rank,
+        k.result_date,
+        jsonb_build_array(k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) AS sort_key
+    FROM keyed k
+    WHERE after_key IS NULL
+       OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+              (after_key->>0)::int,
+              (after_key->>1)::numeric,
+              (after_key->>2)::int,
+              (after_key->>3)::real,
+              after_key->>4,
+              (after_key->>5)::int
+          )
+    ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+    LIMIT page_size OFFSET offset_val;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_ALL_V2_KEYSET)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP FUNCTION IF EXISTS data_views.search_all_v2(text, text[], text[], text[], integer, integer, boolean, jsonb);"
+    )
+    prev = importlib.import_module("alembic_views.versions.202604251100_search_pagination_tiebreaker")
+    op.execute(prev.SEARCH_ALL_V3_WITH_TIEBREAKER)
@@ -0,0 +1,344 @@
+"""Return the total match count from ``data_views.search_all_v2`` itself.
+
+``SearchService.full_text_search`` used to call ``search_all_count_v2`` and
+then ``search_all_v2``, so every search evaluated the seven-way FTS + filter
+UNION twice. This revision:
+
+  - moves the UNION and the keyset sort key columns (revision
+    ``202610170900``) into ``data_views._search_matches``, an inlinable SQL
+    function shared by the search entry points;
+  - adds a ``total_count`` column to ``search_all_v2``. With
+    ``exact_count => TRUE`` (default) it is ``count(*) OVER ()`` over the
+    match set, computed before the keyset/OFFSET cut, so the page and the
+    total come back in one round trip;
+  - with ``exact_count => FALSE`` the total is the planner's row estimate for
+    the match set (``EXPLAIN``, no execution), which is good enough for a
+    "~12,000 results" label on broad queries and skips the window aggregate.
+
+``search_all_count_v2`` is left in place for ad-hoc use.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610171000"
+down_revision = "202610170900"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_MATCHES = """
+CREATE OR REPLACE FUNCTION data_views._search_matches(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    sort_by_date BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    k_bucket INTEGER,
+    k_case_rank NUMERIC,
+    k_date INTEGER,
+    k_rank REAL
+) AS $$
+    SELECT
+        m.table_name,
+        m.record_id,
+        m.complete_record,
+        m.rank::real,
+        m.result_date,
+        CASE
+            WHEN m.table_name = 'Answers'
+                 AND btrim(COALESCE(m.complete_record->>'answer', '')) ILIKE '%no data%'
+            THEN 2
+            WHEN m.table_name = 'Court Decisions'
+                 AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+            THEN 1
+            ELSE 0
+        END AS k_bucket,
+        CASE
+            WHEN m.table_name = 'Court Decisions'
+                 AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+            THEN -((m.complete_record->>'case_rank')::numeric)
+            ELSE 0
+        END AS k_case_rank,
+        CASE
+            WHEN NOT sort_by_date THEN 0
+            ELSE COALESCE(DATE '2000-01-01' - m.result_date, 2147483647)
+        END AS k_date,
+        (-m.rank)::real AS k_rank
+    FROM (
+            SELECT
+                'Answers'::text AS table_name,
+                a.id AS record_id,
+                to_jsonb(a.*) || jsonb_build_object(
+                    'question', sv."Questions",
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_answers a
+            JOIN data_views.answers sv ON sv.id = a.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Answers' = ANY(filter_tables))
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM p1q5x3pj29vkrdr."_nc_m2m_Jurisdictions_Answers" ja
+                  JOIN p1q5x3pj29vkrdr."Jurisdictions" j ON j.id = ja."Jurisdictions_id"
+                  WHERE ja."Answers_id" = a.id
+                    AND COALESCE(j."Irrelevant_", FALSE) = TRUE
+              )
+              AND (filter_jurisdictions IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_jurisdictions) AS jf
+                   WHERE sv."Jurisdictions" ILIKE '%'||jf||'%'
+              ))
+              AND (filter_themes IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_themes) AS tf
+                   WHERE sv."Themes" ILIKE '%'||tf||'%'
+              ))
+
+            UNION ALL
+
+            SELECT
+                'HCCH Answers'::text AS table_name,
+                ha.id AS record_id,
+                to_jsonb(ha.*) || jsonb_build_object(
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_hcch_answers ha
+            JOIN data_views.hcch_answers sv ON sv.id = ha.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'HCCH Answers' = ANY(filter_tables))
+              AND (filter_themes IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_themes) AS tf
+                   WHERE sv."Themes" ILIKE '%'||tf||'%'
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Court Decisions'::text AS table_name,
+                cd.id AS record_id,
+                to_jsonb(cd.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_court_decisions cd
+            JOIN data_views.court_decisions sv ON sv.id = cd.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Court Decisions' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_jurisdictions) AS jf
+                   WHERE sv."Jurisdictions" ILIKE '%'||jf||'%'
+              ))
+              AND (filter_themes IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_themes) AS tf
+                   WHERE sv."Themes" ILIKE '%'||tf||'%'
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Domestic Instruments'::text AS table_name,
+                di.id AS record_id,
+                to_jsonb(di.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_domestic_instruments di
+            JOIN data_views.domestic_instruments sv ON sv.id = di.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Domestic Instruments' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_jurisdictions) AS jf
+                   WHERE sv."Jurisdictions" ILIKE '%'||jf||'%'
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Regional Instruments'::text AS table_name,
+                ri.id AS record_id,
+                to_jsonb(ri.*) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_regional_instruments ri
+            JOIN data_views.regional_instruments sv ON sv.id = ri.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Regional Instruments' = ANY(filter_tables))
+
+            UNION ALL
+
+            SELECT
+                'International Instruments'::text AS table_name,
+                ii.id AS record_id,
+                to_jsonb(ii.*) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_international_instruments ii
+            JOIN data_views.international_instruments sv ON sv.id = ii.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'International Instruments' = ANY(filter_tables))
+
+            UNION ALL
+
+            SELECT
+                'Literature'::text AS table_name,
+                l.id AS record_id,
+                to_jsonb(l.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_literature l
+            JOIN data_views.literature sv ON sv.id = l.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Literature' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_jurisdictions) AS jf
+                   WHERE sv."Jurisdictions" ILIKE '%'||jf||'%'
+              ))
+              AND (filter_themes IS NULL OR EXISTS (
+                   SELECT 1 FROM unnest(filter_themes) AS tf
+                   WHERE sv."Themes" ILIKE '%'||tf||'%'
+              ))
+
+    ) AS m
+$$ LANGUAGE sql STABLE;
+"""
+
+
+SEARCH_ALL_V2_WITH_TOTAL = """
+DROP FUNCTION IF EXISTS data_views.search_all_v2(text, text[], text[], text[], integer, integer, boolean, jsonb);
+
+CREATE OR REPLACE FUNCTION data_views.search_all_v2(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    page INT DEFAULT 1,
+    page_size INT DEFAULT 50,
+    sort_by_date BOOLEAN DEFAULT FALSE,
+    after_key JSONB DEFAULT NULL,
+    exact_count BOOLEAN DEFAULT TRUE
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    sort_key JSONB,
+    total_count BIGINT
+) AS $$
+DECLARE
+    offset_val INT := CASE WHEN after_key IS NULL THEN (page - 1) * page_size ELSE 0 END;
+    plan JSONB;
+    estimated BIGINT;
+BEGIN
+    IF exact_count THEN
+        RETURN QUERY
+        SELECT
+            k.table_name,
+            k.record_id,
+            k.complete_record,
+            k.rank,
+            k.result_date,
+            jsonb_build_array(k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id),
+            k.total
+        FROM (
+            SELECT m.*, count(*) OVER () AS total
+            FROM data_views._search_matches(
+                search_term, filter_tables, filter_jurisdictions, filter_themes, sort_by_date
+            ) m
+        ) k
+        WHERE after_key IS NULL
+           OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+                  (after_key->>0)::int,
+                  (after_key->>1)::numeric,
+                  (after_key->>2)::int,
+                  (after_key->>3)::real,
+                  after_key->>4,
+                  (after_key->>5)::int
+              )
+        ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+        LIMIT page_size OFFSET offset_val;
+        RETURN;
+    END IF;
+
+    EXECUTE format(
+        'EXPLAIN (FORMAT JSON) SELECT 1 FROM data_views._search_matches(%L, %L, %L, %L)',
+        search_term, filter_tables, filter_jurisdictions, filter_themes
+    ) INTO plan;
+    estimated := (plan->0->'Plan'->>'Plan Rows')::numeric::bigint;
+
+    RETURN QUERY
+    SELECT
+        k.table_name,
+        k.record_id,
+        k.complete_record,
+        k.rank,
+        k.result_date,
+        jsonb_build_array(k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id),
+        estimated
+    FROM data_views._search_matches(
+        search_term, filter_tables, filter_jurisdictions, filter_themes, sort_by_date
+    ) k
+    WHERE after_key IS NULL
+       OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+              (after_key->>0)::int,
+              (after_key->>1)::numeric,
+              (after_key->>2)::int,
+              (after_key->>3)::real,
+              after_key->>4,
+              (after_key->>5)::int
+          )
+    ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+    LIMIT page_size OFFSET offset_val;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_MATCHES)
+    op.execute(SEARCH_ALL_V2_WITH_TOTAL)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP FUNCTION IF EXISTS data_views.search_all_v2("
+        "text, text[], text[], text[], integer, integer, boolean, jsonb, boolean);"
+    )
+    op.execute("DROP FUNCTION IF EXISTS data_views._search_matches(text, text[], text[], text[], boolean);")
+    prev = importlib.import_module("alembic_views.versions.202610170900_search_keyset_cursor")
+    op.execute(prev.SEARCH_ALL_V2_KEYSET)
@@ -0,0 +1,116 @@
+"""Track materialized-view refresh generations and announce them.
+
+``data_views.refresh_all_materialized_views()`` (revision ``202603071000``)
+rebuilds every materialized view in ``data_views`` but leaves no trace of
+when it last completed, so the API cannot tell whether a cached search
+response or an ETag computed earlier is still current.
+
+This migration adds a single-row ``data_views.refresh_generation`` table and
+re-creates the refresh function so that, after the last view is refreshed,
+it increments ``generation``, stamps ``refreshed_at`` and sends
+``NOTIFY data_views_refreshed, '<generation>'``. Notifications are delivered
+on commit, so listeners only ever see a generation whose views are already
+visible. The backend's ``DatabaseManager`` listens on the channel and exposes
+the current value to services as ``db_manager.refresh_generation``.
+
+The view-refresh loop itself is unchanged.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610171100"
+down_revision = "202610171000"
+branch_labels = None
+depends_on = None
+
+
+REFRESH_GENERATION_TABLE = """
+CREATE TABLE IF NOT EXISTS data_views.refresh_generation (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    generation BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+INSERT INTO data_views.refresh_generation (id) VALUES (TRUE) ON CONFLICT (id) DO NOTHING;
+"""
+
+REFRESH_ALL_WITH_GENERATION = """
+CREATE OR REPLACE FUNCTION data_views.refresh_all_materialized_views()
+RETURNS void AS $$
+DECLARE
+    view_name TEXT;
+    has_unique_index BOOLEAN;
+    new_generation BIGINT;
+BEGIN
+    FOR view_name IN
+        SELECT matviewname FROM pg_matviews WHERE schemaname = 'data_views'
+    LOOP
+        SELECT EXISTS (
+            SELECT 1 FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = 'data_views'
+            AND t.relname = view_name
+            AND i.indisunique
+        ) INTO has_unique_index;
+
+        IF has_unique_index THEN
+            EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY data_views.%I', view_name);
+        ELSE
+            EXECUTE format('REFRESH MATERIALIZED VIEW data_views.%I', view_name);
+            RAISE NOTICE 'Materialized view data_views.% refreshed non-concurrently (no unique index)', view_name;
+        END IF;
+    END LOOP;
+
+    UPDATE data_views.refresh_generation
+    SET generation = generation + 1, refreshed_at = now()
+    WHERE id
+    RETURNING generation INTO new_generation;
+
+    PERFORM pg_notify('data_views_refreshed', new_generation::text);
+END;
+$$ LANGUAGE plpgsql
+"""
+
+REFRESH_ALL_ORIGINAL = """
+CREATE OR REPLACE FUNCTION data_views.refresh_all_materialized_views()
+RETURNS void AS $$
+DECLARE
+    view_name TEXT;
+    has_unique_index BOOLEAN;
+BEGIN
+    FOR view_name IN
+        SELECT matviewname FROM pg_matviews WHERE schemaname = 'data_views'
+    LOOP
+        SELECT EXISTS (
+            SELECT 1 FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = 'data_views'
+            AND t.relname = view_name
+            AND i.indisunique
+        ) INTO has_unique_index;
+
+        IF has_unique_index THEN
+            EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY data_views.%I', view_name);
+        ELSE
+            EXECUTE format('REFRESH MATERIALIZED VIEW data_views.%I', view_name);
+            RAISE NOTICE 'Materialized view data_views.% refreshed non-concurrently (no unique index)', view_name;
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(REFRESH_GENERATION_TABLE)
+    op.execute(REFRESH_ALL_WITH_GENERATION)
+
+
+def downgrade() -> None:
+    op.execute(REFRESH_ALL_ORIGINAL)
+    op.execute("DROP TABLE IF EXISTS data_views.refresh_generation")
@@ -0,0 +1,71 @@
+"""Materialize entity/theme membership for theme-filtered entity lists.
+
+Revision ``202604261900`` centralised the theme-filter join chains in
+``data_views.entity_has_theme(slug, entity_id, theme)``. Entity lists call it
+as a WHERE predicate, so Postgres evaluates the plpgsql function once per
+candidate row of the base view — for Court Decisions that is a four-table
+walk (Court_Decisions ← Answers ← Questions ← Themes) per row, for both the
+page query and the count query.
+
+This migration precomputes the same relation as the materialized view
+``data_views.entity_theme_membership (slug, entity_id, theme)``:
+  - ``court-decisions``  → Court_Decisions ← Answers ← Questions ← Themes
+  - ``literature``       → Literature ← Themes (direct)
+  - ``arbitral-awards``  → Arbitral_Awards ← Themes (direct)
+
+The unique index on ``(slug, theme, entity_id)`` serves the
+``EXISTS (... WHERE slug = :slug AND theme = :theme AND entity_id = b.id)``
+semi-join used by ``backend/app/services/entity_list.py`` and lets
+``data_views.refresh_all_materialized_views()`` refresh it concurrently with
+the other views.
+
+``entity_has_theme`` is kept for ad-hoc callers; its semantics (and the slug
+list) must stay in sync with this view.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610171200"
+down_revision = "202610171100"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "p1q5x3pj29vkrdr"
+
+ENTITY_THEME_MEMBERSHIP = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS data_views.entity_theme_membership AS
+SELECT DISTINCT 'court-decisions'::text AS slug, acd."Court_Decisions_id"::int AS entity_id, t."Theme"::text AS theme
+FROM "{SCHEMA}"."_nc_m2m_Answers_Court_Decisions" acd
+JOIN "{SCHEMA}"."_nc_m2m_Questions_Answers" qa ON qa."Answers_id" = acd."Answers_id"
+JOIN "{SCHEMA}"."_nc_m2m_Themes_Questions" tq ON tq."Questions_id" = qa."Questions_id"
+JOIN "{SCHEMA}"."Themes" t ON t.id = tq."Themes_id"
+WHERE acd."Court_Decisions_id" IS NOT NULL AND t."Theme" IS NOT NULL
+UNION
+SELECT 'literature', m."Literature_id"::int, t."Theme"::text
+FROM "{SCHEMA}"."_nc_m2m_Themes_Literature" m
+JOIN "{SCHEMA}"."Themes" t ON t.id = m."Themes_id"
+WHERE m."Literature_id" IS NOT NULL AND t."Theme" IS NOT NULL
+UNION
+SELECT 'arbitral-awards', m."Arbitral_Awards_id"::int, t."Theme"::text
+FROM "{SCHEMA}"."_nc_m2m_Themes_Arbitral_Awards" m
+JOIN "{SCHEMA}"."Themes" t ON t.id = m."Themes_id"
+WHERE m."Arbitral_Awards_id" IS NOT NULL AND t."Theme" IS NOT NULL
+"""
+
+ENTITY_THEME_MEMBERSHIP_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_entity_theme_membership_key "
+    "ON data_views.entity_theme_membership (slug, theme, entity_id)",
+    "CREATE INDEX IF NOT EXISTS idx_entity_theme_membership_entity ON data_views.entity_theme_membership (slug, entity_id)",
+]
+
+
+def upgrade() -> None:
+    op.execute(ENTITY_THEME_MEMBERSHIP)
+    for statement in ENTITY_THEME_MEMBERSHIP_INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.entity_theme_membership")
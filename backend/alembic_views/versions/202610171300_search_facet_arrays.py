@@ -0,0 +1,337 @@
+"""Filter full-text search by jurisdiction/theme arrays instead of ILIKE.
+
+``data_views._search_matches`` (revision ``202610171000``) filtered
+jurisdictions and themes with ``sv."Jurisdictions" ILIKE '%'||jf||'%'``
+against the `` | ``-joined text columns of the FTS views. That predicate can
+not use an index, is evaluated per matched row, and matches substrings:
+``Niger`` also returned Nigerian records.
+
+This revision adds ``data_views.search_record_facets``, one row per
+``(table_name, record_id)`` of a searchable record that has at least one
+jurisdiction or theme:
+  - ``jurisdiction_codes`` / ``jurisdiction_names`` / ``themes`` – display
+    arrays, built from the same M2M chains as the FTS views' text columns;
+  - ``jurisdiction_keys`` – lower-cased jurisdiction names *and* alpha-3
+    codes, so ``switzerland`` and ``che`` both select Swiss records;
+  - ``theme_keys`` – lower-cased theme names.
+
+Both key arrays carry GIN indexes, and ``_search_matches`` now filters with
+``sv.id IN (SELECT record_id ... WHERE keys && filter)``, i.e. exact,
+case-insensitive array overlap (any of the requested values). Callers must
+pass lower-cased, trimmed values; ``SearchService._extract_filters`` does.
+The unique ``(table_name, record_id)`` index lets
+``refresh_all_materialized_views()`` refresh the view concurrently.
+
+``search_all_count_v2`` keeps its substring semantics for ad-hoc use.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610171300"
+down_revision = "202610171200"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "p1q5x3pj29vkrdr"
+S = SCHEMA
+
+
+SEARCH_RECORD_FACETS = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS data_views.search_record_facets AS
+WITH jurisdiction_links(table_name, record_id, jurisdiction_id) AS (
+    SELECT 'Answers'::text, m."Answers_id", m."Jurisdictions_id"
+    FROM {S}."_nc_m2m_Jurisdictions_Answers" m
+    UNION ALL
+    SELECT 'Court Decisions', m."Court_Decisions_id", m."Jurisdictions_id"
+    FROM {S}."_nc_m2m_Jurisdictions_Court_Decisions" m
+    UNION ALL
+    SELECT 'Domestic Instruments', m."Domestic_Instruments_id", m."Jurisdictions_id"
+    FROM {S}."_nc_m2m_Jurisdictions_Domestic_Instru" m
+    UNION ALL
+    SELECT 'Literature', m."Literature_id", m."Jurisdictions_id"
+    FROM {S}."_nc_m2m_Jurisdictions_Literature" m
+),
+theme_links(table_name, record_id, theme_id) AS (
+    SELECT 'Answers'::text, qa."Answers_id", tq."Themes_id"
+    FROM {S}."_nc_m2m_Questions_Answers" qa
+    JOIN {S}."_nc_m2m_Themes_Questions" tq ON tq."Questions_id" = qa."Questions_id"
+    UNION ALL
+    SELECT 'HCCH Answers', m."HCCH_Answers_id", m."Themes_id"
+    FROM {S}."_nc_m2m_Themes_HCCH_Answers" m
+    UNION ALL
+    SELECT 'Court Decisions', acd."Court_Decisions_id", tq."Themes_id"
+    FROM {S}."_nc_m2m_Answers_Court_Decisions" acd
+    JOIN {S}."_nc_m2m_Questions_Answers" qa ON qa."Answers_id" = acd."Answers_id"
+    JOIN {S}."_nc_m2m_Themes_Questions" tq ON tq."Questions_id" = qa."Questions_id"
+    UNION ALL
+    SELECT 'Literature', m."Literature_id", m."Themes_id"
+    FROM {S}."_nc_m2m_Themes_Literature" m
+),
+jurisdiction_agg AS (
+    SELECT
+        jl.table_name,
+        jl.record_id,
+        ARRAY_AGG(DISTINCT upper(j."Alpha_3_Code")) FILTER (WHERE j."Alpha_3_Code" IS NOT NULL) AS codes,
+        ARRAY_AGG(DISTINCT j."Name") FILTER (WHERE j."Name" IS NOT NULL) AS names
+    FROM jurisdiction_links jl
+    JOIN {S}."Jurisdictions" j ON j.id = jl.jurisdiction_id
+    WHERE jl.record_id IS NOT NULL
+    GROUP BY jl.table_name, jl.record_id
+),
+theme_agg AS (
+    SELECT
+        tl.table_name,
+        tl.record_id,
+        ARRAY_AGG(DISTINCT t."Theme") FILTER (WHERE t."Theme" IS NOT NULL) AS themes
+    FROM theme_links tl
+    JOIN {S}."Themes" t ON t.id = tl.theme_id
+    WHERE tl.record_id IS NOT NULL
+    GROUP BY tl.table_name, tl.record_id
+)
+SELECT
+    COALESCE(ja.table_name, ta.table_name) AS table_name,
+    COALESCE(ja.record_id, ta.record_id)::int AS record_id,
+    COALESCE(ja.codes, '{{}}'::text[]) AS jurisdiction_codes,
+    COALESCE(ja.names, '{{}}'::text[]) AS jurisdiction_names,
+    COALESCE(ta.themes, '{{}}'::text[]) AS themes,
+    ARRAY(
+        SELECT DISTINCT lower(btrim(k))
+        FROM unnest(COALESCE(ja.names, '{{}}'::text[]) || COALESCE(ja.codes, '{{}}'::text[])) AS k
+    ) AS jurisdiction_keys,
+    ARRAY(
+        SELECT DISTINCT lower(btrim(k)) FROM unnest(COALESCE(ta.themes, '{{}}'::text[])) AS k
+    ) AS theme_keys
+FROM jurisdiction_agg ja
+FULL JOIN theme_agg ta ON ta.table_name = ja.table_name AND ta.record_id = ja.record_id
+"""
+
+SEARCH_RECORD_FACETS_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_search_record_facets_key ON data_views.search_record_facets (table_name, record_id)",
+    "CREATE INDEX IF NOT EXISTS idx_search_record_facets_jurisdictions "
+    "ON data_views.search_record_facets USING GIN (jurisdiction_keys)",
+    "CREATE INDEX IF NOT EXISTS idx_search_record_facets_themes ON data_views.search_record_facets USING GIN (theme_keys)",
+]
+
+
+SEARCH_MATCHES = """
+CREATE OR REPLACE FUNCTION data_views._search_matches(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    sort_by_date BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    k_bucket INTEGER,
+    k_case_rank NUMERIC,
+    k_date INTEGER,
+    k_rank REAL
+) AS $$
+    SELECT
+        m.table_name,
+        m.record_id,
+        m.complete_record,
+        m.rank::real,
+        m.result_date,
+        CASE
+            WHEN m.table_name = 'Answers'
+                 AND btrim(COALESCE(m.complete_record->>'answer', '')) ILIKE '%no data%'
+            THEN 2
+            WHEN m.table_name = 'Court Decisions'
+                 AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+            THEN 1
+            ELSE 0
+        END AS k_bucket,
+        CASE
+            WHEN m.table_name = 'Court Decisions'
+                 AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+            THEN -((m.complete_record->>'case_rank')::numeric)
+            ELSE 0
+        END AS k_case_rank,
+        CASE
+            WHEN NOT sort_by_date THEN 0
+            ELSE COALESCE(DATE '2000-01-01' - m.result_date, 2147483647)
+        END AS k_date,
+        (-m.rank)::real AS k_rank
+    FROM (
+            SELECT
+                'Answers'::text AS table_name,
+                a.id AS record_id,
+                to_jsonb(a.*) || jsonb_build_object(
+                    'question', sv."Questions",
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_answers a
+            JOIN data_views.answers sv ON sv.id = a.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Answers' = ANY(filter_tables))
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM p1q5x3pj29vkrdr."_nc_m2m_Jurisdictions_Answers" ja
+                  JOIN p1q5x3pj29vkrdr."Jurisdictions" j ON j.id = ja."Jurisdictions_id"
+                  WHERE ja."Answers_id" = a.id
+                    AND COALESCE(j."Irrelevant_", FALSE) = TRUE
+              )
+              AND (filter_jurisdictions IS NULL OR sv.id IN (
+                   SELECT f.record_id FROM data_views.search_record_facets f
+                   WHERE f.table_name = 'Answers' AND f.jurisdiction_keys && filter_jurisdictions
+              ))
+              AND (filter_themes IS NULL OR sv.id IN (
+                   SELECT f.record_id FROM data_views.search_record_facets f
+                   WHERE f.table_name = 'Answers' AND f.theme_keys && filter_themes
+              ))
+
+            UNION ALL
+
+            SELECT
+                'HCCH Answers'::text AS table_name,
+                ha.id AS record_id,
+                to_jsonb(ha.*) || jsonb_build_object(
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_hcch_answers ha
+            JOIN data_views.hcch_answers sv ON sv.id = ha.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'HCCH Answers' = ANY(filter_tables))
+              AND (filter_themes IS NULL OR sv.id IN (
+                   SELECT f.record_id FROM data_views.search_record_facets f
+                   WHERE f.table_name = 'HCCH Answers' AND f.theme_keys && filter_themes
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Court Decisions'::text AS table_name,
+                cd.id AS record_id,
+                to_jsonb(cd.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_court_decisions cd
+            JOIN data_views.court_decisions sv ON sv.id = cd.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Court Decisions' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR sv.id IN (
+                   SELECT f.record_id FROM data_views.search_record_facets f
+                   WHERE f.table_name = 'Court Decisions' AND f.jurisdiction_keys && filter_jurisdictions
+              ))
+              AND (filter_themes IS NULL OR sv.id IN (
+                   SELECT f.record_id FROM data_views.search_record_facets f
+                   WHERE f.table_name = 'Court Decisions' AND f.theme_keys && filter_themes
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Domestic Instruments'::text AS table_name,
+                di.id AS record_id,
+                to_jsonb(di.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_domestic_instruments di
+            JOIN data_views.domestic_instruments sv ON sv.id = di.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Domestic Instruments' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR sv.id IN (
+                   SELECT f.record_id FROM data_views.search_record_facets f
+                   WHERE f.table_name = 'Domestic Instruments' AND f.jurisdiction_keys && filter_jurisdictions
+              ))
+
+            UNION ALL
+
+            SELECT
+                'Regional Instruments'::text AS table_name,
+                ri.id AS record_id,
+                to_jsonb(ri.*) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_regional_instruments ri
+            JOIN data_views.regional_instruments sv ON sv.id = ri.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Regional Instruments' = ANY(filter_tables))
+
+            UNION ALL
+
+            SELECT
+                'International Instruments'::text AS table_name,
+                ii.id AS record_id,
+                to_jsonb(ii.*) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_international_instruments ii
+            JOIN data_views.international_instruments sv ON sv.id = ii.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'International Instruments' = ANY(filter_tables))
+
+            UNION ALL
+
+            SELECT
+                'Literature'::text AS table_name,
+                l.id AS record_id,
+                to_jsonb(l.*) || jsonb_build_object(
+                    'jurisdictions', sv."Jurisdictions",
+                    'themes', sv."Themes"
+                ) AS complete_record,
+                CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                     ELSE ts_rank(sv.document, plainto_tsquery('english', search_term))
+                END AS rank,
+                sv.sort_date AS result_date
+            FROM data_views.base_literature l
+            JOIN data_views.literature sv ON sv.id = l.id
+            WHERE ((search_term IS NULL OR btrim(search_term) = '') OR sv.document @@ plainto_tsquery('english', search_term))
+              AND (filter_tables IS NULL OR 'Literature' = ANY(filter_tables))
+              AND (filter_jurisdictions IS NULL OR sv.id IN (
+                   SELECT f.record_id FROM data_views.search_record_facets f
+                   WHERE f.table_name = 'Literature' AND f.jurisdiction_keys && filter_jurisdictions
+              ))
+              AND (filter_themes IS NULL OR sv.id IN (
+                   SELECT f.record_id FROM data_views.search_record_facets f
+                   WHERE f.table_name = 'Literature' AND f.theme_keys && filter_themes
+              ))
+
+    ) AS m
+$$ LANGUAGE sql STABLE;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_RECORD_FACETS)
+    for statement in SEARCH_RECORD_FACETS_INDEXES:
+        op.execute(statement)
+    op.execute(SEARCH_MATCHES)
+
+
+def downgrade() -> None:
+    prev = importlib.import_module("alembic_views.versions.202610171000_search_total_in_one_query")
+    op.execute(prev.SEARCH_MATCHES)
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.search_record_facets")
@@ -0,0 +1,69 @@
+"""Facet counts for a full-text search in one query.
+
+The search page wants hit counts per source table, jurisdiction and theme for
+the current query, but the only counting entry point,
+``search_all_count_v2``, returns a single total.
+
+``data_views.search_facets`` evaluates the shared match set
+(``data_views._search_matches``, revision ``202610171000``) once, joins each
+match to its jurisdiction/theme arrays in ``data_views.search_record_facets``
+(revision ``202610171300``) and aggregates every facet from that single,
+materialized scan. It returns long-format rows::
+
+    facet          value            hits
+    total          NULL             1234
+    table          Court Decisions   310
+    jurisdiction   Switzerland        87
+    theme          Party autonomy     54
+
+Counts respect all filters passed in, i.e. they describe the current result
+set; a record with several jurisdictions/themes counts once under each.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610171400"
+down_revision = "202610171300"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_FACETS = """
+CREATE OR REPLACE FUNCTION data_views.search_facets(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL
+)
+RETURNS TABLE(
+    facet TEXT,
+    value TEXT,
+    hits BIGINT
+) AS $$
+    WITH matches AS MATERIALIZED (
+        SELECT m.table_name, f.jurisdiction_names, f.themes
+        FROM data_views._search_matches(
+            search_term, filter_tables, filter_jurisdictions, filter_themes
+        ) m
+        LEFT JOIN data_views.search_record_facets f
+          ON f.table_name = m.table_name AND f.record_id = m.record_id
+    )
+    SELECT 'total'::text, NULL::text, count(*) FROM matches
+    UNION ALL
+    SELECT 'table', table_name, count(*) FROM matches GROUP BY table_name
+    UNION ALL
+    SELECT 'jurisdiction', j, count(*) FROM matches, unnest(jurisdiction_names) AS j GROUP BY j
+    UNION ALL
+    SELECT 'theme', t, count(*) FROM matches, unnest(themes) AS t GROUP BY t
+$$ LANGUAGE sql STABLE;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_FACETS)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS data_views.search_facets(text, text[], text[], text[]);")
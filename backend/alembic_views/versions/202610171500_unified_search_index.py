@@ -0,0 +1,285 @@
+"""Search one unified ``data_views.search_index`` instead of a seven-way UNION.
+
+``data_views._search_matches`` (revisions ``202610171000``/``202610171300``)
+unions seven branches — one per FTS view — and each branch evaluates its own
+``plainto_tsquery``, probes its own GIN index and joins its ``base_*`` view
+before the rows are ranked and paged together.
+
+This revision adds the materialized view ``data_views.search_index`` with one
+row per searchable record:
+
+  - ``table_name``, ``record_id``, ``document``, ``sort_date`` – copied from
+    the per-table FTS views;
+  - ``display`` – the extra search-result fields each branch used to build
+    with ``jsonb_build_object`` (question / jurisdictions / themes text);
+  - ``jurisdiction_keys`` / ``theme_keys`` – the filter keys of
+    ``data_views.search_record_facets`` (revision ``202610171300``). They are
+    NULL for tables the search never filtered by that facet (e.g. Regional
+    Instruments ignore the jurisdiction filter), preserving the old
+    semantics.
+
+Answers linked to an ``Irrelevant_`` jurisdiction are left out at refresh
+time instead of being excluded by a per-row NOT EXISTS at query time.
+
+``_search_matches`` now scans ``search_index`` once — one GIN probe on
+``document`` — and looks each match up in its own ``base_*`` view only to
+build ``complete_record``. Its signature and output are unchanged, so
+``search_all_v2`` and ``search_facets`` are untouched.
+
+``search_index`` is the first materialized view built on other
+materialized views, so ``refresh_all_materialized_views()`` now refreshes
+views in dependency order (followed through plain views) instead of
+catalog order; the generation bump and NOTIFY of revision ``202610171100``
+are kept.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610171500"
+down_revision = "202610171400"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "p1q5x3pj29vkrdr"
+S = SCHEMA
+
+
+SEARCH_INDEX = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS data_views.search_index AS
+SELECT
+    'Answers'::text AS table_name,
+    sv.id AS record_id,
+    sv.document,
+    sv.sort_date,
+    jsonb_build_object(
+        'question', sv."Questions",
+        'jurisdictions', sv."Jurisdictions",
+        'themes', sv."Themes"
+    ) AS display,
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]) AS jurisdiction_keys,
+    COALESCE(f.theme_keys, '{{}}'::text[]) AS theme_keys
+FROM data_views.answers sv
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Answers' AND f.record_id = sv.id
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM {S}."_nc_m2m_Jurisdictions_Answers" ja
+    JOIN {S}."Jurisdictions" j ON j.id = ja."Jurisdictions_id"
+    WHERE ja."Answers_id" = sv.id
+      AND COALESCE(j."Irrelevant_", FALSE) = TRUE
+)
+
+UNION ALL
+
+SELECT
+    'HCCH Answers', sv.id, sv.document, sv.sort_date,
+    jsonb_build_object('themes', sv."Themes"),
+    NULL::text[],
+    COALESCE(f.theme_keys, '{{}}'::text[])
+FROM data_views.hcch_answers sv
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'HCCH Answers' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT
+    'Court Decisions', sv.id, sv.document, sv.sort_date,
+    jsonb_build_object('jurisdictions', sv."Jurisdictions", 'themes', sv."Themes"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    COALESCE(f.theme_keys, '{{}}'::text[])
+FROM data_views.court_decisions sv
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Court Decisions' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT
+    'Domestic Instruments', sv.id, sv.document, sv.sort_date,
+    jsonb_build_object('jurisdictions', sv."Jurisdictions"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    NULL::text[]
+FROM data_views.domestic_instruments sv
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Domestic Instruments' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT 'Regional Instruments', sv.id, sv.document, sv.sort_date, '{{}}'::jsonb, NULL::text[], NULL::text[]
+FROM data_views.regional_instruments sv
+
+UNION ALL
+
+SELECT 'International Instruments', sv.id, sv.document, sv.sort_date, '{{}}'::jsonb, NULL::text[], NULL::text[]
+FROM data_views.international_instruments sv
+
+UNION ALL
+
+SELECT
+    'Literature', sv.id, sv.document, sv.sort_date,
+    jsonb_build_object('jurisdictions', sv."Jurisdictions", 'themes', sv."Themes"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    COALESCE(f.theme_keys, '{{}}'::text[])
+FROM data_views.literature sv
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Literature' AND f.record_id = sv.id
+"""
+
+SEARCH_INDEX_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_search_index_key ON data_views.search_index (table_name, record_id)",
+    "CREATE INDEX IF NOT EXISTS idx_search_index_document ON data_views.search_index USING GIN (document)",
+    "CREATE INDEX IF NOT EXISTS idx_search_index_jurisdictions ON data_views.search_index USING GIN (jurisdiction_keys)",
+    "CREATE INDEX IF NOT EXISTS idx_search_index_themes ON data_views.search_index USING GIN (theme_keys)",
+]
+
+
+SEARCH_MATCHES = """
+CREATE OR REPLACE FUNCTION data_views._search_matches(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    sort_by_date BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    k_bucket INTEGER,
+    k_case_rank NUMERIC,
+    k_date INTEGER,
+    k_rank REAL
+) AS $$
+    SELECT
+        m.table_name,
+        m.record_id,
+        m.complete_record,
+        m.rank::real,
+        m.result_date,
+        CASE
+            WHEN m.table_name = 'Answers'
+                 AND btrim(COALESCE(m.complete_record->>'answer', '')) ILIKE '%no data%'
+            THEN 2
+            WHEN m.table_name = 'Court Decisions'
+                 AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+            THEN 1
+            ELSE 0
+        END AS k_bucket,
+        CASE
+            WHEN m.table_name = 'Court Decisions'
+                 AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+            THEN -((m.complete_record->>'case_rank')::numeric)
+            ELSE 0
+        END AS k_case_rank,
+        CASE
+            WHEN NOT sort_by_date THEN 0
+            ELSE COALESCE(DATE '2000-01-01' - m.result_date, 2147483647)
+        END AS k_date,
+        (-m.rank)::real AS k_rank
+    FROM (
+        SELECT
+            si.table_name,
+            si.record_id,
+            CASE si.table_name
+                WHEN 'Answers' THEN (SELECT to_jsonb(b.*) FROM data_views.base_answers b WHERE b.id = si.record_id)
+                WHEN 'HCCH Answers' THEN (SELECT to_jsonb(b.*) FROM data_views.base_hcch_answers b WHERE b.id = si.record_id)
+                WHEN 'Court Decisions' THEN (SELECT to_jsonb(b.*) FROM data_views.base_court_decisions b WHERE b.id = si.record_id)
+                WHEN 'Domestic Instruments' THEN (SELECT to_jsonb(b.*) FROM data_views.base_domestic_instruments b WHERE b.id = si.record_id)
+                WHEN 'Regional Instruments' THEN (SELECT to_jsonb(b.*) FROM data_views.base_regional_instruments b WHERE b.id = si.record_id)
+                WHEN 'International Instruments' THEN (SELECT to_jsonb(b.*) FROM data_views.base_international_instruments b WHERE b.id = si.record_id)
+                WHEN 'Literature' THEN (SELECT to_jsonb(b.*) FROM data_views.base_literature b WHERE b.id = si.record_id)
+            END || si.display AS complete_record,
+            CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                 ELSE ts_rank(si.document, plainto_tsquery('english', search_term))
+            END AS rank,
+            si.sort_date AS result_date
+        FROM data_views.search_index si
+        WHERE ((search_term IS NULL OR btrim(search_term) = '') OR si.document @@ plainto_tsquery('english', search_term))
+          AND (filter_tables IS NULL OR si.table_name = ANY(filter_tables))
+          AND (filter_jurisdictions IS NULL OR si.jurisdiction_keys IS NULL
+               OR si.jurisdiction_keys && filter_jurisdictions)
+          AND (filter_themes IS NULL OR si.theme_keys IS NULL OR si.theme_keys && filter_themes)
+    ) AS m
+$$ LANGUAGE sql STABLE;
+"""
+
+
+REFRESH_ALL_IN_DEPENDENCY_ORDER = """
+CREATE OR REPLACE FUNCTION data_views.refresh_all_materialized_views()
+RETURNS void AS $$
+DECLARE
+    view_name TEXT;
+    has_unique_index BOOLEAN;
+    new_generation BIGINT;
+BEGIN
+    -- Views that read other data_views materialized views (directly or via plain views) refresh after them.
+    FOR view_name IN
+        WITH RECURSIVE matviews AS (
+            SELECT c.oid, c.relname
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'data_views' AND c.relkind = 'm'
+        ),
+        reads AS (
+            SELECT DISTINCT r.ev_class AS reader, d.refobjid AS source
+            FROM pg_rewrite r
+            JOIN pg_depend d
+              ON d.classid = 'pg_rewrite'::regclass AND d.objid = r.oid AND d.refclassid = 'pg_class'::regclass
+            WHERE d.refobjid <> r.ev_class
+        ),
+        depth(oid, level) AS (
+            SELECT oid, 0 FROM matviews
+            UNION ALL
+            SELECT reads.reader, depth.level + 1
+            FROM depth
+            JOIN reads ON reads.source = depth.oid
+        )
+        SELECT mv.relname
+        FROM matviews mv
+        JOIN depth ON depth.oid = mv.oid
+        GROUP BY mv.relname
+        ORDER BY max(depth.level), mv.relname
+    LOOP
+        SELECT EXISTS (
+            SELECT 1 FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = 'data_views'
+            AND t.relname = view_name
+            AND i.indisunique
+        ) INTO has_unique_index;
+
+        IF has_unique_index THEN
+            EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY data_views.%I', view_name);
+        ELSE
+            EXECUTE format('REFRESH MATERIALIZED VIEW data_views.%I', view_name);
+            RAISE NOTICE 'Materialized view data_views.% refreshed non-concurrently (no unique index)', view_name;
+        END IF;
+    END LOOP;
+
+    UPDATE data_views.refresh_generation
+    SET generation = generation + 1, refreshed_at = now()
+    WHERE id
+    RETURNING generation INTO new_generation;
+
+    PERFORM pg_notify('data_views_refreshed', new_generation::text);
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_INDEX)
+    for statement in SEARCH_INDEX_INDEXES:
+        op.execute(statement)
+    op.execute(SEARCH_MATCHES)
+    op.execute(REFRESH_ALL_IN_DEPENDENCY_ORDER)
+
+
+def downgrade() -> None:
+    generation = importlib.import_module("alembic_views.versions.202610171100_refresh_generation")
+    op.execute(generation.REFRESH_ALL_WITH_GENERATION)
+    facets = importlib.import_module("alembic_views.versions.202610171300_search_facet_arrays")
+    op.execute(facets.SEARCH_MATCHES)
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.search_index")
@@ -0,0 +1,199 @@
+"""Store ``complete_record`` in ``data_views.search_index`` at refresh time.
+
+After revision ``202610171500`` the search scans ``data_views.search_index``
+once, but ``_search_matches`` still builds every match's ``complete_record``
+at query time: ``to_jsonb(b.*)`` over the matching ``base_*`` view row (with
+its per-row lateral lookups) merged with the ``display`` fields. That runs for
+every candidate before ORDER BY/LIMIT, so a broad query serializes thousands
+of records to return 50.
+
+This revision rebuilds ``search_index`` with a ``complete_record`` column —
+``to_jsonb(base row) || display fields``, exactly what ``_search_matches``
+produced — computed once per refresh, and drops the ``display`` column it
+replaces. ``_search_matches`` now returns the stored JSON as-is; its
+signature and output are unchanged.
+
+Search results therefore show record fields as of the last refresh, the
+same snapshot the FTS documents and ranking already came from.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610171600"
+down_revision = "202610171500"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "p1q5x3pj29vkrdr"
+S = SCHEMA
+
+
+SEARCH_INDEX = f"""
+CREATE MATERIALIZED VIEW data_views.search_index AS
+SELECT
+    'Answers'::text AS table_name,
+    sv.id AS record_id,
+    sv.document,
+    sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object(
+        'question', sv."Questions",
+        'jurisdictions', sv."Jurisdictions",
+        'themes', sv."Themes"
+    ) AS complete_record,
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]) AS jurisdiction_keys,
+    COALESCE(f.theme_keys, '{{}}'::text[]) AS theme_keys
+FROM data_views.answers sv
+JOIN data_views.base_answers b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Answers' AND f.record_id = sv.id
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM {S}."_nc_m2m_Jurisdictions_Answers" ja
+    JOIN {S}."Jurisdictions" j ON j.id = ja."Jurisdictions_id"
+    WHERE ja."Answers_id" = sv.id
+      AND COALESCE(j."Irrelevant_", FALSE) = TRUE
+)
+
+UNION ALL
+
+SELECT
+    'HCCH Answers', sv.id, sv.document, sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object('themes', sv."Themes"),
+    NULL::text[],
+    COALESCE(f.theme_keys, '{{}}'::text[])
+FROM data_views.hcch_answers sv
+JOIN data_views.base_hcch_answers b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'HCCH Answers' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT
+    'Court Decisions', sv.id, sv.document, sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object('jurisdictions', sv."Jurisdictions", 'themes', sv."Themes"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    COALESCE(f.theme_keys, '{{}}'::text[])
+FROM data_views.court_decisions sv
+JOIN data_views.base_court_decisions b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Court Decisions' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT
+    'Domestic Instruments', sv.id, sv.document, sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object('jurisdictions', sv."Jurisdictions"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    NULL::text[]
+FROM data_views.domestic_instruments sv
+JOIN data_views.base_domestic_instruments b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Domestic Instruments' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT 'Regional Instruments', sv.id, sv.document, sv.sort_date, to_jsonb(b.*), NULL::text[], NULL::text[]
+FROM data_views.regional_instruments sv
+JOIN data_views.base_regional_instruments b ON b.id = sv.id
+
+UNION ALL
+
+SELECT 'International Instruments', sv.id, sv.document, sv.sort_date, to_jsonb(b.*), NULL::text[], NULL::text[]
+FROM data_views.international_instruments sv
+JOIN data_views.base_international_instruments b ON b.id = sv.id
+
+UNION ALL
+
+SELECT
+    'Literature', sv.id, sv.document, sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object('jurisdictions', sv."Jurisdictions", 'themes', sv."Themes"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    COALESCE(f.theme_keys, '{{}}'::text[])
+FROM data_views.literature sv
+JOIN data_views.base_literature b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Literature' AND f.record_id = sv.id
+"""
+
+
+SEARCH_MATCHES = """
+CREATE OR REPLACE FUNCTION data_views._search_matches(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    sort_by_date BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    k_bucket INTEGER,
+    k_case_rank NUMERIC,
+    k_date INTEGER,
+    k_rank REAL
+) AS $$
+    SELECT
+        m.table_name,
+        m.record_id,
+        m.complete_record,
+        m.rank::real,
+        m.result_date,
+        CASE
+            WHEN m.table_name = 'Answers'
+                 AND btrim(COALESCE(m.complete_record->>'answer', '')) ILIKE '%no data%'
+            THEN 2
+            WHEN m.table_name = 'Court Decisions'
+                 AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+            THEN 1
+            ELSE 0
+        END AS k_bucket,
+        CASE
+            WHEN m.table_name = 'Court Decisions'
+                 AND COALESCE((m.complete_record->>'case_rank')::numeric, 1000000) <= 5
+            THEN -((m.complete_record->>'case_rank')::numeric)
+            ELSE 0
+        END AS k_case_rank,
+        CASE
+            WHEN NOT sort_by_date THEN 0
+            ELSE COALESCE(DATE '2000-01-01' - m.result_date, 2147483647)
+        END AS k_date,
+        (-m.rank)::real AS k_rank
+    FROM (
+        SELECT
+            si.table_name,
+            si.record_id,
+            si.complete_record,
+            CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                 ELSE ts_rank(si.document, plainto_tsquery('english', search_term))
+            END AS rank,
+            si.sort_date AS result_date
+        FROM data_views.search_index si
+        WHERE ((search_term IS NULL OR btrim(search_term) = '') OR si.document @@ plainto_tsquery('english', search_term))
+          AND (filter_tables IS NULL OR si.table_name = ANY(filter_tables))
+          AND (filter_jurisdictions IS NULL OR si.jurisdiction_keys IS NULL
+               OR si.jurisdiction_keys && filter_jurisdictions)
+          AND (filter_themes IS NULL OR si.theme_keys IS NULL OR si.theme_keys && filter_themes)
+    ) AS m
+$$ LANGUAGE sql STABLE;
+"""
+
+
+def _rebuild_search_index(definition: str) -> None:
+    prev = importlib.import_module("alembic_views.versions.202610171500_unified_search_index")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.search_index")
+    op.execute(definition)
+    for statement in prev.SEARCH_INDEX_INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _rebuild_search_index(SEARCH_INDEX)
+    op.execute(SEARCH_MATCHES)
+
+
+def downgrade() -> None:
+    prev = importlib.import_module("alembic_views.versions.202610171500_unified_search_index")
+    _rebuild_search_index(prev.SEARCH_INDEX)
+    op.execute(prev.SEARCH_MATCHES)
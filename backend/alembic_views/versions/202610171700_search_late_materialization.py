@@ -0,0 +1,303 @@
+"""Rank search matches on typed keys and hydrate only the returned page.
+
+Even with ``complete_record`` stored in ``data_views.search_index`` (revision
+``202610171600``), ``_search_matches`` derived the demotion bucket from
+``complete_record->>'answer'`` and ``->>'case_rank'`` and carried the JSON of
+every candidate through the window count, keyset filter and sort.
+
+This revision:
+
+  - rebuilds ``search_index`` with typed ``boost_bucket`` (2 = "no data"
+    answer, 1 = court decision with case rank <= 5, else 0) and
+    ``boost_case_rank`` (the negated case rank for bucket 1, else 0),
+    computed from the base columns at refresh time with the same rules;
+  - re-creates ``_search_matches`` without ``complete_record``: it returns
+    only ids, rank, date and sort key columns;
+  - makes ``search_all_v2`` count, cut and order on
+    ``(bucket, case_rank, date, rank, table_name, record_id)`` alone, and
+    join ``search_index`` for ``complete_record`` only for the rows of the
+    requested page.
+
+``search_all_v2``'s signature and output are unchanged.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610171700"
+down_revision = "202610171600"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "p1q5x3pj29vkrdr"
+S = SCHEMA
+
+
+SEARCH_INDEX = f"""
+CREATE MATERIALIZED VIEW data_views.search_index AS
+SELECT
+    'Answers'::text AS table_name,
+    sv.id AS record_id,
+    sv.document,
+    sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object(
+        'question', sv."Questions",
+        'jurisdictions', sv."Jurisdictions",
+        'themes', sv."Themes"
+    ) AS complete_record,
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]) AS jurisdiction_keys,
+    COALESCE(f.theme_keys, '{{}}'::text[]) AS theme_keys,
+    CASE WHEN btrim(COALESCE(b.answer, '')) ILIKE '%no data%' THEN 2 ELSE 0 END AS boost_bucket,
+    0::numeric AS boost_case_rank
+FROM data_views.answers sv
+JOIN data_views.base_answers b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Answers' AND f.record_id = sv.id
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM {S}."_nc_m2m_Jurisdictions_Answers" ja
+    JOIN {S}."Jurisdictions" j ON j.id = ja."Jurisdictions_id"
+    WHERE ja."Answers_id" = sv.id
+      AND COALESCE(j."Irrelevant_", FALSE) = TRUE
+)
+
+UNION ALL
+
+SELECT
+    'HCCH Answers', sv.id, sv.document, sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object('themes', sv."Themes"),
+    NULL::text[],
+    COALESCE(f.theme_keys, '{{}}'::text[]),
+    0, 0
+FROM data_views.hcch_answers sv
+JOIN data_views.base_hcch_answers b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'HCCH Answers' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT
+    'Court Decisions', sv.id, sv.document, sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object('jurisdictions', sv."Jurisdictions", 'themes', sv."Themes"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    COALESCE(f.theme_keys, '{{}}'::text[]),
+    CASE WHEN COALESCE(b.case_rank::numeric, 1000000) <= 5 THEN 1 ELSE 0 END,
+    CASE WHEN COALESCE(b.case_rank::numeric, 1000000) <= 5 THEN -(b.case_rank::numeric) ELSE 0 END
+FROM data_views.court_decisions sv
+JOIN data_views.base_court_decisions b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Court Decisions' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT
+    'Domestic Instruments', sv.id, sv.document, sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object('jurisdictions', sv."Jurisdictions"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    NULL::text[],
+    0, 0
+FROM data_views.domestic_instruments sv
+JOIN data_views.base_domestic_instruments b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Domestic Instruments' AND f.record_id = sv.id
+
+UNION ALL
+
+SELECT 'Regional Instruments', sv.id, sv.document, sv.sort_date, to_jsonb(b.*), NULL::text[], NULL::text[], 0, 0
+FROM data_views.regional_instruments sv
+JOIN data_views.base_regional_instruments b ON b.id = sv.id
+
+UNION ALL
+
+SELECT 'International Instruments', sv.id, sv.document, sv.sort_date, to_jsonb(b.*), NULL::text[], NULL::text[], 0, 0
+FROM data_views.international_instruments sv
+JOIN data_views.base_international_instruments b ON b.id = sv.id
+
+UNION ALL
+
+SELECT
+    'Literature', sv.id, sv.document, sv.sort_date,
+    to_jsonb(b.*) || jsonb_build_object('jurisdictions', sv."Jurisdictions", 'themes', sv."Themes"),
+    COALESCE(f.jurisdiction_keys, '{{}}'::text[]),
+    COALESCE(f.theme_keys, '{{}}'::text[]),
+    0, 0
+FROM data_views.literature sv
+JOIN data_views.base_literature b ON b.id = sv.id
+LEFT JOIN data_views.search_record_facets f ON f.table_name = 'Literature' AND f.record_id = sv.id
+"""
+
+
+DROP_SEARCH_MATCHES = "DROP FUNCTION IF EXISTS data_views._search_matches(text, text[], text[], text[], boolean);"
+
+SEARCH_MATCHES = """
+CREATE FUNCTION data_views._search_matches(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    sort_by_date BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    rank REAL,
+    result_date DATE,
+    k_bucket INTEGER,
+    k_case_rank NUMERIC,
+    k_date INTEGER,
+    k_rank REAL
+) AS $$
+    SELECT
+        m.table_name,
+        m.record_id,
+        m.rank::real,
+        m.result_date,
+        m.boost_bucket,
+        m.boost_case_rank,
+        CASE
+            WHEN NOT sort_by_date THEN 0
+            ELSE COALESCE(DATE '2000-01-01' - m.result_date, 2147483647)
+        END AS k_date,
+        (-m.rank)::real AS k_rank
+    FROM (
+        SELECT
+            si.table_name,
+            si.record_id,
+            si.boost_bucket,
+            si.boost_case_rank,
+            CASE WHEN (search_term IS NULL OR btrim(search_term) = '') THEN 1.0
+                 ELSE ts_rank(si.document, plainto_tsquery('english', search_term))
+            END AS rank,
+            si.sort_date AS result_date
+        FROM data_views.search_index si
+        WHERE ((search_term IS NULL OR btrim(search_term) = '') OR si.document @@ plainto_tsquery('english', search_term))
+          AND (filter_tables IS NULL OR si.table_name = ANY(filter_tables))
+          AND (filter_jurisdictions IS NULL OR si.jurisdiction_keys IS NULL
+               OR si.jurisdiction_keys && filter_jurisdictions)
+          AND (filter_themes IS NULL OR si.theme_keys IS NULL OR si.theme_keys && filter_themes)
+    ) AS m
+$$ LANGUAGE sql STABLE;
+"""
+
+
+SEARCH_ALL_V2 = """
+CREATE OR REPLACE FUNCTION data_views.search_all_v2(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    page INT DEFAULT 1,
+    page_size INT DEFAULT 50,
+    sort_by_date BOOLEAN DEFAULT FALSE,
+    after_key JSONB DEFAULT NULL,
+    exact_count BOOLEAN DEFAULT TRUE
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    sort_key JSONB,
+    total_count BIGINT
+) AS $$
+DECLARE
+    offset_val INT := CASE WHEN after_key IS NULL THEN (page - 1) * page_size ELSE 0 END;
+    plan JSONB;
+    estimated BIGINT;
+BEGIN
+    IF exact_count THEN
+        RETURN QUERY
+        SELECT
+            p.table_name,
+            p.record_id,
+            si.complete_record,
+            p.rank,
+            p.result_date,
+            jsonb_build_array(p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id),
+            p.total
+        FROM (
+            SELECT k.*
+            FROM (
+                SELECT m.*, count(*) OVER () AS total
+                FROM data_views._search_matches(
+                    search_term, filter_tables, filter_jurisdictions, filter_themes, sort_by_date
+                ) m
+            ) k
+            WHERE after_key IS NULL
+               OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+                      (after_key->>0)::int,
+                      (after_key->>1)::numeric,
+                      (after_key->>2)::int,
+                      (after_key->>3)::real,
+                      after_key->>4,
+                      (after_key->>5)::int
+                  )
+            ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+            LIMIT page_size OFFSET offset_val
+        ) p
+        JOIN data_views.search_index si ON si.table_name = p.table_name AND si.record_id = p.record_id
+        ORDER BY p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id;
+        RETURN;
+    END IF;
+
+    EXECUTE format(
+        'EXPLAIN (FORMAT JSON) SELECT 1 FROM data_views._search_matches(%L, %L, %L, %L)',
+        search_term, filter_tables, filter_jurisdictions, filter_themes
+    ) INTO plan;
+    estimated := (plan->0->'Plan'->>'Plan Rows')::numeric::bigint;
+
+    RETURN QUERY
+    SELECT
+        p.table_name,
+        p.record_id,
+        si.complete_record,
+        p.rank,
+        p.result_date,
+        jsonb_build_array(p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id),
+        estimated
+    FROM (
+        SELECT k.*
+        FROM data_views._search_matches(
+            search_term, filter_tables, filter_jurisdictions, filter_themes, sort_by_date
+        ) k
+        WHERE after_key IS NULL
+           OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+                  (after_key->>0)::int,
+                  (after_key->>1)::numeric,
+                  (after_key->>2)::int,
+                  (after_key->>3)::real,
+                  after_key->>4,
+                  (after_key->>5)::int
+              )
+        ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+        LIMIT page_size OFFSET offset_val
+    ) p
+    JOIN data_views.search_index si ON si.table_name = p.table_name AND si.record_id = p.record_id
+    ORDER BY p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def _rebuild_search_index(definition: str) -> None:
+    indexes = importlib.import_module("alembic_views.versions.202610171500_unified_search_index")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.search_index")
+    op.execute(definition)
+    for statement in indexes.SEARCH_INDEX_INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _rebuild_search_index(SEARCH_INDEX)
+    op.execute(DROP_SEARCH_MATCHES)
+    op.execute(SEARCH_MATCHES)
+    op.execute(SEARCH_ALL_V2)
+
+
+def downgrade() -> None:
+    prev = importlib.import_module("alembic_views.versions.202610171600_search_index_complete_record")
+    total = importlib.import_module("alembic_views.versions.202610171000_search_total_in_one_query")
+    _rebuild_search_index(prev.SEARCH_INDEX)
+    op.execute(DROP_SEARCH_MATCHES)
+    op.execute(prev.SEARCH_MATCHES)
+    op.execute(total.SEARCH_ALL_V2_WITH_TOTAL)
@@ -0,0 +1,270 @@
+"""Opt-in web-search query syntax, with the tsquery parsed once per call.
+
+``data_views._search_matches`` turned the raw search term into a query with
+``plainto_tsquery('english', search_term)``, which ANDs every token: users who
+type ``"party autonomy" -arbitration`` get documents containing all of
+"party", "autonomy" and "arbitration". The expression also appeared twice
+(match and rank), evaluated per row whenever the plan could not fold it.
+
+This revision:
+
+  - adds ``data_views._search_query(search_term, query_syntax)`` returning
+    NULL for a blank term, ``websearch_to_tsquery`` for
+    ``query_syntax = 'websearch'`` (quoted phrases, ``or``, ``-negation``)
+    and ``plainto_tsquery`` otherwise. It is ``STABLE``: the ``'english'``
+    configuration name is looked up in the catalog and its dictionaries can
+    be altered, so the result is not fixed for given arguments and must not
+    be folded into indexes or cached plans;
+  - re-creates ``_search_matches`` to take the parsed ``TSQUERY`` instead of
+    the raw term (NULL matches everything, as a blank term did);
+  - adds a trailing ``query_syntax TEXT DEFAULT 'plain'`` argument to
+    ``search_all_v2`` and ``search_facets``. ``search_all_v2`` parses the
+    term once into a local variable and hands the tsquery to
+    ``_search_matches``; ``search_facets`` passes it straight through.
+
+The default stays ``'plain'``, so existing callers see no change.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610171800"
+down_revision = "202610171700"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_QUERY = """
+CREATE OR REPLACE FUNCTION data_views._search_query(
+    search_term TEXT,
+    query_syntax TEXT DEFAULT 'plain'
+)
+RETURNS TSQUERY AS $$
+    SELECT CASE
+        WHEN search_term IS NULL OR btrim(search_term) = '' THEN NULL
+        WHEN query_syntax = 'websearch' THEN websearch_to_tsquery('english', search_term)
+        ELSE plainto_tsquery('english', search_term)
+    END
+$$ LANGUAGE sql STABLE;
+"""
+
+DROP_PREVIOUS = """
+DROP FUNCTION IF EXISTS data_views.search_all_v2(
+    text, text[], text[], text[], integer, integer, boolean, jsonb, boolean
+);
+DROP FUNCTION IF EXISTS data_views.search_facets(text, text[], text[], text[]);
+DROP FUNCTION IF EXISTS data_views._search_matches(text, text[], text[], text[], boolean);
+"""
+
+DROP_CURRENT = """
+DROP FUNCTION IF EXISTS data_views.search_all_v2(
+    text, text[], text[], text[], integer, integer, boolean, jsonb, boolean, text
+);
+DROP FUNCTION IF EXISTS data_views.search_facets(text, text[], text[], text[], text);
+DROP FUNCTION IF EXISTS data_views._search_matches(tsquery, text[], text[], text[], boolean);
+DROP FUNCTION IF EXISTS data_views._search_query(text, text);
+"""
+
+
+SEARCH_MATCHES = """
+CREATE FUNCTION data_views._search_matches(
+    search_query TSQUERY,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    sort_by_date BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    rank REAL,
+    result_date DATE,
+    k_bucket INTEGER,
+    k_case_rank NUMERIC,
+    k_date INTEGER,
+    k_rank REAL
+) AS $$
+    SELECT
+        m.table_name,
+        m.record_id,
+        m.rank::real,
+        m.result_date,
+        m.boost_bucket,
+        m.boost_case_rank,
+        CASE
+            WHEN NOT sort_by_date THEN 0
+            ELSE COALESCE(DATE '2000-01-01' - m.result_date, 2147483647)
+        END AS k_date,
+        (-m.rank)::real AS k_rank
+    FROM (
+        SELECT
+            si.table_name,
+            si.record_id,
+            si.boost_bucket,
+            si.boost_case_rank,
+            CASE WHEN search_query IS NULL THEN 1.0 ELSE ts_rank(si.document, search_query) END AS rank,
+            si.sort_date AS result_date
+        FROM data_views.search_index si
+        WHERE (search_query IS NULL OR si.document @@ search_query)
+          AND (filter_tables IS NULL OR si.table_name = ANY(filter_tables))
+          AND (filter_jurisdictions IS NULL OR si.jurisdiction_keys IS NULL
+               OR si.jurisdiction_keys && filter_jurisdictions)
+          AND (filter_themes IS NULL OR si.theme_keys IS NULL OR si.theme_keys && filter_themes)
+    ) AS m
+$$ LANGUAGE sql STABLE;
+"""
+
+
+SEARCH_ALL_V2 = """
+CREATE FUNCTION data_views.search_all_v2(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    page INT DEFAULT 1,
+    page_size INT DEFAULT 50,
+    sort_by_date BOOLEAN DEFAULT FALSE,
+    after_key JSONB DEFAULT NULL,
+    exact_count BOOLEAN DEFAULT TRUE,
+    query_syntax TEXT DEFAULT 'plain'
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    sort_key JSONB,
+    total_count BIGINT
+) AS $$
+DECLARE
+    offset_val INT := CASE WHEN after_key IS NULL THEN (page - 1) * page_size ELSE 0 END;
+    plan JSONB;
+    estimated BIGINT;
+    search_query TSQUERY := data_views._search_query(search_term, query_syntax);
+BEGIN
+    IF exact_count THEN
+        RETURN QUERY
+        SELECT
+            p.table_name,
+            p.record_id,
+            si.complete_record,
+            p.rank,
+            p.result_date,
+            jsonb_build_array(p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id),
+            p.total
+        FROM (
+            SELECT k.*
+            FROM (
+                SELECT m.*, count(*) OVER () AS total
+                FROM data_views._search_matches(
+                    search_query, filter_tables, filter_jurisdictions, filter_themes, sort_by_date
+                ) m
+            ) k
+            WHERE after_key IS NULL
+               OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+                      (after_key->>0)::int,
+                      (after_key->>1)::numeric,
+                      (after_key->>2)::int,
+                      (after_key->>3)::real,
+                      after_key->>4,
+                      (after_key->>5)::int
+                  )
+            ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+            LIMIT page_size OFFSET offset_val
+        ) p
+        JOIN data_views.search_index si ON si.table_name = p.table_name AND si.record_id = p.record_id
+        ORDER BY p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id;
+        RETURN;
+    END IF;
+
+    EXECUTE format(
+        'EXPLAIN (FORMAT JSON) SELECT 1 FROM data_views._search_matches(%L::tsquery, %L, %L, %L)',
+        search_query, filter_tables, filter_jurisdictions, filter_themes
+    ) INTO plan;
+    estimated := (plan->0->'Plan'->>'Plan Rows')::numeric::bigint;
+
+    RETURN QUERY
+    SELECT
+        p.table_name,
+        p.record_id,
+        si.complete_record,
+        p.rank,
+        p.result_date,
+        jsonb_build_array(p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id),
+        estimated
+    FROM (
+        SELECT k.*
+        FROM data_views._search_matches(
+            search_query, filter_tables, filter_jurisdictions, filter_themes, sort_by_date
+        ) k
+        WHERE after_key IS NULL
+           OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+                  (after_key->>0)::int,
+                  (after_key->>1)::numeric,
+                  (after_key->>2)::int,
+                  (after_key->>3)::real,
+                  after_key->>4,
+                  (after_key->>5)::int
+              )
+        ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+        LIMIT page_size OFFSET offset_val
+    ) p
+    JOIN data_views.search_index si ON si.table_name = p.table_name AND si.record_id = p.record_id
+    ORDER BY p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+SEARCH_FACETS = """
+CREATE FUNCTION data_views.search_facets(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    query_syntax TEXT DEFAULT 'plain'
+)
+RETURNS TABLE(
+    facet TEXT,
+    value TEXT,
+    hits BIGINT
+) AS $$
+    WITH matches AS MATERIALIZED (
+        SELECT m.table_name, f.jurisdiction_names, f.themes
+        FROM data_views._search_matches(
+            data_views._search_query(search_term, query_syntax),
+            filter_tables, filter_jurisdictions, filter_themes
+        ) m
+        LEFT JOIN data_views.search_record_facets f
+          ON f.table_name = m.table_name AND f.record_id = m.record_id
+    )
+    SELECT 'total'::text, NULL::text, count(*) FROM matches
+    UNION ALL
+    SELECT 'table', table_name, count(*) FROM matches GROUP BY table_name
+    UNION ALL
+    SELECT 'jurisdiction', j, count(*) FROM matches, unnest(jurisdiction_names) AS j GROUP BY j
+    UNION ALL
+    SELECT 'theme', t, count(*) FROM matches, unnest(themes) AS t GROUP BY t
+$$ LANGUAGE sql STABLE;
+"""
+
+
+def upgrade() -> None:
+    op.execute(DROP_PREVIOUS)
+    op.execute(SEARCH_QUERY)
+    op.execute(SEARCH_MATCHES)
+    op.execute(SEARCH_ALL_V2)
+    op.execute(SEARCH_FACETS)
+
+
+def downgrade() -> None:
+    op.execute(DROP_CURRENT)
+    late = importlib.import_module("alembic_views.versions.202610171700_search_late_materialization")
+    facets = importlib.import_module("alembic_views.versions.202610171400_search_facets")
+    op.execute(late.SEARCH_MATCHES)
+    op.execute(late.SEARCH_ALL_V2)
+    op.execute(facets.SEARCH_FACETS)
@@ -0,0 +1,178 @@
+"""Typo-tolerant "did you mean" fallback for full-text search.
+
+A misspelled query (``autonmy``) matches nothing in ``data_views.search_index``
+and the search page shows an empty result set with no way forward.
+
+This revision adds:
+
+  - ``data_views.search_lexicon (word, ndoc)`` — every distinct lower-cased
+    word (three letters or more) of the indexed search records with the number
+    of records containing it, built from ``search_index.complete_record`` at
+    refresh time. Words are unstemmed (``simple`` configuration) so they can
+    be shown back to users. A unique index on ``word`` serves exact lookups and
+    concurrent refresh; with ``pg_trgm`` a GiST trigram index serves
+    nearest-neighbour (``<->``) lookups.
+  - ``data_views.search_suggestion(search_term)`` — rewrites every word of the
+    term that is not in the lexicon to its closest lexicon word by trigram
+    distance (above ``pg_trgm.similarity_threshold``), keeping punctuation,
+    quotes, ``-`` and short words as typed so web-search syntax survives.
+    Returns NULL when nothing was rewritten.
+  - ``data_views.search_fallback(...)`` — one call that computes the
+    suggestion and, if there is one, returns the first ``search_all_v2`` page
+    for it with the suggestion in every row. No suggestion, or a suggestion
+    that matches nothing, returns no rows.
+
+``pg_trgm`` is created when the server offers it. Managed servers can list
+an extension they do not allow, or allow it only to privileged roles, so a
+failed ``CREATE EXTENSION`` is caught and the upgrade carries on without it.
+Without it the lexicon is still built but ``search_suggestion`` always
+returns NULL, so the fallback is a cheap no-op and search behaves as before.
+
+The trigram path (``search_suggestion`` with ``%`` and ``<->``, and the GiST
+index) has not been run against a server with ``pg_trgm`` installed; the
+test database used for this revision lacks the extension. Check a
+misspelled query on such a server before relying on it.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610171900"
+down_revision = "202610171800"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_LEXICON = """
+CREATE MATERIALIZED VIEW data_views.search_lexicon AS
+SELECT w.word, count(*)::int AS ndoc
+FROM data_views.search_index si,
+     unnest(tsvector_to_array(jsonb_to_tsvector('simple', si.complete_record, '["string"]'))) AS w(word)
+WHERE w.word ~ '^[[:alpha:]]{3,}$'
+GROUP BY w.word
+"""
+
+SEARCH_LEXICON_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_search_lexicon_word ON data_views.search_lexicon (word)",
+]
+
+SEARCH_LEXICON_TRGM_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_search_lexicon_word_trgm ON data_views.search_lexicon USING gist (word gist_trgm_ops)"
+)
+
+
+SEARCH_SUGGESTION = """
+CREATE OR REPLACE FUNCTION data_views.search_suggestion(search_term TEXT)
+RETURNS TEXT AS $$
+    WITH tokens AS (
+        SELECT t.ord, t.m[1] AS token, lower(t.m[1]) AS word
+        FROM regexp_matches(search_term, '[[:alpha:]]+|[^[:alpha:]]+', 'g') WITH ORDINALITY AS t(m, ord)
+    ),
+    rewritten AS (
+        SELECT
+            tokens.ord,
+            tokens.token,
+            CASE
+                WHEN tokens.word !~ '^[[:alpha:]]{3,}$' THEN NULL
+                WHEN EXISTS (SELECT 1 FROM data_views.search_lexicon l WHERE l.word = tokens.word) THEN NULL
+                ELSE (
+                    SELECT l.word
+                    FROM data_views.search_lexicon l
+                    WHERE l.word % tokens.word
+                    ORDER BY l.word <-> tokens.word
+                    LIMIT 1
+                )
+            END AS fix
+        FROM tokens
+    )
+    SELECT string_agg(COALESCE(fix, token), '' ORDER BY ord)
+    FROM rewritten
+    HAVING count(fix) > 0
+$$ LANGUAGE sql STABLE;
+"""
+
+SEARCH_SUGGESTION_WITHOUT_TRGM = """
+CREATE OR REPLACE FUNCTION data_views.search_suggestion(search_term TEXT)
+RETURNS TEXT AS $$
+    SELECT NULL::text
+$$ LANGUAGE sql STABLE;
+"""
+
+
+SEARCH_FALLBACK = """
+CREATE OR REPLACE FUNCTION data_views.search_fallback(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    page_size INT DEFAULT 50,
+    sort_by_date BOOLEAN DEFAULT FALSE,
+    exact_count BOOLEAN DEFAULT TRUE,
+    query_syntax TEXT DEFAULT 'plain'
+)
+RETURNS TABLE(
+    suggestion TEXT,
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    sort_key JSONB,
+    total_count BIGINT
+) AS $$
+DECLARE
+    corrected TEXT := data_views.search_suggestion(search_term);
+BEGIN
+    IF corrected IS NULL THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT corrected, r.*
+    FROM data_views.search_all_v2(
+        corrected, filter_tables, filter_jurisdictions, filter_themes,
+        1, page_size, sort_by_date, NULL, exact_count, query_syntax
+    ) r;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+CREATE_PG_TRGM = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    END IF;
+EXCEPTION WHEN insufficient_privilege OR feature_not_supported THEN
+    RAISE NOTICE 'pg_trgm not installed, search suggestions disabled: %', SQLERRM;
+END
+$$
+"""
+
+
+def _has_pg_trgm() -> bool:
+    result = op.get_bind().exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    return result.scalar() is not None
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_LEXICON)
+    for statement in SEARCH_LEXICON_INDEXES:
+        op.execute(statement)
+    op.execute(CREATE_PG_TRGM)
+    if _has_pg_trgm():
+        op.execute(SEARCH_LEXICON_TRGM_INDEX)
+        op.execute(SEARCH_SUGGESTION)
+    else:
+        op.execute(SEARCH_SUGGESTION_WITHOUT_TRGM)
+    op.execute(SEARCH_FALLBACK)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP FUNCTION IF EXISTS data_views.search_fallback(text, text[], text[], text[], integer, boolean, boolean, text)"
+    )
+    op.execute("DROP FUNCTION IF EXISTS data_views.search_suggestion(text)")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.search_lexicon")
@@ -0,0 +1,128 @@
+"""Prefix index for search-box typeahead.
+
+The search box has no prefix lookup, so the frontend runs a full
+``search_all_v2`` on every keystroke to show suggestions.
+
+This revision adds the materialized view ``data_views.search_suggest_index``
+holding the short labels users type towards — court decision citations,
+literature titles, jurisdiction names, instrument titles, arbitral
+institutions and rules — with one row per word-start suffix of each term::
+
+    match_key                      label                          word_position
+    smith v jones [2001] ewhc 12   Smith v Jones [2001] EWHC 12   1
+    jones [2001] ewhc 12           Smith v Jones [2001] EWHC 12   3
+
+Jurisdictions are also keyed by alpha-3 code and instruments/institutions by
+abbreviation, always labelled with their name. Keys are lower-cased with
+whitespace collapsed and cover at most the first twelve words of a term.
+
+A ``text_pattern_ops`` btree on ``match_key`` turns ``match_key LIKE 'pre%'``
+into an index range scan whatever the database collation.
+``data_views.search_suggest(prefix, filter_tables, max_results)`` reads the
+first candidates of that range in key order, keeps the best row per record
+and ranks label-start matches first, then shorter labels. ``prefix`` must
+already be normalized (lower-cased, whitespace collapsed) and have LIKE
+wildcards escaped.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610172000"
+down_revision = "202610171900"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_SUGGEST_INDEX = """
+CREATE MATERIALIZED VIEW data_views.search_suggest_index AS
+WITH terms AS (
+    SELECT 'Court Decisions'::text AS table_name, cold_id, case_citation AS label, case_citation AS term
+    FROM data_views.base_court_decisions
+    UNION ALL
+    SELECT 'Literature', cold_id, title, title
+    FROM data_views.base_literature
+    UNION ALL
+    SELECT 'Jurisdictions', cold_id, name, term
+    FROM data_views.base_jurisdictions, LATERAL (VALUES (name), (alpha_3_code)) AS v(term)
+    WHERE NOT COALESCE(irrelevant, FALSE)
+    UNION ALL
+    SELECT 'Domestic Instruments', cold_id, title_in_english, term
+    FROM data_views.base_domestic_instruments, LATERAL (VALUES (title_in_english), (abbreviation)) AS v(term)
+    UNION ALL
+    SELECT 'Regional Instruments', cold_id, title, term
+    FROM data_views.base_regional_instruments, LATERAL (VALUES (title), (abbreviation)) AS v(term)
+    UNION ALL
+    SELECT 'International Instruments', cold_id, name, name
+    FROM data_views.base_international_instruments
+    UNION ALL
+    SELECT 'Arbitral Institutions', cold_id, institution, term
+    FROM data_views.base_arbitral_institutions, LATERAL (VALUES (institution), (abbreviation)) AS v(term)
+    UNION ALL
+    SELECT 'Arbitral Rules', cold_id, set_of_rules, set_of_rules
+    FROM data_views.base_arbitral_rules
+),
+words AS (
+    SELECT table_name, cold_id, btrim(label) AS label, regexp_split_to_array(lower(btrim(term)), '\\s+') AS words
+    FROM terms
+    WHERE cold_id IS NOT NULL AND btrim(label) <> '' AND btrim(term) <> ''
+)
+SELECT DISTINCT
+    array_to_string(w.words[pos:], ' ') AS match_key,
+    w.label,
+    w.table_name,
+    w.cold_id,
+    pos AS word_position
+FROM words w, generate_subscripts(w.words, 1) AS pos
+WHERE pos <= 12
+"""
+
+SEARCH_SUGGEST_INDEX_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_search_suggest_index_key "
+    "ON data_views.search_suggest_index (match_key, table_name, cold_id, label, word_position)",
+    "CREATE INDEX IF NOT EXISTS idx_search_suggest_index_prefix "
+    "ON data_views.search_suggest_index (match_key text_pattern_ops)",
+]
+
+
+SEARCH_SUGGEST = """
+CREATE OR REPLACE FUNCTION data_views.search_suggest(
+    prefix TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    max_results INT DEFAULT 10
+)
+RETURNS TABLE(
+    label TEXT,
+    table_name TEXT,
+    cold_id TEXT
+) AS $$
+    SELECT best.label, best.table_name, best.cold_id
+    FROM (
+        SELECT DISTINCT ON (c.table_name, c.cold_id) c.label, c.table_name, c.cold_id, c.word_position
+        FROM (
+            SELECT s.label, s.table_name, s.cold_id, s.word_position
+            FROM data_views.search_suggest_index s
+            WHERE s.match_key LIKE prefix || '%'
+              AND (filter_tables IS NULL OR s.table_name = ANY(filter_tables))
+            ORDER BY s.match_key
+            LIMIT max_results * 20
+        ) c
+        ORDER BY c.table_name, c.cold_id, c.word_position, length(c.label)
+    ) best
+    ORDER BY best.word_position = 1 DESC, length(best.label), best.label, best.table_name
+    LIMIT max_results
+$$ LANGUAGE sql STABLE;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_SUGGEST_INDEX)
+    for statement in SEARCH_SUGGEST_INDEX_INDEXES:
+        op.execute(statement)
+    op.execute(SEARCH_SUGGEST)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS data_views.search_suggest(text, text[], integer)")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.search_suggest_index")
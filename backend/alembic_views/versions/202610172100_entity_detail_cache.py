@@ -0,0 +1,85 @@
+"""Materialize entity-detail documents keyed by ``(source_table, cold_id)``.
+
+``data_views.get_entity_detail(table, cold_id)`` (revision ``202604261800``)
+is a plpgsql dispatcher that, per call, builds the base record and then a
+dozen correlated ``jsonb_agg(to_jsonb(r.*))`` subqueries over the ``rel_*``
+views and M2M tables. Detail pages are the most requested route after search.
+
+This revision stores its output for every record as the materialized view
+``data_views.entity_detail_cache (source_table, record_id, cold_id,
+base_record, relations)``: one ``get_entity_detail`` call per distinct
+``cold_id`` of the seventeen ``base_*`` views, made at refresh time. The
+unique index on ``(source_table, cold_id)`` makes a detail request a single
+index lookup and lets ``refresh_all_materialized_views()`` refresh it
+concurrently.
+
+``SearchService.get_entity_detail`` reads the cache and only calls
+``get_entity_detail`` when the key is not cached (records created since the
+last refresh, or alternative IDs such as a bare arbitral-institution id).
+Cached details reflect the last refresh, like search results.
+``get_entity_detail`` stays the single definition of a detail document; this
+view must be refreshed (or re-created) whenever that function changes.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610172100"
+down_revision = "202610172000"
+branch_labels = None
+depends_on = None
+
+
+DETAIL_TABLES = {
+    "Answers": "base_answers",
+    "HCCH Answers": "base_hcch_answers",
+    "Questions": "base_questions",
+    "Court Decisions": "base_court_decisions",
+    "Domestic Instruments": "base_domestic_instruments",
+    "Domestic Legal Provisions": "base_domestic_legal_provisions",
+    "Regional Instruments": "base_regional_instruments",
+    "Regional Legal Provisions": "base_regional_legal_provisions",
+    "International Instruments": "base_international_instruments",
+    "International Legal Provisions": "base_international_legal_provisions",
+    "Literature": "base_literature",
+    "Arbitral Awards": "base_arbitral_awards",
+    "Arbitral Institutions": "base_arbitral_institutions",
+    "Arbitral Rules": "base_arbitral_rules",
+    "Arbitral Provisions": "base_arbitral_provisions",
+    "Jurisdictions": "base_jurisdictions",
+    "Specialists": "base_specialists",
+}
+
+_DETAIL_KEYS = "\n        UNION ALL\n".join(
+    f"        SELECT '{table}'::text AS source_table, cold_id FROM data_views.{view}" for table, view in DETAIL_TABLES.items()
+)
+
+ENTITY_DETAIL_CACHE = f"""
+CREATE MATERIALIZED VIEW data_views.entity_detail_cache AS
+WITH detail_keys AS (
+    SELECT DISTINCT k.source_table, k.cold_id
+    FROM (
+{_DETAIL_KEYS}
+    ) k
+    WHERE k.cold_id IS NOT NULL
+)
+SELECT d.source_table, d.record_id, k.cold_id, d.base_record, d.relations
+FROM detail_keys k
+CROSS JOIN LATERAL data_views.get_entity_detail(k.source_table, k.cold_id) d
+WHERE d.record_id IS NOT NULL
+"""
+
+ENTITY_DETAIL_CACHE_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_entity_detail_cache_key ON data_views.entity_detail_cache (source_table, cold_id)",
+]
+
+
+def upgrade() -> None:
+    op.execute(ENTITY_DETAIL_CACHE)
+    for statement in ENTITY_DETAIL_CACHE_INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.entity_detail_cache")
@@ -0,0 +1,57 @@
+"""One row per related item of every cached entity detail, for paginated relations.
+
+``data_views.entity_detail_cache`` (revision ``202610172100``) stores each
+record's relations as one ``relations`` JSONB object of arrays. Heavy records
+— Switzerland links hundreds of answers, court decisions and literature items
+— have to read, send and render the whole object to show a detail page.
+
+This revision adds the materialized view ``data_views.entity_relation_items
+(source_table, cold_id, kind, position, item)``: the elements of every
+relation array of the cache, ``position`` being the 1-based index of the item
+in its array, so items keep the order ``get_entity_detail`` gives them (newest
+decisions first, questions by number, ...). The unique index on
+``(source_table, cold_id, kind, position)`` serves keyset pages
+(``position > :after ORDER BY position LIMIT :n``) as index range scans and
+lets the view refresh concurrently, after ``entity_detail_cache``.
+
+Positions are stable between refreshes only, like every materialized result.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610172200"
+down_revision = "202610172100"
+branch_labels = None
+depends_on = None
+
+
+ENTITY_RELATION_ITEMS = """
+CREATE MATERIALIZED VIEW data_views.entity_relation_items AS
+SELECT
+    c.source_table,
+    c.cold_id,
+    r.kind,
+    i.position::int AS position,
+    i.item
+FROM data_views.entity_detail_cache c,
+     jsonb_each(c.relations) AS r(kind, items),
+     jsonb_array_elements(CASE WHEN jsonb_typeof(r.items) = 'array' THEN r.items ELSE '[]'::jsonb END)
+        WITH ORDINALITY AS i(item, position)
+"""
+
+ENTITY_RELATION_ITEMS_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_entity_relation_items_key "
+    "ON data_views.entity_relation_items (source_table, cold_id, kind, position)",
+]
+
+
+def upgrade() -> None:
+    op.execute(ENTITY_RELATION_ITEMS)
+    for statement in ENTITY_RELATION_ITEMS_INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS data_views.entity_relation_items")
@@ -0,0 +1,340 @@
+"""Refresh only the materialized views whose source tables changed.
+
+pg_cron runs ``data_views.refresh_all_materialized_views()`` every fifteen
+minutes (``app/sql/cron_job.sql``). It rebuilds every materialized view even
+when nothing was edited in NocoDB, keeps the database busy for the whole
+rebuild and bumps the refresh generation, so every API cache and ETag turns
+over for no reason.
+
+This revision adds change tracking and a delta refresh:
+
+  - ``data_views.source_table_versions (source_table, version, changed_at)``
+    holds one counter per NocoDB table. A statement-level trigger
+    ``data_views_source_change`` on every table of the NocoDB schema bumps it
+    on INSERT, UPDATE, DELETE and TRUNCATE, whatever the row count.
+    ``data_views.track_source_changes()`` installs the trigger on tables that
+    do not have it yet (NocoDB creates tables at runtime) and forgets dropped
+    ones; both refresh functions call it first.
+  - ``data_views.materialized_view_inputs()`` lists the materialized views in
+    refresh order with what they read, following plain views: source tables,
+    other materialized views, and whether they call a non-immutable function.
+    Function bodies are invisible to ``pg_depend``, so such views (e.g.
+    ``entity_detail_cache`` through ``get_entity_detail``) are treated as
+    reading every table.
+  - ``data_views.refresh_changed_materialized_views()`` compares the
+    counters with the snapshot stored in
+    ``refresh_generation.source_versions`` by the last refresh and refreshes
+    a view only if one of its tables changed, a materialized view it reads
+    was refreshed in this run, or it reads untracked tables. Views with a
+    unique index are refreshed ``CONCURRENTLY``, which writes only the rows
+    that differ. The generation is bumped and ``data_views_refreshed``
+    notified only when something was refreshed. It returns the number of
+    refreshed views.
+  - ``refresh_all_materialized_views()`` still rebuilds everything and now
+    stores the snapshot too.
+
+Counters are read before any view is refreshed, so a change committed while a
+refresh runs is either in the refreshed views or picked up by the next run.
+Both functions lock the ``refresh_generation`` row, so overlapping runs
+queue instead of refreshing the same views twice. Schema changes do not fire
+the triggers; run the full refresh after migrations. If the migration role
+may not create triggers on the NocoDB tables, the upgrade installs none and
+the delta refresh keeps refreshing every view that reads them.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610172300"
+down_revision = "202610172200"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "p1q5x3pj29vkrdr"
+
+
+SOURCE_TABLE_VERSIONS = """
+CREATE TABLE IF NOT EXISTS data_views.source_table_versions (
+    source_table REGCLASS PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ
+);
+ALTER TABLE data_views.refresh_generation ADD COLUMN IF NOT EXISTS source_versions JSONB;
+"""
+
+NOTE_SOURCE_CHANGE = """
+CREATE OR REPLACE FUNCTION data_views.note_source_change()
+RETURNS trigger AS $$
+BEGIN
+    UPDATE data_views.source_table_versions
+    SET version = version + 1, changed_at = now()
+    WHERE source_table = TG_RELID::regclass;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = pg_catalog, pg_temp
+"""
+
+TRACK_SOURCE_CHANGES = f"""
+CREATE OR REPLACE FUNCTION data_views.track_source_changes(source_schema TEXT DEFAULT '{SCHEMA}')
+RETURNS integer AS $$
+DECLARE
+    source_table REGCLASS;
+    added INTEGER := 0;
+BEGIN
+    DELETE FROM data_views.source_table_versions s
+    WHERE NOT EXISTS (SELECT 1 FROM pg_class c WHERE c.oid = s.source_table);
+
+    FOR source_table IN
+        SELECT c.oid::regclass
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = source_schema
+          AND c.relkind IN ('r', 'p')
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_trigger t
+              WHERE t.tgrelid = c.oid AND t.tgname = 'data_views_source_change'
+          )
+    LOOP
+        EXECUTE format(
+            'CREATE TRIGGER data_views_source_change '
+            'AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %s '
+            'FOR EACH STATEMENT EXECUTE FUNCTION data_views.note_source_change()',
+            source_table
+        );
+        INSERT INTO data_views.source_table_versions (source_table)
+        VALUES (source_table)
+        ON CONFLICT DO NOTHING;
+        added := added + 1;
+    END LOOP;
+    RETURN added;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+MATERIALIZED_VIEW_INPUTS = """
+CREATE OR REPLACE FUNCTION data_views.materialized_view_inputs()
+RETURNS TABLE(
+    view_name NAME,
+    view_oid OID,
+    level INTEGER,
+    source_tables OID[],
+    source_views OID[],
+    calls_functions BOOLEAN
+) AS $$
+    WITH RECURSIVE matviews AS (
+        SELECT c.oid, c.relname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'data_views' AND c.relkind = 'm'
+    ),
+    reads AS (
+        SELECT DISTINCT r.ev_class AS reader, d.refclassid AS source_class, d.refobjid AS source
+        FROM pg_rewrite r
+        JOIN pg_depend d ON d.classid = 'pg_rewrite'::regclass AND d.objid = r.oid
+        WHERE d.refobjid <> r.ev_class
+          AND d.refclassid IN ('pg_class'::regclass, 'pg_proc'::regclass)
+    ),
+    -- Relations and functions each materialized view reads, followed through plain views.
+    inputs(view_oid, source_class, source) AS (
+        SELECT mv.oid, reads.source_class, reads.source
+        FROM matviews mv
+        JOIN reads ON reads.reader = mv.oid
+        UNION
+        SELECT inputs.view_oid, reads.source_class, reads.source
+        FROM inputs
+        JOIN pg_class v ON inputs.source_class = 'pg_class'::regclass AND v.oid = inputs.source AND v.relkind = 'v'
+        JOIN reads ON reads.reader = v.oid
+    ),
+    -- Views that read other materialized views refresh after them.
+    depth(oid, level) AS (
+        SELECT oid, 0 FROM matviews
+        UNION ALL
+        SELECT inputs.view_oid, depth.level + 1
+        FROM depth
+        JOIN inputs ON inputs.source_class = 'pg_class'::regclass AND inputs.source = depth.oid
+    )
+    SELECT
+        mv.relname,
+        mv.oid,
+        (SELECT max(depth.level) FROM depth WHERE depth.oid = mv.oid),
+        ARRAY(
+            SELECT i.source FROM inputs i JOIN pg_class c ON c.oid = i.source
+            WHERE i.view_oid = mv.oid AND i.source_class = 'pg_class'::regclass AND c.relkind IN ('r', 'p', 'f')
+        ),
+        ARRAY(
+            SELECT i.source FROM inputs i JOIN pg_class c ON c.oid = i.source
+            WHERE i.view_oid = mv.oid AND i.source_class = 'pg_class'::regclass AND c.relkind = 'm'
+        ),
+        EXISTS (
+            SELECT 1 FROM inputs i JOIN pg_proc p ON p.oid = i.source
+            WHERE i.view_oid = mv.oid AND i.source_class = 'pg_proc'::regclass AND p.provolatile <> 'i'
+        )
+    FROM matviews mv
+    ORDER BY 3, 1
+$$ LANGUAGE sql STABLE
+"""
+
+REFRESH_MATERIALIZED_VIEW = """
+CREATE OR REPLACE FUNCTION data_views.refresh_materialized_view(view_name NAME)
+RETURNS void AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_index i
+        JOIN pg_class t ON t.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        WHERE n.nspname = 'data_views' AND t.relname = view_name AND i.indisunique
+    ) THEN
+        EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY data_views.%I', view_name);
+    ELSE
+        EXECUTE format('REFRESH MATERIALIZED VIEW data_views.%I', view_name);
+        RAISE NOTICE 'Materialized view data_views.% refreshed non-concurrently (no unique index)', view_name;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Shared by both refresh functions: install missing triggers (skipped without the privilege to do so),
+# lock the generation row against overlapping runs and snapshot the counters before refreshing anything.
+_SNAPSHOT_SOURCE_VERSIONS = """
+    BEGIN
+        PERFORM data_views.track_source_changes();
+    EXCEPTION WHEN insufficient_privilege THEN
+        RAISE NOTICE 'Change tracking not installed on new tables: %', SQLERRM;
+    END;
+
+    SELECT source_versions INTO previous_versions
+    FROM data_views.refresh_generation
+    WHERE id
+    FOR UPDATE;
+
+    SELECT COALESCE(jsonb_object_agg(source_table::oid::text, version), '{}'::jsonb)
+    INTO current_versions
+    FROM data_views.source_table_versions;
+"""
+
+REFRESH_ALL = f"""
+CREATE OR REPLACE FUNCTION data_views.refresh_all_materialized_views()
+RETURNS void AS $$
+DECLARE
+    previous_versions JSONB;
+    current_versions JSONB;
+    view_name NAME;
+    new_generation BIGINT;
+BEGIN
+{_SNAPSHOT_SOURCE_VERSIONS}
+    FOR view_name IN SELECT v.view_name FROM data_views.materialized_view_inputs() v LOOP
+        PERFORM data_views.refresh_materialized_view(view_name);
+    END LOOP;
+
+    UPDATE data_views.refresh_generation
+    SET generation = generation + 1, refreshed_at = now(), source_versions = current_versions
+    WHERE id
+    RETURNING generation INTO new_generation;
+
+    PERFORM pg_notify('data_views_refreshed', new_generation::text);
+END;
+$$ LANGUAGE plpgsql
+"""
+
+REFRESH_CHANGED = f"""
+CREATE OR REPLACE FUNCTION data_views.refresh_changed_materialized_views()
+RETURNS integer AS $$
+DECLARE
+    previous_versions JSONB;
+    current_versions JSONB;
+    changed_tables OID[];
+    tracked_tables OID[];
+    refreshed OID[] := '{{}}';
+    v RECORD;
+    new_generation BIGINT;
+BEGIN
+{_SNAPSHOT_SOURCE_VERSIONS}
+    SELECT
+        COALESCE(array_agg(s.source_table::oid), '{{}}'),
+        COALESCE(array_agg(s.source_table::oid) FILTER (
+            WHERE (previous_versions ->> s.source_table::oid::text) IS DISTINCT FROM s.version::text
+        ), '{{}}')
+    INTO tracked_tables, changed_tables
+    FROM data_views.source_table_versions s;
+
+    FOR v IN SELECT * FROM data_views.materialized_view_inputs() LOOP
+        IF previous_versions IS NULL
+           OR v.source_tables && changed_tables
+           OR v.source_views && refreshed
+           OR NOT (v.source_tables <@ tracked_tables)
+           OR (v.calls_functions AND (cardinality(changed_tables) > 0 OR cardinality(refreshed) > 0))
+        THEN
+            PERFORM data_views.refresh_materialized_view(v.view_name);
+            refreshed := refreshed || v.view_oid;
+        END IF;
+    END LOOP;
+
+    IF cardinality(refreshed) = 0 THEN
+        UPDATE data_views.refresh_generation SET source_versions = current_versions WHERE id;
+        RETURN 0;
+    END IF;
+
+    UPDATE data_views.refresh_generation
+    SET generation = generation + 1, refreshed_at = now(), source_versions = current_versions
+    WHERE id
+    RETURNING generation INTO new_generation;
+
+    PERFORM pg_notify('data_views_refreshed', new_generation::text);
+    RETURN cardinality(refreshed);
+END;
+$$ LANGUAGE plpgsql
+"""
+
+DROP_SOURCE_CHANGE_TRIGGERS = """
+DO $$
+DECLARE
+    source_table REGCLASS;
+BEGIN
+    FOR source_table IN
+        SELECT t.tgrelid::regclass FROM pg_trigger t WHERE t.tgname = 'data_views_source_change'
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS data_views_source_change ON %s', source_table);
+    END LOOP;
+END;
+$$
+"""
+
+
+# The migration role may not own the NocoDB tables; without the triggers every view counts as reading untracked
+# tables and is refreshed on each run, as before this revision.
+INSTALL_SOURCE_CHANGE_TRIGGERS = """
+DO $$
+BEGIN
+    PERFORM data_views.track_source_changes();
+EXCEPTION WHEN insufficient_privilege THEN
+    RAISE NOTICE 'Change tracking not installed: %', SQLERRM;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute(SOURCE_TABLE_VERSIONS)
+    op.execute(NOTE_SOURCE_CHANGE)
+    op.execute(TRACK_SOURCE_CHANGES)
+    op.execute(MATERIALIZED_VIEW_INPUTS)
+    op.execute(REFRESH_MATERIALIZED_VIEW)
+    op.execute(REFRESH_ALL)
+    op.execute(REFRESH_CHANGED)
+    op.execute(INSTALL_SOURCE_CHANGE_TRIGGERS)
+
+
+def downgrade() -> None:
+    previous = importlib.import_module("alembic_views.versions.202610171500_unified_search_index")
+    op.execute(previous.REFRESH_ALL_IN_DEPENDENCY_ORDER)
+    op.execute("DROP FUNCTION IF EXISTS data_views.refresh_changed_materialized_views()")
+    op.execute("DROP FUNCTION IF EXISTS data_views.refresh_materialized_view(name)")
+    op.execute("DROP FUNCTION IF EXISTS data_views.materialized_view_inputs()")
+    op.execute(DROP_SOURCE_CHANGE_TRIGGERS)
+    op.execute("DROP FUNCTION IF EXISTS data_views.track_source_changes(text)")
+    op.execute("DROP FUNCTION IF EXISTS data_views.note_source_change()")
+    op.execute("ALTER TABLE data_views.refresh_generation DROP COLUMN IF EXISTS source_versions")
+    op.execute("DROP TABLE IF EXISTS data_views.source_table_versions")
@@ -0,0 +1,164 @@
+"""Return the search total for pages past the last one without a second scan.
+
+``search_all_v2`` carries the total on every returned row
+(``count(*) OVER ()``, revision ``202610171000``). A page past the last one
+returns no rows, so the API asked again for a one-row first page just to
+read the total — the second full match scan the window count was meant to
+remove.
+
+This revision re-creates ``search_all_v2`` so that a page past the last one
+(``page > 1`` or an ``after_key`` given, nothing left to return) yields one
+row with only ``total_count`` set and every other column NULL:
+
+  - with ``exact_count`` the matches are materialized once in a CTE; the
+    page is read from it and, when the page is empty, the total-only row
+    takes the window count from the same CTE;
+  - with ``exact_count = FALSE`` the total-only row carries the planner
+    estimate already computed for the call.
+
+First pages are unchanged: an empty first page still returns no rows, so
+``search_fallback`` and other callers of the first page see no difference.
+The API drops the total-only row (``record_id IS NULL``) and reports its
+total.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610172400"
+down_revision = "202610172300"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_ALL_V2 = """
+CREATE OR REPLACE FUNCTION data_views.search_all_v2(
+    search_term TEXT,
+    filter_tables TEXT[] DEFAULT NULL,
+    filter_jurisdictions TEXT[] DEFAULT NULL,
+    filter_themes TEXT[] DEFAULT NULL,
+    page INT DEFAULT 1,
+    page_size INT DEFAULT 50,
+    sort_by_date BOOLEAN DEFAULT FALSE,
+    after_key JSONB DEFAULT NULL,
+    exact_count BOOLEAN DEFAULT TRUE,
+    query_syntax TEXT DEFAULT 'plain'
+)
+RETURNS TABLE(
+    table_name TEXT,
+    record_id INTEGER,
+    complete_record JSONB,
+    rank REAL,
+    result_date DATE,
+    sort_key JSONB,
+    total_count BIGINT
+) AS $$
+DECLARE
+    offset_val INT := CASE WHEN after_key IS NULL THEN (page - 1) * page_size ELSE 0 END;
+    past_first_page BOOLEAN := page > 1 OR after_key IS NOT NULL;
+    plan JSONB;
+    estimated BIGINT;
+    search_query TSQUERY := data_views._search_query(search_term, query_syntax);
+BEGIN
+    IF exact_count THEN
+        RETURN QUERY
+        WITH matches AS MATERIALIZED (
+            SELECT m.*, count(*) OVER () AS total
+            FROM data_views._search_matches(
+                search_query, filter_tables, filter_jurisdictions, filter_themes, sort_by_date
+            ) m
+        ),
+        page_keys AS (
+            SELECT k.*
+            FROM matches k
+            WHERE after_key IS NULL
+               OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+                      (after_key->>0)::int,
+                      (after_key->>1)::numeric,
+                      (after_key->>2)::int,
+                      (after_key->>3)::real,
+                      after_key->>4,
+                      (after_key->>5)::int
+                  )
+            ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+            LIMIT page_size OFFSET offset_val
+        )
+        SELECT r.table_name, r.record_id, r.complete_record, r.rank, r.result_date, r.sort_key, r.total
+        FROM (
+            SELECT
+                p.table_name,
+                p.record_id,
+                si.complete_record,
+                p.rank,
+                p.result_date,
+                jsonb_build_array(p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id)
+                    AS sort_key,
+                p.total,
+                p.k_bucket,
+                p.k_case_rank,
+                p.k_date,
+                p.k_rank
+            FROM page_keys p
+            JOIN data_views.search_index si ON si.table_name = p.table_name AND si.record_id = p.record_id
+            UNION ALL
+            SELECT NULL, NULL, NULL, NULL, NULL, NULL, COALESCE((SELECT k.total FROM matches k LIMIT 1), 0),
+                   NULL, NULL, NULL, NULL
+            WHERE past_first_page AND NOT EXISTS (SELECT 1 FROM page_keys)
+        ) r
+        ORDER BY r.k_bucket, r.k_case_rank, r.k_date, r.k_rank, r.table_name, r.record_id;
+        RETURN;
+    END IF;
+
+    EXECUTE format(
+        'EXPLAIN (FORMAT JSON) SELECT 1 FROM data_views._search_matches(%L::tsquery, %L, %L, %L)',
+        search_query, filter_tables, filter_jurisdictions, filter_themes
+    ) INTO plan;
+    estimated := (plan->0->'Plan'->>'Plan Rows')::numeric::bigint;
+
+    RETURN QUERY
+    SELECT
+        p.table_name,
+        p.record_id,
+        si.complete_record,
+        p.rank,
+        p.result_date,
+        jsonb_build_array(p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id),
+        estimated
+    FROM (
+        SELECT k.*
+        FROM data_views._search_matches(
+            search_query, filter_tables, filter_jurisdictions, filter_themes, sort_by_date
+        ) k
+        WHERE after_key IS NULL
+           OR (k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id) > (
+                  (after_key->>0)::int,
+                  (after_key->>1)::numeric,
+                  (after_key->>2)::int,
+                  (after_key->>3)::real,
+                  after_key->>4,
+                  (after_key->>5)::int
+              )
+        ORDER BY k.k_bucket, k.k_case_rank, k.k_date, k.k_rank, k.table_name, k.record_id
+        LIMIT page_size OFFSET offset_val
+    ) p
+    JOIN data_views.search_index si ON si.table_name = p.table_name AND si.record_id = p.record_id
+    ORDER BY p.k_bucket, p.k_case_rank, p.k_date, p.k_rank, p.table_name, p.record_id;
+
+    IF NOT FOUND AND past_first_page THEN
+        RETURN QUERY SELECT NULL::text, NULL::integer, NULL::jsonb, NULL::real, NULL::date, NULL::jsonb, estimated;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_ALL_V2)
+
+
+def downgrade() -> None:
+    previous = importlib.import_module("alembic_views.versions.202610171800_websearch_query_syntax")
+    op.execute(previous.SEARCH_ALL_V2.replace("CREATE FUNCTION", "CREATE OR REPLACE FUNCTION", 1))
@@ -0,0 +1,65 @@
+"""Notify the API when a NocoDB table changes.
+
+ETags of endpoints that read NocoDB tables or plain views (``base_*``,
+``_nc_m2m_*``) were keyed on the refresh generation alone, which moves only
+when materialized views are refreshed, so edits made in between were answered
+with 304 Not Modified until the next refresh.
+
+This revision re-creates ``data_views.note_source_change()`` (revision
+``202610172300``) so that it sends ``NOTIFY nocodb_source_changed, '<table>'``
+besides bumping the table's counter in ``data_views.source_table_versions``.
+The API listens on the channel, re-reads the counters and includes them in
+those ETags. Notifications are delivered on commit.
+
+Both are now done once per transaction and table. The new
+``changed_txid`` column records the transaction that last bumped the counter.
+Later statements of that transaction match no row, so they write nothing and
+send nothing. Before, a bulk import of N statements rewrote the counter row
+N times and queued N notifications.
+
+Lock cost: the bump is an UPDATE of one row per table. The writing transaction
+holds that row lock until it commits, so concurrent transactions writing the
+same table wait for each other at their first statement. NocoDB's API writes
+commit right away, so the wait is one short transaction. A long transaction
+writing a table makes other writers to that table wait until it ends.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from alembic import op
+
+revision = "202610172500"
+down_revision = "202610172400"
+branch_labels = None
+depends_on = None
+
+
+NOTE_SOURCE_CHANGE = """
+ALTER TABLE data_views.source_table_versions ADD COLUMN IF NOT EXISTS changed_txid BIGINT;
+
+CREATE OR REPLACE FUNCTION data_views.note_source_change()
+RETURNS trigger AS $$
+BEGIN
+    UPDATE data_views.source_table_versions
+    SET version = version + 1, changed_at = now(), changed_txid = txid_current()
+    WHERE source_table = TG_RELID::regclass
+      AND changed_txid IS DISTINCT FROM txid_current();
+    IF FOUND THEN
+        PERFORM pg_notify('nocodb_source_changed', TG_RELID::regclass::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = pg_catalog, pg_temp
+"""
+
+
+def upgrade() -> None:
+    op.execute(NOTE_SOURCE_CHANGE)
+
+
+def downgrade() -> None:
+    previous = importlib.import_module("alembic_views.versions.202610172300_incremental_refresh")
+    op.execute(previous.NOTE_SOURCE_CHANGE)
+    op.execute("ALTER TABLE data_views.source_table_versions DROP COLUMN IF EXISTS changed_txid")
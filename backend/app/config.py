@@ -20,6 +20,13 @@ class Config(BaseSettings):
     NOCODB_BASE_URL: str | None = None
     NOCODB_API_TOKEN: str | None = None
     NOCODB_POSTGRES_SCHEMA: str | None = None
+    # In-process full-text search cache (0 disables)
+    SEARCH_CACHE_MAX_ENTRIES: int = 512
+    SEARCH_CACHE_TTL_SECONDS: float = 900.0
+    # In-process cache of typeahead prefixes (0 disables); shares SEARCH_CACHE_TTL_SECONDS
+    SEARCH_SUGGEST_CACHE_MAX_ENTRIES: int = 2048
+    # Prepared statements cached per async connection (0 disables, e.g. behind a transaction-pooling PgBouncer)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256
     # Suggestions storage configuration
     SUGGESTIONS_SQL_CONN_STRING: str | None = None
     # Auth0 configuration
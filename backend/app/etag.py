@@ -0,0 +1,79 @@
+import hashlib
+
+from fastapi import HTTPException, Request, Response, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.database import recording_query_failures
+from app.services.db_manager import db_manager
+
+
+def _etag(version: str, request: Request) -> str:
+    params = sorted(request.query_params.multi_items())
+    raw = f"{version}|{request.url.path}|{params}".encode()
+    return f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _conditional_get(version: str | None, request: Request, response: Response) -> None:
+    if version is None:
+        return
+    etag = _etag(version, request)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+
+async def generation_etag(request: Request, response: Response) -> None:
+    """Conditional GET for endpoints served only from materialized views.
+
+    The ETag covers the materialized-view refresh generation, the path and the sorted query parameters, so it
+    changes exactly when the underlying views are refreshed. A matching ``If-None-Match`` short-circuits with
+    304 before the endpoint runs any query. No ETag is sent while the generation is unknown.
+    """
+    generation = db_manager.refresh_generation
+    _conditional_get(None if generation is None else str(generation), request, response)
+
+
+async def live_data_etag(request: Request, response: Response) -> None:
+    """Conditional GET for endpoints that also read NocoDB tables or plain views.
+
+    Like ``generation_etag``, but the ETag also covers ``db_manager.source_version``, which moves on every
+    write to a tracked NocoDB table, so edits show up before the next refresh. Without change tracking (no
+    triggers installed) it falls back to ``generation_etag``.
+    """
+    source_version = db_manager.source_version
+    if source_version is None:
+        await generation_etag(request, response)
+        return
+    generation = db_manager.refresh_generation
+    _conditional_get(None if generation is None else f"{generation}|{source_version}", request, response)
+
+
+class FallbackETagMiddleware:
+    """Drop the ETag from responses built after a swallowed database error.
+
+    Services turn a failed query into an empty result (see ``note_query_failure``); such a response must not be
+    revalidated as current until the next change.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with recording_query_failures() as failures:
+
+            async def send_without_stale_etag(message: Message) -> None:
+                if message["type"] == "http.response.start" and failures:
+                    message["headers"] = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"etag"]
+                await send(message)
+
+            await self.app(scope, receive, send_without_stale_etag)
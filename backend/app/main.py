@@ -7,6 +7,7 @@ from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import config
+from app.etag import FallbackETagMiddleware
 from app.routes import (
     ai,
     case_analyzer,
@@ -19,7 +20,7 @@ from app.routes import (
     submarine,
     suggestions as suggestions_router,
 )
-from app.services.db_manager import db_manager, suggestions_db_manager
+from app.services.db_manager import async_db_manager, db_manager, suggestions_db_manager
 from app.services.http_session_manager import http_session_manager
 
 # Configure logging to send to Logfire
@@ -43,6 +44,16 @@ async def lifespan(app: FastAPI):
                 pool_pre_ping=True,
             )
             logger.info("Main database connection pool initialized")
+            db_manager.start_refresh_listener()
+            async_db_manager.initialize(
+                connection_string=config.SQL_CONN_STRING,
+                pool_size=20,
+                max_overflow=30,
+                pool_recycle=3600,
+                pool_pre_ping=True,
+                prepared_statement_cache_size=config.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            )
+            logger.info("Async database connection pool initialized")
         else:
             logger.warning("SQL_CONN_STRING not configured, database operations will fail")
 
@@ -72,6 +83,7 @@ async def lifespan(app: FastAPI):
         logger.info("Shutting down connection pools...")
 
         db_manager.dispose()
+        await async_db_manager.dispose()
         suggestions_db_manager.dispose()
 
         http_session_manager.close()
@@ -215,12 +227,14 @@ app = FastAPI(
 
 origins = ["*"]
 
+app.add_middleware(FallbackETagMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 api_router = APIRouter(prefix="/api/v1")
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
 
+from app.etag import live_data_etag
 from app.schemas.relations import (
     ArbitralAwardRelation,
     ArbitralInstitutionRelation,
@@ -22,7 +23,7 @@ from app.schemas.relations import (
 )
 from app.services.entity_list import (
     ENTITY_LIST_CONFIGS,
-    EntityListService,
+    AsyncEntityListService,
     list_entity_slugs,
 )
 
@@ -53,11 +54,11 @@ class EntityListResponse(BaseModel):
     page_size: int
 
 
-def get_entity_list_service() -> EntityListService:
-    return EntityListService()
+def get_entity_list_service() -> AsyncEntityListService:
+    return AsyncEntityListService()
 
 
-router = APIRouter(prefix="/entities", tags=["Entities"])
+router = APIRouter(prefix="/entities", tags=["Entities"], dependencies=[Depends(live_data_etag)])
 
 
 @router.get(
@@ -79,7 +80,7 @@ router = APIRouter(prefix="/entities", tags=["Entities"])
         404: {"description": "Unknown entity slug."},
     },
 )
-def list_entity(
+async def list_entity(
     slug: Annotated[str, Path(description="Entity slug, e.g. 'court-decisions'")],
     jurisdiction: Annotated[
         str | None,
@@ -103,7 +104,7 @@ def list_entity(
         Literal["asc", "desc"] | None,
         Query(description="Override default order direction."),
     ] = None,
-    service: EntityListService = Depends(get_entity_list_service),
+    service: AsyncEntityListService = Depends(get_entity_list_service),
 ) -> EntityListResponse:
     cfg = ENTITY_LIST_CONFIGS.get(slug)
     if cfg is None:
@@ -117,7 +118,7 @@ def list_entity(
         extra["case_rank"] = case_rank
 
     try:
-        items, total = service.list_entity(
+        items, total = await service.list_entity(
             cfg,
             jurisdiction=jurisdiction,
             theme=theme,
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends
 
+from app.etag import live_data_etag
 from app.schemas.responses import LandingPageJurisdiction
 from app.services.landing_page import LandingPageService
 
@@ -8,7 +9,7 @@ def get_landing_page_service() -> LandingPageService:
     return LandingPageService()
 
 
-router = APIRouter(prefix="/landing-page", tags=["LandingPage"])
+router = APIRouter(prefix="/landing-page", tags=["LandingPage"], dependencies=[Depends(live_data_etag)])
 
 
 @router.get(
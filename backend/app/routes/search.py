@@ -1,16 +1,36 @@
+import csv
+import io
+import json
 import logging
 import re
+from collections.abc import Iterable, Iterator
 from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic.alias_generators import to_camel
 
+from app.etag import generation_etag, live_data_etag
 from app.schemas.details import TABLE_DETAIL_MODELS, AnyDetail, DetailBase
 from app.schemas.records import AnyRecord, validate_record
-from app.schemas.requests import FilterValue, FTFilterOption, FTSFilterOption
-from app.schemas.responses import FullTextSearchResponse, SpecialistResponse
+from app.schemas.relations import EntityRelations
+from app.schemas.requests import (
+    MAX_DETAIL_BATCH,
+    EntityDetailBatchRequest,
+    FilterValue,
+    FTFilterOption,
+    FTSFilterOption,
+)
+from app.schemas.responses import (
+    EntityDetailBatchResponse,
+    FullTextSearchResponse,
+    RelationPageResponse,
+    SearchFacetsResponse,
+    SearchSuggestResponse,
+    SpecialistResponse,
+)
 from app.schemas.search_result import validate_search_result
-from app.services.search import SearchService
+from app.services.search import AsyncSearchService, SearchService
 
 logger = logging.getLogger(__name__)
 
@@ -55,10 +75,85 @@ def _parse_full_table_filter(raw: str) -> FTFilterOption:
     return FTFilterOption(column=column, value=value)
 
 
+def _export_records(rows: Iterable[dict[str, Any]], exclude_unset: bool = False) -> Iterator[dict[str, Any]]:
+    for row in rows:
+        yield validate_record(_camel_keys(row)).model_dump(mode="json", by_alias=True, exclude_unset=exclude_unset)
+
+
+def _ndjson_lines(rows: Iterable[dict[str, Any]], exclude_unset: bool = False) -> Iterator[str]:
+    try:
+        for record in _export_records(rows, exclude_unset):
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+    except Exception:
+        logger.exception("NDJSON export aborted mid-stream")
+        raise
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return "" if value is None else value
+
+
+def _csv_lines(rows: Iterable[dict[str, Any]], exclude_unset: bool = False) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    columns: list[str] | None = None
+    try:
+        for record in _export_records(rows, exclude_unset):
+            if columns is None:
+                columns = list(record)
+                writer.writerow(columns)
+            writer.writerow([_csv_cell(record.get(column)) for column in columns])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    except Exception:
+        logger.exception("CSV export aborted mid-stream")
+        raise
+
+
+def _etag_headers(response: Response) -> dict[str, str]:
+    """The ETag set on ``response`` by a dependency; responses returned directly skip its headers."""
+    etag = response.headers.get("etag")
+    return {"ETag": etag} if etag else {}
+
+
+def _sparse_response(content: Any, response: Response) -> JSONResponse:
+    """Send a sparse-fieldset payload as dumped, so unselected fields are left out rather than filled with nulls."""
+    return JSONResponse(content, headers=_etag_headers(response))
+
+
+_FIELDS_DESCRIPTION = (
+    "Only return these fields (camelCase or snake_case; repeatable or comma-separated). `id`, `coldId` and "
+    "`sourceTable` are always returned; unknown names are ignored."
+)
+_INCLUDE_RELATIONS_DESCRIPTION = (
+    "Only return these relation lists (e.g. `jurisdictions,themes`; repeatable or comma-separated). "
+    "Pass it empty (`include_relations=`) to leave relations out."
+)
+
+
+_RELATION_LIMIT_DESCRIPTION = (
+    "Only return the first N items of each relation list; `relationCounts` still has the full counts and "
+    "`/search/details/{table}/{id}/relations/{kind}` pages through the rest. Omit for complete lists."
+)
+
+
+_EXPORT_FORMATS = {
+    "ndjson": (_ndjson_lines, "application/x-ndjson"),
+    "csv": (_csv_lines, "text/csv; charset=utf-8"),
+}
+
+
 def get_search_service() -> SearchService:
     return SearchService()
 
 
+def get_async_search_service() -> AsyncSearchService:
+    return AsyncSearchService()
+
+
 router = APIRouter(
     prefix="/search",
     tags=["Search"],
@@ -76,9 +171,23 @@ router = APIRouter(
         "Results are ranked by relevance and returned in a paginated envelope. "
         "Use the repeatable query parameters `tables`, `jurisdictions`, and `themes` to narrow results. "
         "Pass each filter value as a separate parameter, e.g. "
-        "`?tables=Answers&tables=Court+Decisions&jurisdictions=Switzerland`.\n\n"
-        "Set `sort_by_date=true` to order results chronologically (newest first) instead of by relevance."
+        "`?tables=Answers&tables=Court+Decisions&jurisdictions=Switzerland`. "
+        "Jurisdictions match by name or alpha-3 code and themes by name, exactly and case-insensitively; "
+        "several values of one filter match any of them.\n\n"
+        'Set `query_syntax=websearch` to use web-search style queries: `"party autonomy"` matches the '
+        "exact phrase, `or` between words matches either, and a leading `-` excludes a word. The default "
+        "`plain` syntax matches records containing all words.\n\n"
+        "Set `sort_by_date=true` to order results chronologically (newest first) instead of by relevance.\n\n"
+        "For deep pagination, pass the `next_cursor` of the previous response as `cursor` instead of "
+        "incrementing `page`; cursor requests do not grow slower with depth. They skip the exact count, so their "
+        "`total_matches` is the query planner's estimate (`total_is_estimate` is true); keep the first page's "
+        "exact total if you need it. `page` and `cursor` cannot be combined, and cursor responses have no `page`.\n\n"
+        "When a query matches nothing, misspelled words are replaced by the closest indexed words and the "
+        "first page for the corrected query is returned with the correction in `did_you_mean`.\n\n"
+        "Set `estimate_total=true` to skip the exact count and return the query planner's row estimate; "
+        "`total_is_estimate` tells which one you got."
     ),
+    response_model=FullTextSearchResponse,
     responses={
         200: {
             "description": "Search results including pagination and total matches.",
@@ -88,8 +197,10 @@ router = APIRouter(
                         "query": "example search",
                         "filters": [{"column": "tables", "values": ["Answers"]}],
                         "total_matches": 2,
+                        "total_is_estimate": False,
                         "page": 1,
                         "page_size": 2,
+                        "next_cursor": "WzAsMCwwLC0wLjA2LCJBbnN3ZXJzIiwxMl0",
                         "results": [
                             {
                                 "source_table": "Answers",
@@ -108,16 +219,34 @@ router = APIRouter(
         }
     },
 )
-def handle_full_text_search(
+async def handle_full_text_search(
     search_string: Annotated[str | None, Query(description="Free-text query string")] = None,
     tables: Annotated[list[str] | None, Query(description="Restrict to source tables (repeatable)")] = None,
-    jurisdictions: Annotated[list[str] | None, Query(description="Filter by jurisdictions (repeatable)")] = None,
+    jurisdictions: Annotated[
+        list[str] | None, Query(description="Filter by jurisdiction names or alpha-3 codes (repeatable)")
+    ] = None,
     themes: Annotated[list[str] | None, Query(description="Filter by themes (repeatable)")] = None,
-    page: Annotated[int, Query(ge=1, description="Page number, must be >= 1")] = 1,
+    page: Annotated[
+        int | None, Query(ge=1, description="Page number, must be >= 1. Defaults to 1; not allowed with `cursor`.")
+    ] = None,
     page_size: Annotated[int, Query(ge=1, le=100, description="Number of results per page")] = 50,
     sort_by_date: Annotated[bool, Query(description="Sort results by date descending if True.")] = False,
-    search_service: SearchService = Depends(get_search_service),
-) -> FullTextSearchResponse:
+    cursor: Annotated[
+        str | None,
+        Query(description="Opaque `next_cursor` from a previous response. Not allowed with `page`."),
+    ] = None,
+    estimate_total: Annotated[
+        bool,
+        Query(description="Return an approximate `total_matches` from the query planner instead of counting."),
+    ] = False,
+    query_syntax: Annotated[
+        Literal["plain", "websearch"],
+        Query(description="`plain` matches all words; `websearch` adds quoted phrases, `or` and `-word`."),
+    ] = "plain",
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+) -> FullTextSearchResponse | JSONResponse:
+    if cursor is not None and page is not None:
+        raise HTTPException(status_code=422, detail="Use either `page` or `cursor`, not both")
     filters: list[FTSFilterOption] = []
     if tables:
         filters.append(FTSFilterOption(column="tables", values=tables))
@@ -126,16 +255,87 @@ def handle_full_text_search(
     if themes:
         filters.append(FTSFilterOption(column="themes", values=themes))
 
-    raw = search_service.full_text_search(
-        search_string,
-        filters,
-        page,
-        page_size,
-        sort_by_date,
-        response_type="parsed",
-    )
+    try:
+        raw = await search_service.full_text_search(
+            search_string,
+            filters,
+            page or 1,
+            page_size,
+            sort_by_date,
+            response_type="parsed",
+            cursor=cursor,
+            estimate_total=estimate_total,
+            query_syntax=query_syntax,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     validated_results = [validate_search_result(r) for r in raw.pop("results", [])]
-    return FullTextSearchResponse(results=validated_results, **raw)
+    search_response = FullTextSearchResponse(results=validated_results, **raw)
+    if cursor is None:
+        return search_response
+    # Keyset pages have no page number; leave the field out instead of sending null.
+    return JSONResponse(search_response.model_dump(mode="json", by_alias=True, exclude={"page"}))
+
+
+@router.get(
+    "/facets",
+    summary="Facet counts for a full-text search",
+    description=(
+        "Returns how many records match the query per source table, jurisdiction and theme, together with "
+        "the overall total. Accepts the same `search_string`, `tables`, `jurisdictions`, `themes` "
+        "and `query_syntax` parameters as the search endpoint, and all counts respect every filter given. A record linked to "
+        "several jurisdictions or themes counts once under each of them. Facets are ordered by count, "
+        "highest first."
+    ),
+    response_model=SearchFacetsResponse,
+)
+async def handle_search_facets(
+    search_string: Annotated[str | None, Query(description="Free-text query string")] = None,
+    tables: Annotated[list[str] | None, Query(description="Restrict to source tables (repeatable)")] = None,
+    jurisdictions: Annotated[
+        list[str] | None, Query(description="Filter by jurisdiction names or alpha-3 codes (repeatable)")
+    ] = None,
+    themes: Annotated[list[str] | None, Query(description="Filter by themes (repeatable)")] = None,
+    query_syntax: Annotated[
+        Literal["plain", "websearch"],
+        Query(description="`plain` matches all words; `websearch` adds quoted phrases, `or` and `-word`."),
+    ] = "plain",
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+) -> SearchFacetsResponse:
+    filters: list[FTSFilterOption] = []
+    if tables:
+        filters.append(FTSFilterOption(column="tables", values=tables))
+    if jurisdictions:
+        filters.append(FTSFilterOption(column="jurisdictions", values=jurisdictions))
+    if themes:
+        filters.append(FTSFilterOption(column="themes", values=themes))
+
+    return SearchFacetsResponse(**await search_service.search_facets(search_string, filters, query_syntax))
+
+
+@router.get(
+    "/suggest",
+    summary="Typeahead suggestions for the search box",
+    description=(
+        "Returns records whose short label starts with `prefix`, or has a word starting with it: court "
+        "decision citations, literature titles, jurisdiction names and alpha-3 codes, instrument titles and "
+        "abbreviations, arbitral institutions and arbitral rules. Matching is case-insensitive. Labels that "
+        "start with the prefix rank first, then shorter labels. Each suggestion carries the `source_table` "
+        "and `id` to open it with `/search/details`.\n\n"
+        "Answers come from a prefix index rebuilt with the materialized views, not from full-text search, "
+        "so this is cheap enough to call on every keystroke."
+    ),
+    response_model=SearchSuggestResponse,
+    responses={304: {"description": "Not modified since the ETag sent in If-None-Match."}},
+    dependencies=[Depends(generation_etag)],
+)
+async def handle_search_suggest(
+    prefix: Annotated[str, Query(min_length=1, max_length=200, description="What the user has typed so far")],
+    tables: Annotated[list[str] | None, Query(description="Restrict to source tables (repeatable)")] = None,
+    limit: Annotated[int, Query(ge=1, le=25, description="Maximum number of suggestions")] = 10,
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+) -> SearchSuggestResponse:
+    return SearchSuggestResponse(**await search_service.suggest(prefix, tables, limit))
 
 
 @router.get(
@@ -145,25 +345,110 @@ def handle_full_text_search(
         "Returns the full detail for one record, identified by its source table and CoLD ID "
         "(e.g. `table=Court+Decisions&id=CD-CHE-42`). The response includes the record's own fields "
         "plus all first-hop relations (linked jurisdictions, themes, instruments, literature, etc.) "
-        "in a standardised shape. Ideal for building detail pages or enriching search results."
+        "in a standardised shape. Ideal for building detail pages or enriching search results.\n\n"
+        "Use `fields` and `include_relations` to fetch only what you need, e.g. "
+        "`fields=caseCitation,dateOfJudgment&include_relations=jurisdictions`; fields and relation lists "
+        "that were not selected are left out of the response.\n\n"
+        "`relationCounts` gives the number of related entities of each kind. For records with many relations "
+        "(e.g. jurisdictions), set `relation_limit` to receive only the first items of each list and load the "
+        "rest from `/search/details/{table}/{id}/relations/{kind}`."
     ),
     response_model=AnyDetail,
-    responses={404: {"description": "Record not found."}},
+    responses={
+        304: {"description": "Not modified since the ETag sent in If-None-Match."},
+        404: {"description": "Record not found."},
+    },
+    dependencies=[Depends(live_data_etag)],
 )
-def handle_entity_detail(
+async def handle_entity_detail(
     table: Annotated[str, Query(description="Source table name (e.g. 'Answers')")],
     cold_id: Annotated[str, Query(alias="id", description="CoLD ID for the record")],
-    search_service: SearchService = Depends(get_search_service),
-) -> AnyDetail:
+    response: Response,
+    fields: Annotated[list[str] | None, Query(description=_FIELDS_DESCRIPTION)] = None,
+    include_relations: Annotated[list[str] | None, Query(description=_INCLUDE_RELATIONS_DESCRIPTION)] = None,
+    relation_limit: Annotated[int | None, Query(ge=0, le=500, description=_RELATION_LIMIT_DESCRIPTION)] = None,
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+) -> AnyDetail | JSONResponse:
     try:
-        result = search_service.get_entity_detail(table, cold_id)
+        result = await search_service.get_entity_detail(table, cold_id, fields, include_relations, relation_limit)
     except ValueError as e:
         logger.warning("Invalid entity detail request: table=%s id=%s: %s", table, cold_id, e)
         raise HTTPException(status_code=400, detail="Invalid request parameters") from e
     if not result:
         raise HTTPException(status_code=404, detail=f"No record found for {cold_id} in {table}")
     model = TABLE_DETAIL_MODELS.get(result.get("source_table", ""), DetailBase)
-    return model.model_validate(result)
+    detail = model.model_validate(result)
+    if fields is None and include_relations is None:
+        return detail
+    return _sparse_response(detail.model_dump(mode="json", by_alias=True, exclude_unset=True), response)
+
+
+@router.post(
+    "/details/batch",
+    summary="Fetch many records by CoLD ID with related entities",
+    description=(
+        f"Returns the same detail as `/search/details` for up to {MAX_DETAIL_BATCH} records in one call, "
+        "e.g. for related-entity cards or comparison views. The body lists `{table, id}` pairs; they are "
+        "resolved in a single query. `results` follows the request order with duplicates fetched once, and "
+        "pairs with no record are listed in `missing` instead of failing the whole request. `fields` and "
+        "`include_relations` work as for `/search/details`."
+    ),
+    response_model=EntityDetailBatchResponse,
+    responses={400: {"description": "Unsupported table in the request."}},
+)
+async def handle_entity_detail_batch(
+    body: EntityDetailBatchRequest,
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+) -> EntityDetailBatchResponse | JSONResponse:
+    try:
+        batch = await search_service.get_entity_details(
+            [(item.table, item.id) for item in body.items], body.fields, body.include_relations, body.relation_limit
+        )
+    except ValueError as e:
+        logger.warning("Invalid entity detail batch request: %s", e)
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    results = [
+        TABLE_DETAIL_MODELS.get(result.get("source_table", ""), DetailBase).model_validate(result)
+        for result in batch["results"]
+    ]
+    batch_response = EntityDetailBatchResponse(results=results, missing=batch["missing"])
+    if body.fields is None and body.include_relations is None:
+        return batch_response
+    return JSONResponse(batch_response.model_dump(mode="json", by_alias=True, exclude_unset=True))
+
+
+@router.get(
+    "/details/{table}/{cold_id}/relations/{kind}",
+    summary="Page through one relation list of a record",
+    description=(
+        "Returns the related entities of one kind (e.g. `courtDecisions`) for a record, in the same order as "
+        "in `/search/details`, `limit` at a time. Pass the `nextAfter` of a page as `after` to fetch the next "
+        "one; it is null on the last page. Pages are read from an index on the item position, so late pages "
+        "cost the same as the first. Use with `relation_limit` on `/search/details` to load heavy records "
+        "quickly and fetch the remaining items on demand. An unknown record returns an empty page."
+    ),
+    response_model=RelationPageResponse,
+    responses={
+        304: {"description": "Not modified since the ETag sent in If-None-Match."},
+        400: {"description": "Unsupported table or relation kind."},
+    },
+    dependencies=[Depends(live_data_etag)],
+)
+async def handle_entity_relations(
+    table: str,
+    cold_id: str,
+    kind: str,
+    after: Annotated[int, Query(ge=0, description="`nextAfter` of the previous page; 0 for the first page")] = 0,
+    limit: Annotated[int, Query(ge=1, le=200, description="Maximum number of items")] = 50,
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+) -> RelationPageResponse:
+    try:
+        page = await search_service.get_entity_relations(table, cold_id, kind, after, limit)
+    except ValueError as e:
+        logger.warning("Invalid entity relations request: table=%s id=%s kind=%s: %s", table, cold_id, kind, e)
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    items = getattr(EntityRelations.model_validate({page["kind"]: page["items"]}), page["kind"])
+    return RelationPageResponse(kind=page["kind"], items=items, next_after=page["next_after"])
 
 
 @router.get(
@@ -180,8 +465,15 @@ def handle_entity_detail(
         "Filters use the repeatable `filter` query parameter in `column:value` format "
         "(or `column:val1,val2` for OR). Values matching `true`/`false` are coerced to booleans; "
         "pure-digit strings to integers; everything else stays a string.\n\n"
-        "Example: `?table=Court+Decisions&filter=caseRank:10&filter=jurisdiction:Switzerland`."
+        "Example: `?table=Court+Decisions&filter=caseRank:10&filter=jurisdiction:Switzerland`.\n\n"
+        "Set `format=ndjson` (one JSON record per line) or `format=csv` to stream the export instead of "
+        "buffering it: rows are read through a server-side cursor and flushed as they arrive, so large dumps "
+        "start immediately and run in constant memory. CSV columns follow the first record; nested values "
+        "are JSON-encoded. An error mid-export aborts the transfer, so a file that arrives complete is complete.\n\n"
+        "Pass `fields` (e.g. `fields=caseCitation,dateOfJudgment`) to read and return only those columns; "
+        "large text columns that are not selected are never read."
     ),
+    response_model=list[AnyRecord],
     responses={
         200: {
             "description": "Array of transformed records from the requested table.",
@@ -195,15 +487,20 @@ def handle_entity_detail(
                             "Title": "…",
                         }
                     ]
-                }
+                },
+                "application/x-ndjson": {},
+                "text/csv": {},
             },
         },
+        304: {"description": "Not modified since the ETag sent in If-None-Match."},
         400: {"description": "Missing or invalid table parameter."},
         500: {"description": "Server error while querying the table."},
     },
+    dependencies=[Depends(live_data_etag)],
 )
 def return_full_table(
     table: Annotated[str, Query(description="Source table name")],
+    response: Response,
     filter_: Annotated[
         list[str] | None,
         Query(
@@ -223,11 +520,28 @@ def return_full_table(
         Literal["asc", "desc"] | None,
         Query(description="Sort direction when order_by is provided."),
     ] = "desc",
+    format_: Annotated[
+        Literal["json", "ndjson", "csv"],
+        Query(alias="format", description="`json` (default) returns an array; `ndjson` and `csv` stream the rows."),
+    ] = "json",
+    fields: Annotated[list[str] | None, Query(description=_FIELDS_DESCRIPTION)] = None,
     search_service: SearchService = Depends(get_search_service),
-) -> list[AnyRecord]:
+) -> list[AnyRecord] | StreamingResponse | JSONResponse:
     if not table:
         raise HTTPException(status_code=400, detail="No table provided")
     filters = [_parse_full_table_filter(f) for f in (filter_ or [])]
+    if format_ != "json":
+        try:
+            rows = search_service.iter_table(table, filters, order_by=order_by, order_dir=order_dir, limit=limit, fields=fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        encode, media_type = _EXPORT_FORMATS[format_]
+        filename = re.sub(r"[^a-z0-9]+", "_", table.strip().lower()).strip("_")
+        return StreamingResponse(
+            encode(rows, fields is not None),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}.{format_}"', **_etag_headers(response)},
+        )
     try:
         if filters:
             results = search_service.filtered_table(
@@ -237,6 +551,7 @@ def return_full_table(
                 order_by=order_by,
                 order_dir=order_dir,
                 limit=limit,
+                fields=fields,
             )
         else:
             results = search_service.full_table(
@@ -245,12 +560,16 @@ def return_full_table(
                 order_by=order_by,
                 order_dir=order_dir,
                 limit=limit,
+                fields=fields,
             )
     except Exception as e:
         logger.exception("Failed to query table=%s filters=%d", table, len(filters))
         raise HTTPException(status_code=500, detail="Failed to query table") from e
 
-    return [validate_record(_camel_keys(r)) for r in results]
+    records = [validate_record(_camel_keys(r)) for r in results]
+    if fields is None:
+        return records
+    return _sparse_response([record.model_dump(mode="json", by_alias=True, exclude_unset=True) for record in records], response)
 
 
 @router.get(
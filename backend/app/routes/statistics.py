@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
 
+from app.etag import live_data_etag
 from app.schemas.responses import JurisdictionCount, JurisdictionCoverage
-from app.services.entity_list import EntityListService
+from app.services.entity_list import AsyncEntityListService
 from app.services.statistics import StatisticsService
 
 
@@ -13,8 +14,8 @@ def get_statistics_service() -> StatisticsService:
     return StatisticsService()
 
 
-def get_entity_list_service() -> EntityListService:
-    return EntityListService()
+def get_entity_list_service() -> AsyncEntityListService:
+    return AsyncEntityListService()
 
 
 class EntityCountsResponse(BaseModel):
@@ -24,7 +25,7 @@ class EntityCountsResponse(BaseModel):
     jurisdiction: str | None = None
 
 
-router = APIRouter(prefix="/statistics", tags=["Statistics"])
+router = APIRouter(prefix="/statistics", tags=["Statistics"], dependencies=[Depends(live_data_etag)])
 
 
 @router.get(
@@ -112,15 +113,15 @@ def count_by_jurisdiction(
     ),
     response_model=EntityCountsResponse,
 )
-def get_entity_counts(
+async def get_entity_counts(
     jurisdiction: Annotated[
         str | None,
         Query(description="Optional Alpha-3 code; only counts entities tagged to it."),
     ] = None,
-    service: EntityListService = Depends(get_entity_list_service),
+    service: AsyncEntityListService = Depends(get_entity_list_service),
 ) -> EntityCountsResponse:
     try:
-        counts = service.count_all(jurisdiction)
+        counts = await service.count_all(jurisdiction)
     except Exception as exc:
         raise HTTPException(status_code=500, detail="Failed to compute counts") from exc
 
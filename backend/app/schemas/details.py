@@ -18,7 +18,7 @@ from app.schemas.entities import (
     RegionalInstrumentBase,
     RegionalLegalProvisionBase,
 )
-from app.schemas.relations import EntityRelations
+from app.schemas.relations import EntityRelations, RelationCounts
 
 
 class DetailBase(EntityBase):
@@ -28,6 +28,10 @@ class DetailBase(EntityBase):
         default=EntityRelations(),
         description="First-hop related entities (jurisdictions, themes, instruments, etc.).",
     )
+    relation_counts: RelationCounts = Field(
+        default=RelationCounts(),
+        description="Total number of related entities of each kind, also when `relations` lists only the first ones.",
+    )
     created_at: str | None = Field(default=None, description="Record creation timestamp (ISO 8601).")
     updated_at: str | None = Field(default=None, description="Record last-update timestamp (ISO 8601).")
 
@@ -145,3 +145,25 @@ class EntityRelations(BaseModel):
     arbitral_rules: list[ArbitralRuleRelation] = []
     arbitral_provisions: list[ArbitralProvisionRelation] = []
     specialists: list[SpecialistRelation] = []
+
+
+class RelationCounts(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    hcch_answers: int = 0
+    questions: int = 0
+    jurisdictions: int = 0
+    themes: int = 0
+    court_decisions: int = 0
+    domestic_instruments: int = 0
+    domestic_legal_provisions: int = 0
+    regional_instruments: int = 0
+    regional_legal_provisions: int = 0
+    international_instruments: int = 0
+    international_legal_provisions: int = 0
+    literature: int = 0
+    arbitral_awards: int = 0
+    arbitral_institutions: int = 0
+    arbitral_rules: int = 0
+    arbitral_provisions: int = 0
+    specialists: int = 0
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+MAX_DETAIL_BATCH = 250
 
 
 class FTSFilterOption(BaseModel):
@@ -12,3 +14,31 @@ FilterValue = str | int | bool
 class FTFilterOption(BaseModel):
     column: str
     value: FilterValue | list[FilterValue]
+
+
+class EntityDetailKey(BaseModel):
+    table: str = Field(..., description="Source table name (e.g. 'Court Decisions').")
+    id: str = Field(..., description="CoLD ID of the record.")
+
+
+class EntityDetailBatchRequest(BaseModel):
+    items: list[EntityDetailKey] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_DETAIL_BATCH,
+        description=f"Records to fetch, at most {MAX_DETAIL_BATCH}. Duplicates are fetched once.",
+    )
+    fields: list[str] | None = Field(
+        default=None,
+        description="Only return these record fields, as for `/search/details`. Omit for all fields.",
+    )
+    include_relations: list[str] | None = Field(
+        default=None,
+        description="Only return these relation lists; an empty list leaves relations out. Omit for all.",
+    )
+    relation_limit: int | None = Field(
+        default=None,
+        ge=0,
+        le=500,
+        description="Only return the first N items of each relation list, as for `/search/details`.",
+    )
@@ -4,7 +4,8 @@ from typing import Any
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 
-from app.schemas.requests import FTSFilterOption
+from app.schemas.details import AnyDetail
+from app.schemas.requests import EntityDetailKey, FTSFilterOption
 from app.schemas.search_result import AnySearchResult
 
 
@@ -14,11 +15,69 @@ class FullTextSearchResponse(BaseModel):
     query: str | None = Field(default=None, description="The search query string that was submitted.")
     filters: list[FTSFilterOption] | None = Field(default=None, description="Active filters applied to the search.")
     total_matches: int = Field(..., description="Total number of matching records across all pages.")
-    page: int = Field(..., description="Current page number (1-indexed).")
+    total_is_estimate: bool = Field(
+        default=False,
+        description="True when `total_matches` is a planner estimate rather than an exact count.",
+    )
+    page: int | None = Field(
+        default=None,
+        description="Current page number (1-indexed). Left out of responses to `cursor` (keyset) requests.",
+    )
     page_size: int = Field(..., description="Number of results per page.")
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor for the next page; pass it back as `cursor`. Null on the last page.",
+    )
+    did_you_mean: str | None = Field(
+        default=None,
+        description=(
+            "Spelling-corrected query, set when the submitted query matched nothing. "
+            "The results and totals are then those of the corrected query's first page; search for it "
+            "to page further."
+        ),
+    )
     results: list[AnySearchResult] = Field(..., description="Array of search result records for the current page.")
 
 
+class SearchFacetsResponse(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    query: str | None = Field(default=None, description="The search query string that was submitted.")
+    filters: list[FTSFilterOption] | None = Field(default=None, description="Active filters applied to the search.")
+    total_matches: int = Field(..., description="Total number of records matching the query and filters.")
+    tables: dict[str, int] = Field(default_factory=dict, description="Matching records per source table.")
+    jurisdictions: dict[str, int] = Field(default_factory=dict, description="Matching records per jurisdiction name.")
+    themes: dict[str, int] = Field(default_factory=dict, description="Matching records per theme.")
+
+
+class SearchSuggestion(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    label: str = Field(..., description="Text to show in the suggestion list.")
+    source_table: str = Field(..., description="Source table of the suggested record.")
+    id: str = Field(..., description="CoLD ID of the suggested record; use with `/search/details`.")
+
+
+class SearchSuggestResponse(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    prefix: str = Field(..., description="The prefix that was submitted.")
+    suggestions: list[SearchSuggestion] = Field(default_factory=list, description="Best matches first.")
+
+
+class RelationPageResponse(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    kind: str = Field(..., description="Relation kind (e.g. 'court_decisions').")
+    items: list[Any] = Field(default_factory=list, description="Related entities, in detail-page order.")
+    next_after: int | None = Field(default=None, description="Pass as `after` to fetch the next page; null on the last page.")
+
+
+class EntityDetailBatchResponse(BaseModel):
+    results: list[AnyDetail] = Field(default_factory=list, description="Found records, in request order.")
+    missing: list[EntityDetailKey] = Field(default_factory=list, description="Requested records that do not exist.")
+
+
 class JurisdictionCoverage(BaseModel):
     model_config = ConfigDict(
         alias_generator=to_camel,
@@ -1,20 +1,84 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
 import time
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 
+import logfire
 import sqlalchemy as sa
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, DisconnectionError, SQLAlchemyError
 
-from app.services.db_manager import db_manager
+from app.services.db_manager import async_db_manager, db_manager
 
 logger = logging.getLogger(__name__)
 
+_retries = logfire.metric_counter("db_query_retries", description="Database queries retried after a transient error")
+retry_counts: Counter[str] = Counter()
+
+# serialization_failure, deadlock_detected, too_many_connections, admin/crash shutdown, cannot_connect_now
+_TRANSIENT_SQLSTATES = {"40001", "40P01", "53300", "57P01", "57P02", "57P03"}
+
+_query_failures: ContextVar[list[str] | None] = ContextVar("query_failures", default=None)
+
+
+@contextmanager
+def recording_query_failures() -> Iterator[list[str]]:
+    """Collect the labels of queries whose error was swallowed inside the block.
+
+    The list is shared with threads and tasks started from the block, so a request-scoped caller sees failures
+    from sync endpoints and ``asyncio.gather`` as well.
+    """
+    failures: list[str] = []
+    token = _query_failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _query_failures.reset(token)
+
+
+def note_query_failure(label: str) -> None:
+    """Record that the result being built falls back to an empty or partial answer after ``label`` failed."""
+    failures = _query_failures.get()
+    if failures is not None:
+        failures.append(label)
+
+
+def _is_transient(exc: SQLAlchemyError) -> bool:
+    """Whether ``exc`` is worth retrying: a dropped connection or a serialization/deadlock conflict."""
+    # The dialect flags dropped connections (reset, server closed, admin shutdown) as invalidated.
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    pgcode = getattr(getattr(exc, "orig", None), "pgcode", None)
+    if pgcode:
+        # Class 08 is connection_exception.
+        return pgcode in _TRANSIENT_SQLSTATES or pgcode.startswith("08")
+    return isinstance(exc, DisconnectionError)
+
+
+def _record_retry(exc: SQLAlchemyError, label: str, attempt: int, max_retries: int, retry_delay: float) -> float:
+    """Count a retry of ``label`` and return the jittered exponential backoff before the next attempt."""
+    delay = retry_delay * (2**attempt) * random.uniform(0.5, 1.0)
+    retry_counts[label] += 1
+    _retries.add(1, {"label": label})
+    logger.warning(
+        "Transient database error on %s (attempt %d/%d), retrying in %.2fs: %s",
+        label,
+        attempt + 1,
+        max_retries,
+        delay,
+        exc.__class__.__name__,
+    )
+    return delay
+
 
 class Database:
-    def __init__(self, connection_string: str | None = None, max_retries: int = 3, retry_delay: float = 0.5):
+    def __init__(self, connection_string: str | None = None, max_retries: int = 3, retry_delay: float = 0.1):
         if not db_manager.is_initialized and connection_string:
             db_manager.initialize(connection_string)
 
@@ -37,31 +101,92 @@ class Database:
                 logger.exception("Error reflecting metadata")
                 self.metadata = None
 
-    def _retry_on_empty(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
-        """Retry when the database returns empty results, up to max_retries."""
-        last_result: Any = None
-        for _attempt in range(self.max_retries):
-            last_result = func(*args, **kwargs)
-            if last_result:
-                return last_result
-            time.sleep(self.retry_delay)
-        return last_result
-
-    def execute_query(self, query: str, params: dict[str, Any] | None = None) -> list[dict[str, Any]] | None:
-        def fetch_query() -> list[dict[str, Any]] | None:
+    def _run_with_retries(self, func: Callable[[], Any], label: str) -> Any:
+        """Run ``func``, retrying transient database errors with exponential backoff.
+
+        Empty results are returned immediately; only errors classified by ``_is_transient`` are retried.
+        """
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except SQLAlchemyError as exc:
+                if attempt >= self.max_retries or not _is_transient(exc):
+                    raise
+                time.sleep(_record_retry(exc, label, attempt, self.max_retries, self.retry_delay))
+                attempt += 1
+
+    def execute_query(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        label: str = "query",
+    ) -> list[dict[str, Any]] | None:
+        def fetch_query() -> list[dict[str, Any]]:
             with db_manager.get_session() as session:
-                try:
-                    result = session.execute(sa.text(query), params or {})
-                    rows = result.fetchall()
-                    if not rows:
-                        return []
+                result = session.execute(sa.text(query), params or {})
+                rows = result.fetchall()
+                if not rows:
+                    return []
+
+                columns = result.keys()
+                return [dict(zip(columns, row, strict=False)) for row in rows]
+
+        try:
+            return self._run_with_retries(fetch_query, label)
+        except SQLAlchemyError:
+            logger.exception("Error executing query")
+            note_query_failure(label)
+            return None
+
+    def iter_query(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        as_tuples: bool = False,
+    ) -> Iterator[dict[str, Any]] | Iterator[tuple[Any, ...]]:
+        """Yield rows lazily through a server-side (named) cursor, ``batch_size`` rows per round trip.
+
+        Unlike ``execute_query`` nothing is buffered or retried, and database errors propagate to the caller.
+        The connection is held until the iterator is exhausted or closed.
+        """
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(sa.text(query), params or {})
+            for partition in result.partitions():
+                if as_tuples:
+                    yield from (tuple(row) for row in partition)
+                else:
+                    yield from (dict(row._mapping) for row in partition)
+
 
-                    columns = result.keys()
-                    results = [dict(zip(columns, row, strict=False)) for row in rows]
-                    return results
+class AsyncDatabase:
+    """Async counterpart of ``Database`` on the asyncpg engine, with the same retry and error semantics."""
 
-                except SQLAlchemyError:
+    def __init__(self, connection_string: str | None = None, max_retries: int = 3, retry_delay: float = 0.1):
+        if not async_db_manager.is_initialized and connection_string:
+            async_db_manager.initialize(connection_string)
+
+        self.engine = async_db_manager.get_engine()
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    async def execute_query(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        label: str = "query",
+    ) -> list[dict[str, Any]] | None:
+        attempt = 0
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    result = await conn.execute(sa.text(query), params or {})
+                    return [dict(row._mapping) for row in result]
+            except SQLAlchemyError as exc:
+                if attempt >= self.max_retries or not _is_transient(exc):
                     logger.exception("Error executing query")
+                    note_query_failure(label)
                     return None
-
-        return self._retry_on_empty(fetch_query)
+                await asyncio.sleep(_record_retry(exc, label, attempt, self.max_retries, self.retry_delay))
+                attempt += 1
@@ -3,18 +3,32 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, ClassVar
+import select
+import threading
+import time
+from typing import TYPE_CHECKING, Any, ClassVar
 
+import logfire
 import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine
     from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+_prepared_hits = logfire.metric_counter(
+    "db_prepared_statement_hits", description="Async queries that reused a statement already prepared on the connection"
+)
+_prepared_misses = logfire.metric_counter(
+    "db_prepared_statement_misses", description="Async queries that had to be parsed and planned by Postgres"
+)
+
 
 class _PooledDBManager:
     """Base singleton database connection manager with proper pooling configuration."""
@@ -96,11 +110,130 @@ class _PooledDBManager:
 
 
 class DatabaseManager(_PooledDBManager):
+    """Main database pool, plus a listener tracking the materialized-view refresh generation and NocoDB edits.
+
+    ``data_views.refresh_all_materialized_views()`` bumps ``data_views.refresh_generation`` and sends
+    ``NOTIFY data_views_refreshed`` when it finishes; ``refresh_changed_materialized_views()`` does the
+    same, but only when it refreshed at least one view. Read caches and ETags key off ``refresh_generation``
+    so they turn over exactly when the views do.
+
+    Endpoints that also read NocoDB tables or plain views change between refreshes. The change-tracking
+    trigger bumps ``data_views.source_table_versions`` on every write and sends ``NOTIFY nocodb_source_changed``;
+    ``source_version`` summarizes those counters. The listener re-reads both every ``poll_interval`` seconds in
+    case a notification is missed while reconnecting.
+    """
+
     _instance: ClassVar[DatabaseManager | None] = None  # type: ignore[assignment]
     _label = "database"
     _default_pool_size = 5
     _default_max_overflow = 10
 
+    REFRESH_CHANNEL: ClassVar[str] = "data_views_refreshed"
+    SOURCE_CHANNEL: ClassVar[str] = "nocodb_source_changed"
+
+    _refresh_generation: int | None = None
+    _source_version: str | None = None
+    _listener_thread: threading.Thread | None = None
+    _listener_stop: threading.Event | None = None
+
+    @property
+    def refresh_generation(self) -> int | None:
+        """Current refresh generation, or None until it has been read from the database."""
+        return self._refresh_generation
+
+    def _set_refresh_generation(self, generation: int) -> None:
+        if generation != self._refresh_generation:
+            logger.info("Materialized views refreshed: generation %s -> %d", self._refresh_generation, generation)
+            self._refresh_generation = generation
+
+    def _read_refresh_generation(self, cursor: Any) -> None:
+        try:
+            cursor.execute("SELECT generation FROM data_views.refresh_generation")
+            row = cursor.fetchone()
+        except Exception:
+            logger.warning("data_views.refresh_generation is not readable; keeping generation %s", self._refresh_generation)
+            return
+        if row is not None:
+            self._set_refresh_generation(int(row[0]))
+
+    @property
+    def source_version(self) -> str | None:
+        """Watermark of the tracked NocoDB tables, or None until read or while no table is tracked."""
+        return self._source_version
+
+    def _read_source_version(self, cursor: Any) -> None:
+        try:
+            cursor.execute("SELECT count(*), COALESCE(sum(version), 0), max(changed_at) FROM data_views.source_table_versions")
+            tracked, total, changed_at = cursor.fetchone()
+        except Exception:
+            logger.warning("data_views.source_table_versions is not readable; keeping source version %s", self._source_version)
+            return
+        # Counters only grow, but forgetting a dropped table lowers the sum; the count and latest change tell apart
+        # states that would otherwise share a sum.
+        self._source_version = f"{tracked}.{total}.{changed_at.timestamp() if changed_at else 0}" if tracked else None
+
+    def start_refresh_listener(self, poll_interval: float = 60.0) -> None:
+        if self._listener_thread is not None and self._listener_thread.is_alive():
+            return
+        self._listener_stop = threading.Event()
+        self._listener_thread = threading.Thread(
+            target=self._listen_for_refreshes,
+            args=(self._listener_stop, poll_interval),
+            name="refresh-generation-listener",
+            daemon=True,
+        )
+        self._listener_thread.start()
+
+    def stop_refresh_listener(self) -> None:
+        if self._listener_stop is not None:
+            self._listener_stop.set()
+        if self._listener_thread is not None:
+            self._listener_thread.join(timeout=5)
+        self._listener_thread = None
+        self._listener_stop = None
+
+    def _listen_for_refreshes(self, stop: threading.Event, poll_interval: float) -> None:
+        while not stop.is_set():
+            try:
+                # Detached so the long-lived LISTEN connection does not hold a pool slot.
+                proxied = self.get_engine().raw_connection()
+                conn = proxied.driver_connection
+                proxied.detach()
+                conn.autocommit = True
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(f"LISTEN {self.REFRESH_CHANNEL}")
+                        cursor.execute(f"LISTEN {self.SOURCE_CHANNEL}")
+                        self._read_refresh_generation(cursor)
+                        self._read_source_version(cursor)
+                        next_poll = time.monotonic() + poll_interval
+                        while not stop.is_set():
+                            if select.select([conn], [], [], 1.0)[0]:
+                                conn.poll()
+                                source_changed = False
+                                while conn.notifies:
+                                    notify = conn.notifies.pop(0)
+                                    if notify.channel == self.SOURCE_CHANNEL:
+                                        source_changed = True
+                                    elif notify.payload.isdigit():
+                                        self._set_refresh_generation(int(notify.payload))
+                                # One read covers a burst of edits.
+                                if source_changed:
+                                    self._read_source_version(cursor)
+                            elif time.monotonic() >= next_poll:
+                                self._read_refresh_generation(cursor)
+                                self._read_source_version(cursor)
+                                next_poll = time.monotonic() + poll_interval
+                finally:
+                    conn.close()
+            except Exception:
+                logger.exception("Refresh-generation listener failed; reconnecting")
+                stop.wait(5)
+
+    def dispose(self) -> None:
+        self.stop_refresh_listener()
+        super().dispose()
+
 
 class SuggestionsDBManager(_PooledDBManager):
     _instance: ClassVar[SuggestionsDBManager | None] = None  # type: ignore[assignment]
@@ -109,5 +242,119 @@ class SuggestionsDBManager(_PooledDBManager):
     _default_max_overflow = 5
 
 
+def to_async_url(connection_string: str) -> sa.URL:
+    """Rewrite a sync Postgres URL for the asyncpg driver, translating libpq's ``sslmode`` to asyncpg's ``ssl``."""
+    url = sa.make_url(connection_string)
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
+
+class AsyncDatabaseManager:
+    """Singleton asyncpg engine for async read paths, sized for many concurrent in-flight queries.
+
+    Each pooled connection keeps an LRU of up to ``prepared_statement_cache_size`` server-side prepared
+    statements keyed by SQL text, so the hot search/detail/list statements are parsed and planned once per
+    connection rather than per request. Hits and misses are counted in ``prepared_statement_stats``.
+    """
+
+    _instance: ClassVar[AsyncDatabaseManager | None] = None
+    _engine: AsyncEngine | None = None
+    _label: str = "async database"
+    prepared_statement_stats: ClassVar[dict[str, int]] = {"hits": 0, "misses": 0}
+
+    def __new__(cls) -> AsyncDatabaseManager:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def initialize(
+        self,
+        connection_string: str,
+        pool_size: int = 20,
+        max_overflow: int = 30,
+        pool_timeout: int = 30,
+        pool_recycle: int = 3600,
+        pool_pre_ping: bool = True,
+        echo: bool = False,
+        prepared_statement_cache_size: int = 256,
+    ) -> None:
+        if self._engine is not None:
+            logger.warning("%s manager already initialized, skipping re-initialization", self._label)
+            return
+
+        if not connection_string:
+            raise ValueError("Connection string is required")
+
+        logger.info(
+            "Initializing %s connection pool with pool_size=%d, max_overflow=%d, prepared_statement_cache_size=%d",
+            self._label,
+            pool_size,
+            max_overflow,
+            prepared_statement_cache_size,
+        )
+
+        self._engine = create_async_engine(
+            to_async_url(connection_string),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            echo=echo,
+            connect_args={"prepared_statement_cache_size": prepared_statement_cache_size},
+        )
+        if prepared_statement_cache_size > 0:
+            event.listen(self._engine.sync_engine, "before_cursor_execute", self._note_prepared_statement)
+            event.listen(self._engine.sync_engine, "after_cursor_execute", self._count_prepared_statement)
+        logger.info("%s connection pool initialized successfully", self._label)
+
+    @staticmethod
+    def _prepared_statement_cache(dbapi_connection: Any) -> Any:
+        """The per-connection LRU of prepared statements, keyed by SQL text.
+
+        asyncpg has no public statement-cache stats for the statements SQLAlchemy prepares, so this reads the
+        private ``_prepared_statement_cache`` of SQLAlchemy's ``AsyncAdapt_asyncpg_connection``. A test pins it,
+        so an upgrade that renames it fails there instead of counting nothing.
+        """
+        return dbapi_connection._prepared_statement_cache
+
+    @classmethod
+    def _note_prepared_statement(cls, conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+        # Checked before execution, since executing puts the statement in the cache.
+        conn.info["prepared_statement_hit"] = statement in cls._prepared_statement_cache(conn.connection.dbapi_connection)
+
+    @classmethod
+    def _count_prepared_statement(cls, conn: Any, *_: Any) -> None:
+        # Runs only for statements that executed, so failed ones are not counted.
+        hit = conn.info.pop("prepared_statement_hit", None)
+        if hit is None:
+            return
+        if hit:
+            cls.prepared_statement_stats["hits"] += 1
+            _prepared_hits.add(1)
+        else:
+            cls.prepared_statement_stats["misses"] += 1
+            _prepared_misses.add(1)
+
+    def get_engine(self) -> AsyncEngine:
+        if self._engine is None:
+            raise RuntimeError(f"{self._label} manager not initialized. Call initialize() first.")
+        return self._engine
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            logger.info("Disposing %s connection pool", self._label)
+            await self._engine.dispose()
+            self._engine = None
+            logger.info("%s connection pool disposed", self._label)
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._engine is not None
+
+
 db_manager = DatabaseManager()
 suggestions_db_manager = SuggestionsDBManager()
+async_db_manager = AsyncDatabaseManager()
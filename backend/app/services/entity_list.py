@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 from dataclasses import dataclass, field
@@ -22,7 +23,7 @@ from app.schemas.relations import (
     RegionalInstrumentRelation,
     SpecialistRelation,
 )
-from app.services.database import Database
+from app.services.database import AsyncDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,11 @@ _SAFE_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_.]*$")
 _SAFE_COLUMN = re.compile(r"^[a-z_][a-z0-9_]*$")
 
 
-_THEME_FILTER_SQL = "data_views.entity_has_theme(:theme_slug, b.id, :theme)"
+# Semi-join against the precomputed membership view; see alembic revision 202610171200.
+_THEME_FILTER_SQL = (
+    "EXISTS (SELECT 1 FROM data_views.entity_theme_membership m"
+    " WHERE m.slug = :theme_slug AND m.theme = :theme AND m.entity_id = b.id)"
+)
 
 
 @dataclass(frozen=True)
@@ -191,11 +196,87 @@ def _to_camel_dict(row: dict[str, Any], cfg: EntityListConfig) -> dict[str, Any]
     return {to_camel(k): v for k, v in out.items()}
 
 
-class EntityListService:
+def _build_list_queries(
+    cfg: EntityListConfig,
+    *,
+    jurisdiction: str | None,
+    theme: str | None,
+    page: int,
+    page_size: int,
+    order_by: str | None,
+    order_dir: str | None,
+    extra_filters: dict[str, str] | None,
+) -> tuple[str, str, dict[str, Any]]:
+    """Build the page query, the count query and their shared bind parameters for one entity list request."""
+    if not _SAFE_IDENTIFIER.match(cfg.view):
+        raise ValueError(f"Unsafe view identifier: {cfg.view}")
+
+    where_parts: list[str] = []
+    params: dict[str, Any] = {}
+
+    if jurisdiction and cfg.has_jurisdiction:
+        params["juris"] = jurisdiction.upper()
+        where_parts.append('b."jurisdictions_alpha_3_code" = :juris')
+
+    if theme and cfg.has_theme:
+        params["theme"] = theme
+        params["theme_slug"] = cfg.slug
+        where_parts.append(_THEME_FILTER_SQL)
+
+    if extra_filters:
+        for raw_key, raw_val in extra_filters.items():
+            if raw_val is None or raw_val == "":
+                continue
+            col = _safe_column_for(cfg, raw_key)
+            if col is None or col not in cfg.extra_filter_columns:
+                continue
+            p_name = f"f_{col}"
+            params[p_name] = raw_val
+            where_parts.append(f'b."{col}"::text = :{p_name}')
+
+    where_sql = (" WHERE " + " AND ".join(where_parts)) if where_parts else ""
+
+    order_col = _safe_column_for(cfg, order_by) if order_by else cfg.default_order_by
+    if order_col is None:
+        order_col = cfg.default_order_by
+    direction = (order_dir or cfg.default_order_dir).lower()
+    if direction not in {"asc", "desc"}:
+        direction = cfg.default_order_dir
+    order_sql = f' ORDER BY b."{order_col}" {direction.upper()} NULLS LAST'
+
+    page = max(1, page)
+    page_size = max(1, min(250, page_size))
+    offset = (page - 1) * page_size
+
+    projection = ", ".join(f'b."{col}"' for col in ("id", "cold_id", *cfg.columns))
+    list_sql = f"SELECT {projection} FROM {cfg.view} b{where_sql}{order_sql} LIMIT {page_size} OFFSET {offset}"
+    count_sql = f"SELECT COUNT(*) AS n FROM {cfg.view} b{where_sql}"
+    return list_sql, count_sql, params
+
+
+def _build_count_all_query(jurisdiction: str | None) -> tuple[str, dict[str, Any]]:
+    from app.services.entity_counts import COUNT_TABLES
+
+    params: dict[str, Any] = {}
+    unions: list[str] = []
+    for key, view, has_jurisdiction in COUNT_TABLES:
+        if not _SAFE_IDENTIFIER.match(view):
+            continue
+        where_sql = ""
+        if jurisdiction and has_jurisdiction:
+            params["juris"] = jurisdiction.upper()
+            where_sql = ' WHERE "jurisdictions_alpha_3_code" = :juris'
+        unions.append(f"SELECT '{key}' AS k, COUNT(*) AS n FROM {view}{where_sql}")
+    return " UNION ALL ".join(unions), params
+
+
+class AsyncEntityListService:
+    """Paginated entity lists and per-type counts on the asyncpg engine; the page and count queries run concurrently."""
+
     def __init__(self) -> None:
-        self.db = Database(config.SQL_CONN_STRING)
+        self.db = AsyncDatabase(config.SQL_CONN_STRING)
 
-    def list_entity(
+    async def list_entity(
         self,
         cfg: EntityListConfig,
         *,
@@ -207,78 +288,33 @@ class EntityListService:
         order_dir: str | None = None,
         extra_filters: dict[str, str] | None = None,
     ) -> tuple[list[dict[str, Any]], int]:
-        if not _SAFE_IDENTIFIER.match(cfg.view):
-            raise ValueError(f"Unsafe view identifier: {cfg.view}")
-
-        where_parts: list[str] = []
-        params: dict[str, Any] = {}
-
-        if jurisdiction and cfg.has_jurisdiction:
-            params["juris"] = jurisdiction.upper()
-            where_parts.append('b."jurisdictions_alpha_3_code" = :juris')
-
-        if theme and cfg.has_theme:
-            params["theme"] = theme
-            params["theme_slug"] = cfg.slug
-            where_parts.append(_THEME_FILTER_SQL)
-
-        if extra_filters:
-            for raw_key, raw_val in extra_filters.items():
-                if raw_val is None or raw_val == "":
-                    continue
-                col = _safe_column_for(cfg, raw_key)
-                if col is None or col not in cfg.extra_filter_columns:
-                    continue
-                p_name = f"f_{col}"
-                params[p_name] = raw_val
-                where_parts.append(f'b."{col}"::text = :{p_name}')
-
-        where_sql = (" WHERE " + " AND ".join(where_parts)) if where_parts else ""
-
-        order_col = _safe_column_for(cfg, order_by) if order_by else cfg.default_order_by
-        if order_col is None:
-            order_col = cfg.default_order_by
-        direction = (order_dir or cfg.default_order_dir).lower()
-        if direction not in {"asc", "desc"}:
-            direction = cfg.default_order_dir
-        order_sql = f' ORDER BY b."{order_col}" {direction.upper()} NULLS LAST'
-
-        page = max(1, page)
-        page_size = max(1, min(250, page_size))
-        offset = (page - 1) * page_size
-
-        projection = ", ".join(f'b."{col}"' for col in ("id", "cold_id", *cfg.columns))
-        list_sql = f"SELECT {projection} FROM {cfg.view} b{where_sql}{order_sql} LIMIT {page_size} OFFSET {offset}"
-        count_sql = f"SELECT COUNT(*) AS n FROM {cfg.view} b{where_sql}"
+        list_sql, count_sql, params = _build_list_queries(
+            cfg,
+            jurisdiction=jurisdiction,
+            theme=theme,
+            page=page,
+            page_size=page_size,
+            order_by=order_by,
+            order_dir=order_dir,
+            extra_filters=extra_filters,
+        )
 
         try:
-            rows = self.db.execute_query(list_sql, params) or []
-            count_rows = self.db.execute_query(count_sql, params) or []
-            total = int(count_rows[0].get("n", 0)) if count_rows else 0
+            rows, count_rows = await asyncio.gather(
+                self.db.execute_query(list_sql, params),
+                self.db.execute_query(count_sql, params),
+            )
         except Exception:
             logger.exception("Failed to list entity slug=%s", cfg.slug)
             raise
 
-        items = [_to_camel_dict(r, cfg) for r in rows]
-        return items, total
-
-    def count_all(self, jurisdiction: str | None = None) -> dict[str, int]:
-        from app.services.entity_counts import COUNT_TABLES
-
-        params: dict[str, Any] = {}
-        unions: list[str] = []
-        for key, view, has_jurisdiction in COUNT_TABLES:
-            if not _SAFE_IDENTIFIER.match(view):
-                continue
-            where_sql = ""
-            if jurisdiction and has_jurisdiction:
-                params["juris"] = jurisdiction.upper()
-                where_sql = ' WHERE "jurisdictions_alpha_3_code" = :juris'
-            unions.append(f"SELECT '{key}' AS k, COUNT(*) AS n FROM {view}{where_sql}")
+        total = int(count_rows[0].get("n", 0)) if count_rows else 0
+        return [_to_camel_dict(r, cfg) for r in rows or []], total
 
-        sql = " UNION ALL ".join(unions)
+    async def count_all(self, jurisdiction: str | None = None) -> dict[str, int]:
+        sql, params = _build_count_all_query(jurisdiction)
         try:
-            rows = self.db.execute_query(sql, params) or []
+            rows = await self.db.execute_query(sql, params) or []
         except Exception:
             logger.exception("Failed to compute entity counts")
             raise
@@ -1,18 +1,235 @@
+import base64
+import binascii
+import json
 import logging
 import re
+from collections.abc import Iterator
 from typing import Any
 
 from pydantic.alias_generators import to_snake
 
 from app.config import config
-from app.services.database import Database
+from app.services.database import AsyncDatabase, Database, note_query_failure
+from app.services.db_manager import db_manager
 from app.services.filter_builder import build_filter_clause
+from app.services.search_cache import SearchResultCache
 
 _SAFE_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_.]*$")
 _SAFE_COLUMN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
 
 logger = logging.getLogger(__name__)
 
+search_cache = SearchResultCache(
+    max_entries=config.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.SEARCH_CACHE_TTL_SECONDS,
+    generation_provider=lambda: db_manager.refresh_generation,
+)
+
+suggest_cache = SearchResultCache(
+    max_entries=config.SEARCH_SUGGEST_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.SEARCH_CACHE_TTL_SECONDS,
+    generation_provider=lambda: db_manager.refresh_generation,
+)
+
+
+_SEARCH_SQL = (
+    "SELECT table_name AS source_table, record_id AS id, complete_record AS complete_record, rank, result_date, "
+    "sort_key, total_count "
+    "FROM data_views.search_all_v2("
+    "search_term := CAST(:search_term AS text), "
+    "filter_tables := CAST(:filter_tables AS text[]), "
+    "filter_jurisdictions := CAST(:filter_jurisdictions AS text[]), "
+    "filter_themes := CAST(:filter_themes AS text[]), "
+    "page := CAST(:page AS integer), "
+    "page_size := CAST(:page_size AS integer), "
+    "sort_by_date := CAST(:sort_by_date AS boolean), "
+    "after_key := CAST(CAST(:after_key AS text) AS jsonb), "
+    "exact_count := CAST(:exact_count AS boolean), "
+    "query_syntax := CAST(:query_syntax AS text)"
+    ")"
+)
+
+
+_FALLBACK_SQL = (
+    "SELECT suggestion, table_name AS source_table, record_id AS id, complete_record AS complete_record, rank, "
+    "result_date, sort_key, total_count "
+    "FROM data_views.search_fallback("
+    "search_term := CAST(:search_term AS text), "
+    "filter_tables := CAST(:filter_tables AS text[]), "
+    "filter_jurisdictions := CAST(:filter_jurisdictions AS text[]), "
+    "filter_themes := CAST(:filter_themes AS text[]), "
+    "page_size := CAST(:page_size AS integer), "
+    "sort_by_date := CAST(:sort_by_date AS boolean), "
+    "exact_count := CAST(:exact_count AS boolean), "
+    "query_syntax := CAST(:query_syntax AS text)"
+    ")"
+)
+
+
+_FACETS_SQL = (
+    "SELECT facet, value, hits "
+    "FROM data_views.search_facets("
+    "search_term := CAST(:search_term AS text), "
+    "filter_tables := CAST(:filter_tables AS text[]), "
+    "filter_jurisdictions := CAST(:filter_jurisdictions AS text[]), "
+    "filter_themes := CAST(:filter_themes AS text[]), "
+    "query_syntax := CAST(:query_syntax AS text)"
+    ")"
+)
+
+_SUGGEST_SQL = (
+    "SELECT label, table_name AS source_table, cold_id AS id "
+    "FROM data_views.search_suggest("
+    "prefix := CAST(:prefix AS text), "
+    "filter_tables := CAST(:filter_tables AS text[]), "
+    "max_results := CAST(:max_results AS integer)"
+    ")"
+)
+
+_FACET_KEYS = {"table": "tables", "jurisdiction": "jurisdictions", "theme": "themes"}
+
+
+# Sparse fieldsets: keep only the requested base-record keys and relation lists; NULL keeps the whole document.
+# ``relation_limit`` keeps the first items of each relation list; ``relation_counts`` always has the full lengths.
+_DETAIL_PROJECTION = """
+    CASE WHEN CAST(:fields AS text[]) IS NULL THEN d.base_record ELSE (
+        SELECT COALESCE(jsonb_object_agg(e.key, e.value), '{}'::jsonb)
+        FROM jsonb_each(d.base_record) e
+        WHERE e.key = ANY(CAST(:fields AS text[]))
+    ) END AS base_record,
+    CASE WHEN CAST(:include_relations AS text[]) IS NULL AND CAST(:relation_limit AS integer) IS NULL
+    THEN d.relations ELSE (
+        SELECT COALESCE(jsonb_object_agg(e.key, CASE WHEN CAST(:relation_limit AS integer) IS NULL THEN e.value ELSE (
+            SELECT COALESCE(jsonb_agg(i.item ORDER BY i.position), '[]'::jsonb)
+            FROM jsonb_array_elements(e.value) WITH ORDINALITY AS i(item, position)
+            WHERE i.position <= CAST(:relation_limit AS integer)
+        ) END), '{}'::jsonb)
+        FROM jsonb_each(d.relations) e
+        WHERE CAST(:include_relations AS text[]) IS NULL OR e.key = ANY(CAST(:include_relations AS text[]))
+    ) END AS relations,
+    (
+        SELECT COALESCE(jsonb_object_agg(e.key, jsonb_array_length(e.value)), '{}'::jsonb)
+        FROM jsonb_each(d.relations) e
+        WHERE CAST(:include_relations AS text[]) IS NULL OR e.key = ANY(CAST(:include_relations AS text[]))
+    ) AS relation_counts"""
+
+# Cached documents are an index lookup; keys not in the cache yet (new since the last refresh) are built live.
+_ENTITY_DETAIL_SQL = f"""
+SELECT d.source_table, d.record_id, d.cold_id,{_DETAIL_PROJECTION}
+FROM (
+    SELECT source_table, record_id, cold_id, base_record, relations
+    FROM data_views.entity_detail_cache
+    WHERE source_table = :table_name AND cold_id = :cold_id
+    UNION ALL
+    SELECT source_table, record_id, cold_id, base_record, relations
+    FROM data_views.get_entity_detail(:table_name, :cold_id)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM data_views.entity_detail_cache
+        WHERE source_table = :table_name AND cold_id = :cold_id
+    )
+) d
+"""
+
+# Same lookup for many keys in one statement; ``ord`` is the key's position in the request.
+_ENTITY_DETAILS_SQL = f"""
+WITH keys AS (
+    SELECT k.ord, k.table_name, k.cold_id
+    FROM unnest(CAST(:table_names AS text[]), CAST(:cold_ids AS text[])) WITH ORDINALITY AS k(table_name, cold_id, ord)
+)
+SELECT d.ord, d.source_table, d.record_id, d.cold_id,{_DETAIL_PROJECTION}
+FROM (
+    SELECT k.ord, c.source_table, c.record_id, c.cold_id, c.base_record, c.relations
+    FROM keys k
+    JOIN data_views.entity_detail_cache c ON c.source_table = k.table_name AND c.cold_id = k.cold_id
+    UNION ALL
+    SELECT k.ord, l.source_table, l.record_id, l.cold_id, l.base_record, l.relations
+    FROM keys k
+    CROSS JOIN LATERAL data_views.get_entity_detail(k.table_name, k.cold_id) l
+    WHERE NOT EXISTS (
+        SELECT 1 FROM data_views.entity_detail_cache c
+        WHERE c.source_table = k.table_name AND c.cold_id = k.cold_id
+    )
+) d
+ORDER BY d.ord
+"""
+
+# One keyset page of a relation list: an index range scan over ``entity_relation_items``, or the live document's
+# array for keys not in the cache yet. Items keep their order in the detail document.
+_ENTITY_RELATIONS_SQL = """
+SELECT p.position, p.item
+FROM (
+    (
+        SELECT position, item
+        FROM data_views.entity_relation_items
+        WHERE source_table = :table_name AND cold_id = :cold_id AND kind = :kind
+          AND position > CAST(:after AS integer)
+        ORDER BY position
+        LIMIT CAST(:limit AS integer)
+    )
+    UNION ALL
+    (
+        SELECT i.position::int, i.item
+        FROM data_views.get_entity_detail(:table_name, :cold_id) d,
+             jsonb_array_elements(COALESCE(d.relations -> CAST(:kind AS text), '[]'::jsonb))
+                WITH ORDINALITY AS i(item, position)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM data_views.entity_detail_cache
+            WHERE source_table = :table_name AND cold_id = :cold_id
+        )
+          AND i.position > CAST(:after AS integer)
+    )
+) p
+ORDER BY p.position
+LIMIT CAST(:limit AS integer)
+"""
+
+_VIEW_COLUMNS_SQL = """
+SELECT attname AS column_name
+FROM pg_attribute
+WHERE attrelid = CAST(:view AS regclass) AND attnum > 0 AND NOT attisdropped
+"""
+
+
+def _facet_keys(values: list[Any]) -> list[str]:
+    """Lower-case and trim filter values to match ``search_record_facets`` keys (names or alpha-3 codes)."""
+    return [key for key in (str(value).strip().lower() for value in values) if key]
+
+
+def _projection_keys(names: list[str] | None) -> list[str] | None:
+    """Snake-case, de-duplicate and sort requested field names; ``None`` (no projection) passes through."""
+    if names is None:
+        return None
+    return sorted({to_snake(name.strip()) for raw in names for name in raw.split(",") if name.strip()})
+
+
+def _normalize_search_string(search_string: str | None) -> str | None:
+    if search_string is None:
+        return None
+    normalized = " ".join(search_string.split()).casefold()
+    return normalized or None
+
+
+def _suggest_key(prefix: str) -> str:
+    """Normalize a typeahead prefix like ``search_suggest_index.match_key`` and escape LIKE wildcards."""
+    normalized = " ".join(prefix.split()).lower()
+    return normalized.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _encode_cursor(sort_key: list[Any]) -> str:
+    raw = json.dumps(sort_key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> list[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        sort_key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid search cursor") from e
+    if not isinstance(sort_key, list) or len(sort_key) != 6:
+        raise ValueError("Invalid search cursor")
+    return sort_key
+
 
 class SearchService:
     def __init__(self) -> None:
@@ -113,26 +330,54 @@ class SearchService:
         order_by: str | None = None,
         order_dir: str | None = None,
         limit: int | None = None,
+        fields: list[str] | None = None,
     ) -> str:
         view = self._complete_view_for_table(table)
         enrichment = self._fts_enrichment_for_table(table)
         order_sql = self._build_order_clause(alias, order_by, order_dir)
         limit_sql = self._build_limit_clause(limit)
+        record_sql = f"to_jsonb({alias}.*)"
+        if fields is not None:
+            wanted = set(fields)
+            if enrichment is not None:
+                fts_view, enriched = enrichment
+                enriched = {key: col for key, col in enriched.items() if key in wanted}
+                enrichment = (fts_view, enriched) if enriched else None
+            enriched_keys = set(enrichment[1]) if enrichment else set()
+            columns = ["id"] + sorted(
+                column
+                for column in self._view_columns(view)
+                if column != "id" and (column in wanted or column == "cold_id") and column not in enriched_keys
+            )
+            selected = ", ".join(f'{alias}."{column}"' for column in columns)
+            record_sql = f"(SELECT to_jsonb(p) FROM (SELECT {selected}) p)"
         if enrichment is None:
             return (
-                f"SELECT {alias}.id AS record_id, to_jsonb({alias}.*) AS complete_record "
+                f"SELECT {alias}.id AS record_id, {record_sql} AS complete_record "
                 f"FROM {view} {alias}{where_sql}{order_sql}{limit_sql}"
             )
-        fts_view, fields = enrichment
-        pairs = ", ".join(f"'{key}', sv.\"{col}\"" for key, col in fields.items())
+        fts_view, enriched = enrichment
+        pairs = ", ".join(f"'{key}', sv.\"{col}\"" for key, col in enriched.items())
         return (
             f"SELECT {alias}.id AS record_id, "
-            f"to_jsonb({alias}.*) || jsonb_build_object({pairs}) AS complete_record "
+            f"{record_sql} || jsonb_build_object({pairs}) AS complete_record "
             f"FROM {view} {alias} "
             f"LEFT JOIN {fts_view} sv ON sv.id = {alias}.id"
             f"{where_sql}{order_sql}{limit_sql}"
         )
 
+    _VIEW_COLUMNS: dict[str, frozenset[str]] = {}
+
+    def _view_columns(self, view: str) -> frozenset[str]:
+        """Column names of a ``base_*`` view, read from the catalog once per process (they only change with migrations)."""
+        columns = self._VIEW_COLUMNS.get(view)
+        if columns is None:
+            rows = self.db.execute_query(_VIEW_COLUMNS_SQL, {"view": view}, label="view_columns") or []
+            columns = frozenset(row["column_name"] for row in rows if _SAFE_COLUMN.match(row["column_name"]))
+            if columns:
+                self._VIEW_COLUMNS[view] = columns
+        return columns
+
     VALID_DETAIL_TABLES: set[str] = {
         "Answers",
         "HCCH Answers",
@@ -153,17 +398,115 @@ class SearchService:
         "Specialists",
     }
 
-    def get_entity_detail(self, table: str, cold_id: str) -> dict[str, Any] | None:
-        if table not in self.VALID_DETAIL_TABLES:
+    VALID_RELATION_KINDS: frozenset[str] = frozenset(
+        {
+            "hcch_answers",
+            "questions",
+            "jurisdictions",
+            "themes",
+            "court_decisions",
+            "domestic_instruments",
+            "domestic_legal_provisions",
+            "regional_instruments",
+            "regional_legal_provisions",
+            "international_instruments",
+            "international_legal_provisions",
+            "literature",
+            "arbitral_awards",
+            "arbitral_institutions",
+            "arbitral_rules",
+            "arbitral_provisions",
+            "specialists",
+        }
+    )
+
+    @classmethod
+    def _prepare_entity_detail(
+        cls,
+        table: str,
+        cold_id: str,
+        fields: list[str] | None,
+        include_relations: list[str] | None,
+        relation_limit: int | None,
+    ) -> dict[str, Any]:
+        if table not in cls.VALID_DETAIL_TABLES:
+            raise ValueError(f"Unsupported table: {table}")
+        return {
+            "table_name": table,
+            "cold_id": cold_id,
+            **cls._detail_projection_params(fields, include_relations, relation_limit),
+        }
+
+    @staticmethod
+    def _detail_projection_params(
+        fields: list[str] | None,
+        include_relations: list[str] | None,
+        relation_limit: int | None,
+    ) -> dict[str, Any]:
+        if relation_limit is not None and relation_limit < 0:
+            raise ValueError("relation_limit must not be negative")
+        return {
+            "fields": _projection_keys(fields),
+            "include_relations": _projection_keys(include_relations),
+            "relation_limit": relation_limit,
+        }
+
+    @classmethod
+    def _prepare_entity_relations(cls, table: str, cold_id: str, kind: str, after: int, limit: int) -> dict[str, Any]:
+        if table not in cls.VALID_DETAIL_TABLES:
             raise ValueError(f"Unsupported table: {table}")
+        relation_kind = to_snake(kind.strip())
+        if relation_kind not in cls.VALID_RELATION_KINDS:
+            raise ValueError(f"Unsupported relation: {kind}")
+        if after < 0 or limit < 1:
+            raise ValueError("after must not be negative and limit must be positive")
+        # One extra row tells whether there is a next page.
+        return {"table_name": table, "cold_id": cold_id, "kind": relation_kind, "after": after, "limit": limit + 1}
 
-        sql = """
-        SELECT source_table, record_id, cold_id, base_record, relations
-        FROM data_views.get_entity_detail(:table_name, :cold_id)
-        """
-        params = {"table_name": table, "cold_id": cold_id}
-        results = self.db.execute_query(sql, params)
+    @staticmethod
+    def _shape_relation_page(kind: str, rows: list[dict[str, Any]] | None, limit: int) -> dict[str, Any]:
+        rows = rows or []
+        page = rows[:limit]
+        return {
+            "kind": kind,
+            "items": [row["item"] for row in page],
+            "next_after": page[-1]["position"] if len(rows) > limit else None,
+        }
+
+    @classmethod
+    def _prepare_entity_details(
+        cls,
+        keys: list[tuple[str, str]],
+        fields: list[str] | None,
+        include_relations: list[str] | None,
+        relation_limit: int | None,
+    ) -> tuple[list[tuple[str, str]], dict[str, Any]]:
+        unique = list(dict.fromkeys(keys))
+        for table, _ in unique:
+            if table not in cls.VALID_DETAIL_TABLES:
+                raise ValueError(f"Unsupported table: {table}")
+        params = {
+            "table_names": [table for table, _ in unique],
+            "cold_ids": [cold_id for _, cold_id in unique],
+            **cls._detail_projection_params(fields, include_relations, relation_limit),
+        }
+        return unique, params
+
+    @staticmethod
+    def _shape_entity_details(unique: list[tuple[str, str]], rows: list[dict[str, Any]] | None) -> dict[str, Any]:
+        found = {row["ord"]: SearchService._shape_entity_detail([row]) for row in rows or []}
+        results: list[dict[str, Any]] = []
+        missing: list[dict[str, str]] = []
+        for ord_, (table, cold_id) in enumerate(unique, start=1):
+            detail = found.get(ord_)
+            if detail:
+                results.append(detail)
+            else:
+                missing.append({"table": table, "id": cold_id})
+        return {"results": results, "missing": missing}
 
+    @staticmethod
+    def _shape_entity_detail(results: list[dict[str, Any]] | None) -> dict[str, Any] | None:
         if not results:
             return None
 
@@ -179,6 +522,7 @@ class SearchService:
             "cold_id": row.get("cold_id"),
             **base_record,
             "relations": row.get("relations") or {},
+            "relation_counts": row.get("relation_counts") or {},
         }
 
     @staticmethod
@@ -211,6 +555,7 @@ class SearchService:
         order_by: str | None = None,
         order_dir: str | None = None,
         limit: int | None = None,
+        fields: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         try:
             sql = self._build_select_sql(
@@ -218,11 +563,13 @@ class SearchService:
                 order_by=order_by,
                 order_dir=order_dir,
                 limit=limit,
+                fields=_projection_keys(fields),
             )
             rows = self.db.execute_query(sql, {}) or []
             return self._flatten_rows(rows, table, response_type)
         except Exception as e:
             logger.error("Error querying full table %s: %s", table, e)
+            note_query_failure("full_table")
             return []
 
     def filtered_table(
@@ -233,6 +580,7 @@ class SearchService:
         order_by: str | None = None,
         order_dir: str | None = None,
         limit: int | None = None,
+        fields: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         try:
             alias = "c"
@@ -244,6 +592,7 @@ class SearchService:
                 order_by=order_by,
                 order_dir=order_dir,
                 limit=limit,
+                fields=_projection_keys(fields),
             )
             rows = self.db.execute_query(sql, params) or []
             return self._flatten_rows(rows, table, response_type)
@@ -254,9 +603,43 @@ class SearchService:
                 filters,
                 e,
             )
+            note_query_failure("filtered_table")
             return []
 
-    def _extract_filters(self, filters: list[Any]) -> tuple[list[str], list[str], list[str]]:
+    def iter_table(
+        self,
+        table: str,
+        filters: list[Any] | None = None,
+        order_by: str | None = None,
+        order_dir: str | None = None,
+        limit: int | None = None,
+        fields: list[str] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream a full or filtered table as parsed records for bulk export.
+
+        Validation and SQL building happen eagerly so an unsupported table raises ``ValueError`` to the caller;
+        rows are then read through a server-side cursor ``batch_size`` at a time instead of being buffered.
+        """
+        alias = "c"
+        where_sql, params = build_filter_clause(alias, filters) if filters else ("", {})
+        sql = self._build_select_sql(
+            table,
+            alias=alias,
+            where_sql=where_sql,
+            order_by=order_by,
+            order_dir=order_dir,
+            limit=limit,
+            fields=_projection_keys(fields),
+        )
+        return self._iter_flattened(sql, params, table, batch_size)
+
+    def _iter_flattened(self, sql: str, params: dict[str, Any], table: str, batch_size: int) -> Iterator[dict[str, Any]]:
+        for row in self.db.iter_query(sql, params, batch_size=batch_size):
+            yield from self._flatten_rows([row], table, "parsed")
+
+    @staticmethod
+    def _extract_filters(filters: list[Any]) -> tuple[list[str], list[str], list[str]]:
         tables = []
         jurisdictions = []
         themes = []
@@ -274,25 +657,41 @@ class SearchService:
                     "jurisdictions",
                     "jurisdiction",
                 ]:
-                    jurisdictions.extend(values)
+                    jurisdictions.extend(_facet_keys(values))
                 elif col_lower in ["themes", "themes name"]:
-                    themes.extend(values)
+                    themes.extend(_facet_keys(values))
                 elif col_lower in ["source_table", "tables"]:
                     tables.extend(values)
         return tables, jurisdictions, themes
 
-    def full_text_search(
-        self,
+    @staticmethod
+    def _prepare_search(
         search_string: str | None,
-        filters: list[Any] | None = None,
-        page: int = 1,
-        page_size: int = 50,
-        sort_by_date: bool = False,
-        response_type: str = "parsed",
-    ) -> dict[str, Any]:
-        if filters is None:
-            filters = []
-        tables, jurisdictions, themes = self._extract_filters(filters)
+        filters: list[Any],
+        page: int,
+        page_size: int,
+        sort_by_date: bool,
+        response_type: str,
+        cursor: str | None,
+        estimate_total: bool,
+        query_syntax: str = "plain",
+    ) -> tuple[tuple[Any, ...], dict[str, Any]]:
+        """Return the result-cache key and the ``search_all_v2`` bind parameters for one search request."""
+        after_key = _decode_cursor(cursor) if cursor else None
+        tables, jurisdictions, themes = SearchService._extract_filters(filters)
+        cache_key = (
+            _normalize_search_string(search_string),
+            tuple(sorted(tables)),
+            tuple(sorted(jurisdictions)),
+            tuple(sorted(themes)),
+            page,
+            page_size,
+            sort_by_date,
+            response_type,
+            cursor,
+            estimate_total,
+            query_syntax,
+        )
         params = {
             "search_term": search_string,
             "filter_tables": tables or None,
@@ -301,34 +700,101 @@ class SearchService:
             "page": page,
             "page_size": page_size,
             "sort_by_date": sort_by_date,
+            "after_key": json.dumps(after_key) if after_key is not None else None,
+            # A cursor page skips the exact count: counting every match would cost as much as the OFFSET it replaces.
+            "exact_count": not estimate_total and after_key is None,
+            "query_syntax": query_syntax,
         }
-        count_sql = (
-            "SELECT data_views.search_all_count_v2("
-            "search_term := CAST(:search_term AS text), "
-            "filter_tables := CAST(:filter_tables AS text[]), "
-            "filter_jurisdictions := CAST(:filter_jurisdictions AS text[]), "
-            "filter_themes := CAST(:filter_themes AS text[])"
-            ") AS total_matches"
+        return cache_key, params
+
+    @staticmethod
+    def _prepare_facets(
+        search_string: str | None, filters: list[Any], query_syntax: str = "plain"
+    ) -> tuple[tuple[Any, ...], dict[str, Any]]:
+        """Return the result-cache key and the ``search_facets`` bind parameters for one facet request."""
+        tables, jurisdictions, themes = SearchService._extract_filters(filters)
+        cache_key = (
+            "facets",
+            _normalize_search_string(search_string),
+            tuple(sorted(tables)),
+            tuple(sorted(jurisdictions)),
+            tuple(sorted(themes)),
+            query_syntax,
         )
-        count_result = self.db.execute_query(count_sql, params)
-        total_matches = count_result[0].get("total_matches", 0) if count_result else 0
-        logger.debug("Performing full-text search with params: %s", params)
-        sql = (
-            "SELECT table_name AS source_table, record_id AS id, complete_record AS complete_record, rank, result_date "
-            "FROM data_views.search_all_v2("
-            "search_term := CAST(:search_term AS text), "
-            "filter_tables := CAST(:filter_tables AS text[]), "
-            "filter_jurisdictions := CAST(:filter_jurisdictions AS text[]), "
-            "filter_themes := CAST(:filter_themes AS text[]), "
-            "page := CAST(:page AS integer), "
-            "page_size := CAST(:page_size AS integer), "
-            "sort_by_date := CAST(:sort_by_date AS boolean)"
-            ")"
+        params = {
+            "search_term": search_string,
+            "filter_tables": tables or None,
+            "filter_jurisdictions": jurisdictions or None,
+            "filter_themes": themes or None,
+            "query_syntax": query_syntax,
+        }
+        return cache_key, params
+
+    @staticmethod
+    def _prepare_suggest(prefix: str, tables: list[str] | None, limit: int) -> tuple[tuple[Any, ...], dict[str, Any]]:
+        """Return the prefix-cache key and the ``search_suggest`` bind parameters for one typeahead request."""
+        key = _suggest_key(prefix)
+        table_filter = sorted(set(tables)) if tables else None
+        cache_key = ("suggest", key, tuple(table_filter or ()), limit)
+        params = {"prefix": key, "filter_tables": table_filter, "max_results": limit}
+        return cache_key, params
+
+    @staticmethod
+    def _shape_facets(rows: list[dict[str, Any]], search_string: str | None, filters: list[Any]) -> dict[str, Any]:
+        response: dict[str, Any] = {
+            "query": search_string,
+            "filters": filters,
+            "total_matches": 0,
+            **{key: {} for key in _FACET_KEYS.values()},
+        }
+        for row in sorted(rows, key=lambda r: (-int(r.get("hits") or 0), str(r.get("value")))):
+            facet = row.get("facet")
+            if facet == "total":
+                response["total_matches"] = int(row.get("hits") or 0)
+            elif facet in _FACET_KEYS and row.get("value") is not None:
+                response[_FACET_KEYS[facet]][row["value"]] = int(row.get("hits") or 0)
+        return response
+
+    @staticmethod
+    def _record_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # Past the last page search_all_v2 returns a single total-only row, with no record, instead of nothing.
+        return [row for row in rows if row.get("id") is not None]
+
+    @staticmethod
+    def _needs_suggestion(rows: list[dict[str, Any]], params: dict[str, Any]) -> bool:
+        # An empty first page means nothing matched; only then is a spelling fallback worth one more query.
+        return (
+            not rows
+            and params["page"] == 1
+            and params["after_key"] is None
+            and _normalize_search_string(params["search_term"]) is not None
         )
-        rows = self.db.execute_query(sql, params) or []
+
+    @staticmethod
+    def _fallback_params(params: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in params.items() if key not in ("page", "after_key")}
+
+    @staticmethod
+    def _total_from_rows(rows: list[dict[str, Any]]) -> int:
+        return int(rows[0].get("total_count") or 0) if rows else 0
+
+    @staticmethod
+    def _shape_search_response(
+        rows: list[dict[str, Any]],
+        total_matches: int,
+        search_string: str | None,
+        filters: list[Any],
+        page: int | None,
+        page_size: int,
+        response_type: str,
+        estimate_total: bool,
+        did_you_mean: str | None = None,
+    ) -> dict[str, Any]:
         logger.debug("search_all_v2 returned %d rows (total_matches=%d)", len(rows), total_matches)
-        if not rows and total_matches > 0:
-            logger.warning("search SQL:\n%s\nparams: %s", sql, params)
+        next_cursor = _encode_cursor(rows[-1]["sort_key"]) if len(rows) == page_size and rows[-1].get("sort_key") else None
+        if did_you_mean is not None:
+            # The cursor would page the original query, which matches nothing; clients re-search with the suggestion.
+            next_cursor = None
         parsed_results = []
         raw_results = []
         for row in rows:
@@ -362,32 +828,21 @@ class SearchService:
                 )
 
         if response_type == "raw":
-            return {
-                "query": search_string,
-                "filters": filters,
-                "total_matches": total_matches,
-                "page": page,
-                "page_size": page_size,
-                "results": raw_results,
-            }
-        if response_type == "both":
-            combined = [{"parsed": p, "raw": r} for p, r in zip(parsed_results, raw_results, strict=False)]
-            return {
-                "query": search_string,
-                "filters": filters,
-                "total_matches": total_matches,
-                "page": page,
-                "page_size": page_size,
-                "results": combined,
-            }
-
+            results: list[Any] = raw_results
+        elif response_type == "both":
+            results = [{"parsed": p, "raw": r} for p, r in zip(parsed_results, raw_results, strict=False)]
+        else:
+            results = parsed_results
         return {
             "query": search_string,
             "filters": filters,
             "total_matches": total_matches,
+            "total_is_estimate": estimate_total,
             "page": page,
             "page_size": page_size,
-            "results": parsed_results,
+            "next_cursor": next_cursor,
+            "did_you_mean": did_you_mean,
+            "results": results,
         }
 
     def get_specialists_by_jurisdiction(self, jurisdiction_alpha_code: str) -> list[dict[str, Any]]:
@@ -409,3 +864,120 @@ class SearchService:
         except Exception as e:
             logger.error(f"Error querying specialists for jurisdiction {jurisdiction_alpha_code}: {e}")
             raise
+
+
+class AsyncSearchService:
+    """Search, facets, typeahead and entity details on the asyncpg engine.
+
+    SQL preparation and response shaping are the ``SearchService`` helpers also used by the table export.
+    """
+
+    def __init__(self) -> None:
+        self.db = AsyncDatabase(config.SQL_CONN_STRING)
+
+    async def full_text_search(
+        self,
+        search_string: str | None,
+        filters: list[Any] | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort_by_date: bool = False,
+        response_type: str = "parsed",
+        cursor: str | None = None,
+        estimate_total: bool = False,
+        query_syntax: str = "plain",
+    ) -> dict[str, Any]:
+        if filters is None:
+            filters = []
+        cache_key, params = SearchService._prepare_search(
+            search_string, filters, page, page_size, sort_by_date, response_type, cursor, estimate_total, query_syntax
+        )
+        cached = search_cache.get(cache_key) if search_cache.enabled else None
+        if cached is not None:
+            return {**cached, "query": search_string, "filters": filters}
+
+        total_rows = await self.db.execute_query(_SEARCH_SQL, params, label="search_all_v2") or []
+        rows = SearchService._record_rows(total_rows)
+        did_you_mean = None
+        if SearchService._needs_suggestion(rows, params):
+            fallback_params = SearchService._fallback_params(params)
+            rows = total_rows = await self.db.execute_query(_FALLBACK_SQL, fallback_params, label="search_fallback") or []
+            did_you_mean = rows[0]["suggestion"] if rows else None
+        response = SearchService._shape_search_response(
+            rows,
+            SearchService._total_from_rows(total_rows),
+            search_string,
+            filters,
+            None if cursor else page,
+            page_size,
+            response_type,
+            not params["exact_count"],
+            did_you_mean,
+        )
+        # execute_query reports errors as empty results, so only pages that found something are cached.
+        if response["results"]:
+            search_cache.put(cache_key, response)
+        return response
+
+    async def search_facets(
+        self, search_string: str | None, filters: list[Any] | None = None, query_syntax: str = "plain"
+    ) -> dict[str, Any]:
+        if filters is None:
+            filters = []
+        cache_key, params = SearchService._prepare_facets(search_string, filters, query_syntax)
+        cached = search_cache.get(cache_key) if search_cache.enabled else None
+        if cached is not None:
+            return {**cached, "query": search_string, "filters": filters}
+
+        rows = await self.db.execute_query(_FACETS_SQL, params, label="search_facets") or []
+        response = SearchService._shape_facets(rows, search_string, filters)
+        if response["total_matches"]:
+            search_cache.put(cache_key, response)
+        return response
+
+    async def suggest(self, prefix: str, tables: list[str] | None = None, limit: int = 10) -> dict[str, Any]:
+        cache_key, params = SearchService._prepare_suggest(prefix, tables, limit)
+        cached = suggest_cache.get(cache_key) if suggest_cache.enabled and params["prefix"] else None
+        if cached is not None:
+            return {**cached, "prefix": prefix}
+
+        rows = await self.db.execute_query(_SUGGEST_SQL, params, label="search_suggest") if params["prefix"] else []
+        response = {"prefix": prefix, "suggestions": rows or []}
+        if response["suggestions"]:
+            suggest_cache.put(cache_key, response)
+        return response
+
+    async def get_entity_detail(
+        self,
+        table: str,
+        cold_id: str,
+        fields: list[str] | None = None,
+        include_relations: list[str] | None = None,
+        relation_limit: int | None = None,
+    ) -> dict[str, Any] | None:
+        params = SearchService._prepare_entity_detail(table, cold_id, fields, include_relations, relation_limit)
+        results = await self.db.execute_query(_ENTITY_DETAIL_SQL, params, label="get_entity_detail")
+        return SearchService._shape_entity_detail(results)
+
+    async def get_entity_details(
+        self,
+        keys: list[tuple[str, str]],
+        fields: list[str] | None = None,
+        include_relations: list[str] | None = None,
+        relation_limit: int | None = None,
+    ) -> dict[str, Any]:
+        unique, params = SearchService._prepare_entity_details(keys, fields, include_relations, relation_limit)
+        rows = await self.db.execute_query(_ENTITY_DETAILS_SQL, params, label="get_entity_details")
+        return SearchService._shape_entity_details(unique, rows)
+
+    async def get_entity_relations(
+        self,
+        table: str,
+        cold_id: str,
+        kind: str,
+        after: int = 0,
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        params = SearchService._prepare_entity_relations(table, cold_id, kind, after, limit)
+        rows = await self.db.execute_query(_ENTITY_RELATIONS_SQL, params, label="get_entity_relations")
+        return SearchService._shape_relation_page(params["kind"], rows, limit)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import logfire
+
+_hits = logfire.metric_counter("search_cache_hits", description="Full-text search responses served from the in-process cache")
+_misses = logfire.metric_counter("search_cache_misses", description="Full-text search responses computed against Postgres")
+
+
+class SearchResultCache:
+    """Bounded TTL/LRU cache for full-text search responses.
+
+    Entries are tagged with the materialized-view refresh generation they were computed under; a lookup made
+    under a different generation is a miss, so a refresh invalidates everything without an explicit flush.
+    The TTL bounds staleness when no generation is available. Values are deep-copied on the way in and out, so
+    callers may modify what they put or get without touching the cached entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 900.0,
+        generation_provider: Callable[[], int | None] | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation_provider = generation_provider
+        self._entries: OrderedDict[Hashable, tuple[int | None, float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def _generation(self) -> int | None:
+        return self.generation_provider() if self.generation_provider else None
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        generation = self._generation()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                _hits.add(1)
+                return copy.deepcopy(entry[2])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        _misses.add(1)
+        return None
+
+    def put(self, key: Hashable, value: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        generation = self._generation()
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
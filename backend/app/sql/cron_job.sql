@@ -1,7 +1,15 @@
 CREATE EXTENSION IF NOT EXISTS pg_cron;
 
+-- Refresh only the views whose NocoDB tables changed since the last refresh.
 SELECT cron.schedule(
   'refresh_nocodb_views',
   '*/15 * * * *',
+  $$SELECT data_views.refresh_changed_materialized_views();$$
+);
+
+-- Full rebuild once a night, for changes the triggers do not see (schema changes, new functions).
+SELECT cron.schedule(
+  'refresh_nocodb_views_full',
+  '30 3 * * *',
   $$SELECT data_views.refresh_all_materialized_views();$$
 );
@@ -0,0 +1,488 @@
+"""Latency benchmark for search, detail, entity-list and full-table queries.
+
+Loads a synthetic NocoDB dataset into a scratch Postgres database, applies the ``alembic_views`` migrations and times
+the service calls behind the hot endpoints, on the asyncpg or psycopg2 engine the route uses, reporting p50/p95/p99
+per operation together with the one-off migration and refresh durations.
+
+The tables are created from ``scripts/benchmark_columns.csv``, the output of ``app/sql/nocodb_schema.sql``. Refresh
+it from the NocoDB database in ``SQL_CONN_STRING`` with ``--snapshot-schema`` after the NocoDB schema changes.
+
+Run from ``backend/`` against a database you can throw away — loading drops the NocoDB schema and ``data_views``:
+
+    BENCHMARK_SQL_CONN_STRING=postgresql://localhost/cold_bench uv run python scripts/benchmark_search.py --rows 100000
+
+``--skip-load`` re-runs the timings on the data already loaded. ``--json FILE`` saves the report and
+``--baseline FILE`` compares p95 latencies against a saved one, exiting non-zero when any operation got slower than
+``--max-regression`` times its baseline, e.g. to compare a migration branch against main.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import datetime
+import inspect
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import psycopg2
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_QUERY = BACKEND_DIR / "app" / "sql" / "nocodb_schema.sql"
+SCHEMA_COLUMNS = Path(__file__).resolve().parent / "benchmark_columns.csv"
+SCHEMA = "p1q5x3pj29vkrdr"
+# information_schema data types -> the value kinds ``_value`` generates; anything else gets text.
+VALUE_KINDS = {
+    "integer": "INTEGER",
+    "bigint": "INTEGER",
+    "smallint": "INTEGER",
+    "numeric": "NUMERIC",
+    "double precision": "NUMERIC",
+    "real": "NUMERIC",
+    "boolean": "BOOLEAN",
+    "date": "DATE",
+    "timestamp without time zone": "TIMESTAMP",
+    "timestamp with time zone": "TIMESTAMP",
+}
+
+# Share of --rows per entity table; lookup tables get fixed sizes.
+ROW_WEIGHTS = {
+    "Answers": 0.22,
+    "Court_Decisions": 0.14,
+    "Literature": 0.14,
+    "Domestic_Legal_Provisions": 0.10,
+    "Domestic_Instruments": 0.05,
+    "Arbitral_Awards": 0.05,
+    "HCCH_Answers": 0.04,
+    "Regional_Legal_Provisions": 0.04,
+    "International_Legal_Provisions": 0.04,
+    "Arbitral Provisions": 0.04,
+    "Regional_Instruments": 0.03,
+    "International_Instruments": 0.03,
+    "Arbitral_Institutions": 0.03,
+    "Arbitral_Rules": 0.03,
+    "Specialists": 0.02,
+}
+JURISDICTIONS = [
+    ("Switzerland", "CHE"),
+    ("Germany", "DEU"),
+    ("France", "FRA"),
+    ("United Kingdom", "GBR"),
+    ("United States", "USA"),
+    ("Brazil", "BRA"),
+    ("India", "IND"),
+    ("Japan", "JPN"),
+    ("China", "CHN"),
+    ("Nigeria", "NGA"),
+    ("Niger", "NER"),
+    ("South Africa", "ZAF"),
+    ("Chile", "CHL"),
+    ("Mexico", "MEX"),
+    ("Australia", "AUS"),
+    ("Canada", "CAN"),
+    ("Egypt", "EGY"),
+    ("Turkey", "TUR"),
+    ("Netherlands", "NLD"),
+    ("Paraguay", "PRY"),
+]
+THEMES = [
+    "Party autonomy",
+    "Tacit choice",
+    "Partial choice",
+    "Absence of choice",
+    "Arbitration",
+    "Mandatory rules",
+    "Public policy",
+    "Consumer contracts",
+    "Employment contracts",
+    "Freedom of choice",
+    "Dépeçage",
+    "Codifications",
+]
+QUESTIONS = 60
+WORDS = (
+    "party autonomy arbitration contract choice law forum mandatory rules consumer employment tort jurisdiction court "
+    "clause validity implied express tacit renvoi public policy characterisation agreement governing applicable "
+    "international private convention regulation principle tribunal award enforcement recognition seat proceedings "
+    "dispute commercial parties obligation performance damages limitation interpretation foreign judgment"
+).split()
+SURNAMES = "Smith Jones Meier Müller Dubois Rossi Tanaka Okafor Silva Kumar Schmidt Martin Garcia Novak Ivanova".split()
+COURTS = ["EWHC", "BGE", "BGH", "Cass civ", "SCC", "HCA", "STJ", "SC"]
+LONG_TEXT_HINTS = ("Abstract", "Text", "Quote", "Facts", "Position", "Excerpt", "Summary", "Bio", "Information", "Context")
+
+SEARCH_TERMS = ["party autonomy", "arbitration", "choice of law", "consumer contract", "public policy", "tacit choice"]
+
+
+def _words(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def _value(rng: random.Random, table: str, column: str, column_type: str, row: int) -> Any:
+    if table == "Jurisdictions":
+        name, code = JURISDICTIONS[row - 1]
+        special = {"Name": name, "Alpha_3_Code": code, "Irrelevant_": row == len(JURISDICTIONS)}
+        if column in special:
+            return special[column]
+    if table == "Themes" and column == "Theme":
+        return THEMES[row - 1]
+    if table == "Questions" and column == "Question_Number":
+        return f"{row:02d}-P"
+    if table == "Answers" and column == "Answer":
+        return rng.choice(["Yes", "No", "No data", f"Yes, {_words(rng, 4, 12)}"])
+    if table == "Court_Decisions" and column == "Case_Citation":
+        a, b = rng.sample(SURNAMES, 2)
+        return f"{a} v {b} [{rng.randint(1950, 2024)}] {rng.choice(COURTS)} {rng.randint(1, 999)}"
+    if table == "Court_Decisions" and column == "Date":
+        return f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(1950, 2024)}"
+    if column == "ID_Number":
+        return str(row)
+    if column_type == "TEXT" and column == "Date":
+        return str(rng.randint(1950, 2024))
+    if column_type == "INTEGER":
+        return rng.randint(1950, 2024)
+    if column_type == "NUMERIC":
+        return rng.randint(1, 10)
+    if column_type == "BOOLEAN":
+        return rng.random() < 0.3
+    if column_type == "DATE":
+        return datetime.date(rng.randint(1950, 2024), rng.randint(1, 12), rng.randint(1, 28))
+    if column_type == "TIMESTAMP":
+        return datetime.datetime(2025, rng.randint(1, 12), rng.randint(1, 28))
+    if any(hint in column for hint in LONG_TEXT_HINTS):
+        return _words(rng, 30, 120)
+    return _words(rng, 3, 12)
+
+
+def snapshot_schema(conn_string: str) -> int:
+    """Write the output of ``nocodb_schema.sql`` on ``conn_string`` to ``benchmark_columns.csv``; return the row count."""
+    conn = psycopg2.connect(conn_string)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(SCHEMA_QUERY.read_text())
+            rows = cur.fetchall()
+            header = [column.name for column in cur.description]
+    finally:
+        conn.close()
+    with SCHEMA_COLUMNS.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return len(rows)
+
+
+def _read_columns() -> dict[str, list[tuple[str, str]]]:
+    """Table name -> [(column, data type)] in column order, from ``benchmark_columns.csv``."""
+    tables: dict[str, list[tuple[str, str]]] = {}
+    with SCHEMA_COLUMNS.open(newline="") as f:
+        rows = sorted(csv.DictReader(f), key=lambda r: (r["table_full_name"], int(r["ordinal_position"])))
+    for row in rows:
+        table = row["table_full_name"].split(".", 1)[1]
+        tables.setdefault(table, []).append((row["column_name"], row["data_type"]))
+    return tables
+
+
+def _schema_ddl(tables: dict[str, list[tuple[str, str]]]) -> str:
+    """CREATE statements for ``tables`` with every column nullable, plus an index per link column of M2M tables."""
+    statements = [f"CREATE SCHEMA IF NOT EXISTS {SCHEMA};"]
+    for table, columns in tables.items():
+        definitions = [
+            ("id BIGSERIAL PRIMARY KEY" if data_type == "bigint" else "id SERIAL PRIMARY KEY")
+            if column == "id"
+            else f'"{column}" {data_type}'
+            for column, data_type in columns
+        ]
+        statements.append(f'CREATE TABLE {SCHEMA}."{table}" (\n    ' + ",\n    ".join(definitions) + "\n);")
+        if table.startswith("_nc_m2m_"):
+            statements.extend(
+                f'CREATE INDEX ON {SCHEMA}."{table}" ("{column}");' for column, _ in columns if column.endswith("_id")
+            )
+    return "\n".join(statements)
+
+
+def _parse_schema() -> dict[str, list[tuple[str, str]]]:
+    """Table name -> [(column, value kind)] for every table in the column snapshot, ``id`` excluded."""
+    return {
+        table: [(column, VALUE_KINDS.get(data_type, "TEXT")) for column, data_type in columns if column != "id"]
+        for table, columns in _read_columns().items()
+    }
+
+
+def _table_sizes(tables: dict[str, list[tuple[str, str]]], rows: int) -> dict[str, int]:
+    sizes = {"Jurisdictions": len(JURISDICTIONS), "Themes": len(THEMES), "Questions": QUESTIONS}
+    for table in tables:
+        if not table.startswith("_nc_m2m_") and table not in sizes:
+            sizes[table] = max(10, int(rows * ROW_WEIGHTS.get(table, 0.01)))
+    return sizes
+
+
+def _copy(cur: Any, table: str, columns: list[str], rows: Iterator[tuple[Any, ...]], chunk: int = 50_000) -> None:
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    statement = f'COPY {SCHEMA}."{table}" ({column_list}) FROM STDIN WITH (FORMAT csv)'
+    while True:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        written = 0
+        for row in rows:
+            writer.writerow(["" if v is None else v for v in row])
+            written += 1
+            if written == chunk:
+                break
+        if not written:
+            return
+        buffer.seek(0)
+        cur.copy_expert(statement, buffer)
+        if written < chunk:
+            return
+
+
+def _link_rows(rng: random.Random, left: int, right: int) -> Iterator[tuple[int, int]]:
+    """Link each row of the larger side to 0-2 rows of the smaller one, mostly one."""
+    larger, smaller = (left, right) if left >= right else (right, left)
+    for i in range(1, larger + 1):
+        picks = {rng.randint(1, smaller) for _ in range(rng.choices([0, 1, 2], weights=[1, 6, 3])[0])}
+        for j in picks:
+            yield (i, j) if left >= right else (j, i)
+
+
+def load(conn_string: str, rows: int, seed: int) -> dict[str, float]:
+    """Recreate the synthetic NocoDB schema, fill it, apply the view migrations and return setup timings."""
+    rng = random.Random(seed)
+    tables = _parse_schema()
+    sizes = _table_sizes(tables, rows)
+    timings: dict[str, float] = {}
+
+    conn = psycopg2.connect(conn_string)
+    conn.autocommit = True
+    conn.set_client_encoding("UTF8")
+    with conn.cursor() as cur:
+        cur.execute(
+            f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; DROP SCHEMA IF EXISTS data_views CASCADE; "
+            "DROP TABLE IF EXISTS public.alembic_version;"
+        )
+        cur.execute(_schema_ddl(_read_columns()))
+
+        started = time.perf_counter()
+        for table, columns in tables.items():
+            names = [c for c, _ in columns]
+            if table.startswith("_nc_m2m_"):
+                links = [c for c in names if c.removesuffix("_id") in sizes]
+                left, right = (sizes[c.removesuffix("_id")] for c in links)
+                _copy(cur, table, links, _link_rows(rng, left, right))
+            else:
+                generated = (tuple(_value(rng, table, c, t, i) for c, t in columns) for i in range(1, sizes[table] + 1))
+                _copy(cur, table, names, generated)
+        cur.execute("ANALYZE")
+        timings["seed_s"] = time.perf_counter() - started
+        print(f"Seeded {sum(sizes.values()):,} entity rows in {timings['seed_s']:.1f}s", file=sys.stderr)
+
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "-c", "alembic_views/alembic.ini", "upgrade", "head"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "SQL_CONN_STRING": conn_string},
+        check=True,
+    )
+    timings["migrate_s"] = time.perf_counter() - started
+
+    with conn.cursor() as cur:
+        cur.execute("ANALYZE")
+        started = time.perf_counter()
+        cur.execute("SELECT data_views.refresh_all_materialized_views()")
+        timings["refresh_s"] = time.perf_counter() - started
+    conn.close()
+    print(f"Migrated in {timings['migrate_s']:.1f}s, refreshed in {timings['refresh_s']:.1f}s", file=sys.stderr)
+    return timings
+
+
+async def _operations(rng: random.Random) -> dict[str, Callable[[int], Any | Awaitable[Any]]]:
+    """The service calls behind each endpoint, on the engine the route uses: asyncpg except for ``full_table``."""
+    # Imported late: app.config reads SQL_CONN_STRING and the cache sizes from the environment set in main().
+    from app.schemas.requests import FTSFilterOption
+    from app.services.entity_list import AsyncEntityListService, get_entity_config, list_entity_slugs
+    from app.services.search import AsyncSearchService, SearchService
+
+    search = AsyncSearchService()
+    tables_service = SearchService()
+    entities = AsyncEntityListService()
+    sample = (
+        await search.db.execute_query(
+            "SELECT table_name, complete_record->>'cold_id' AS cold_id FROM data_views.search_index "
+            "WHERE complete_record->>'cold_id' IS NOT NULL ORDER BY md5(table_name || record_id) LIMIT 200"
+        )
+        or []
+    )
+    slugs = list_entity_slugs()
+    jurisdiction = [FTSFilterOption(column="jurisdictions", values=["CHE"])]
+    tables = [FTSFilterOption(column="tables", values=["Court Decisions", "Literature"])]
+
+    def term(i: int) -> str:
+        return SEARCH_TERMS[i % len(SEARCH_TERMS)]
+
+    async def field(call: Awaitable[dict[str, Any]], key: str) -> Any:
+        return (await call)[key]
+
+    async def detail(i: int) -> Any:
+        row = sample[i % len(sample)]
+        return await search.get_entity_detail(row["table_name"], row["cold_id"])
+
+    async def entity_list(i: int, theme: str | None = None) -> Any:
+        cfg = get_entity_config(slugs[i % len(slugs)])
+        return (await entities.list_entity(cfg, theme=theme, page=1 + i % 3, page_size=50))[0] if cfg else None
+
+    full_tables = ["Jurisdictions", "Court Decisions", "Literature", "Domestic Instruments"]
+    return {
+        "search": lambda i: field(search.full_text_search(term(i)), "results"),
+        "search_filtered": lambda i: field(search.full_text_search(term(i), jurisdiction + tables), "results"),
+        "search_by_date": lambda i: field(search.full_text_search(term(i), sort_by_date=True), "results"),
+        "search_deep_page": lambda i: field(search.full_text_search(term(i), page=20, page_size=20), "results"),
+        "search_estimate": lambda i: field(search.full_text_search(term(i), estimate_total=True), "results"),
+        "search_websearch": lambda i: field(search.full_text_search(f'"{term(i)}" -tort', query_syntax="websearch"), "results"),
+        "search_browse": lambda i: field(search.full_text_search(None, page=1 + i % 5), "results"),
+        "search_facets": lambda i: field(search.search_facets(term(i)), "total_matches"),
+        "search_typo": lambda i: field(search.full_text_search(term(i).replace("o", "oo", 1)), "results"),
+        "search_suggest": lambda i: field(search.suggest(term(i)[: 2 + i % 4]), "suggestions"),
+        "detail": detail,
+        "entity_list": entity_list,
+        "entity_list_theme": lambda i: entity_list(i, theme=rng.choice(THEMES)),
+        "full_table": lambda i: tables_service.full_table(full_tables[i % len(full_tables)]),
+    }
+
+
+def _percentile(sorted_ms: list[float], pct: float) -> float:
+    if len(sorted_ms) == 1:
+        return sorted_ms[0]
+    return statistics.quantiles(sorted_ms, n=100, method="inclusive")[int(pct) - 1]
+
+
+async def _call(operation: Callable[[int], Any | Awaitable[Any]], i: int) -> Any:
+    result = operation(i)
+    return await result if inspect.isawaitable(result) else result
+
+
+async def run(iterations: int, warmup: int, seed: int, only: list[str] | None) -> dict[str, dict[str, float]]:
+    from app.services.db_manager import async_db_manager
+
+    rng = random.Random(seed)
+    report: dict[str, dict[str, float]] = {}
+    for name, operation in (await _operations(rng)).items():
+        if only and name not in only:
+            continue
+        # Full-table exports are orders of magnitude slower than the rest; sample them less.
+        count = max(5, iterations // 10) if name == "full_table" else iterations
+        for i in range(warmup):
+            await _call(operation, i)
+        samples: list[float] = []
+        empty = 0
+        for i in range(count):
+            started = time.perf_counter()
+            result = await _call(operation, i)
+            samples.append((time.perf_counter() - started) * 1000)
+            empty += not result
+        samples.sort()
+        report[name] = {
+            "n": count,
+            "p50_ms": _percentile(samples, 50),
+            "p95_ms": _percentile(samples, 95),
+            "p99_ms": _percentile(samples, 99),
+            "mean_ms": statistics.fmean(samples),
+            "empty": empty,
+        }
+        print(f"  {name:<18} p50 {report[name]['p50_ms']:9.2f} ms", file=sys.stderr)
+    await async_db_manager.dispose()
+    return report
+
+
+def _print_report(report: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    header = f"{'operation':<18} {'n':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'mean ms':>10} {'empty':>6}"
+    if baseline:
+        header += f" {'p95 vs base':>12}"
+    print(header)
+    for name, stats in report["operations"].items():
+        line = (
+            f"{name:<18} {stats['n']:>5} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+            f"{stats['p99_ms']:>10.2f} {stats['mean_ms']:>10.2f} {stats['empty']:>6}"
+        )
+        base = (baseline or {}).get("operations", {}).get(name)
+        if base:
+            line += f" {stats['p95_ms'] / base['p95_ms']:>11.2f}x"
+        print(line)
+    for key, seconds in report.get("setup", {}).items():
+        print(f"{key.removesuffix('_s')}: {seconds:.1f}s")
+
+
+def _regressions(report: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:
+    slower = []
+    for name, stats in report["operations"].items():
+        base = baseline.get("operations", {}).get(name)
+        if base and stats["p95_ms"] > base["p95_ms"] * max_regression:
+            slower.append(f"{name}: p95 {base['p95_ms']:.2f} -> {stats['p95_ms']:.2f} ms")
+    return slower
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10_000, help="Entity rows to generate across the NocoDB tables")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed calls per operation")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed calls per operation before timing")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for data and query choice")
+    parser.add_argument("--skip-load", action="store_true", help="Time the data already loaded")
+    parser.add_argument("--only", nargs="+", metavar="OPERATION", help="Run only these operations")
+    parser.add_argument("--json", type=Path, help="Write the report to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare p95 latencies against a saved report")
+    parser.add_argument("--max-regression", type=float, default=1.25, help="Allowed p95 ratio against --baseline")
+    parser.add_argument(
+        "--snapshot-schema",
+        action="store_true",
+        help="Rewrite the column snapshot from the NocoDB database in SQL_CONN_STRING and exit",
+    )
+    args = parser.parse_args()
+
+    if args.snapshot_schema:
+        source = os.environ.get("SQL_CONN_STRING")
+        if not source:
+            parser.error("--snapshot-schema reads the NocoDB schema from SQL_CONN_STRING")
+        print(f"Wrote {snapshot_schema(source):,} columns to {SCHEMA_COLUMNS.name}", file=sys.stderr)
+        return 0
+
+    conn_string = os.environ.get("BENCHMARK_SQL_CONN_STRING")
+    if not conn_string:
+        parser.error("BENCHMARK_SQL_CONN_STRING must point at a scratch database")
+    if conn_string == os.environ.get("SQL_CONN_STRING"):
+        parser.error("BENCHMARK_SQL_CONN_STRING must not be the application database")
+
+    setup = {} if args.skip_load else load(conn_string, args.rows, args.seed)
+    os.environ.update(
+        SQL_CONN_STRING=conn_string,
+        SEARCH_CACHE_MAX_ENTRIES="0",
+        SEARCH_SUGGEST_CACHE_MAX_ENTRIES="0",
+        LOGFIRE_SEND_TO_LOGFIRE="false",
+    )
+    sys.path.insert(0, str(BACKEND_DIR))
+    report = {
+        "rows": args.rows,
+        "iterations": args.iterations,
+        "setup": setup,
+        "operations": asyncio.run(run(args.iterations, args.warmup, args.seed, args.only)),
+    }
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    _print_report(report, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    slower = _regressions(report, baseline, args.max_regression) if baseline else []
+    for line in slower:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
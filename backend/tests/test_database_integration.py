@@ -1,8 +1,10 @@
 """Tests for Database class with singleton manager integration."""
 
+import pytest
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 
-from app.services.database import Database
+from app.services.database import Database, _is_transient, recording_query_failures, retry_counts
 from app.services.db_manager import db_manager
 
 
@@ -57,20 +59,83 @@ class TestDatabaseWithManager:
         assert len(results) == 1
         assert results[0]["name"] == "test"
 
-    def test_database_retry_logic(self):
-        """Test that retry logic works correctly."""
+    def test_iter_query_yields_rows_lazily(self):
+        """Test that iter_query streams dicts or tuples without buffering the result."""
+        db = Database(connection_string="sqlite:///:memory:")
+
+        with db_manager.get_session() as session:
+            session.execute(text("CREATE TABLE iter_test (id INTEGER PRIMARY KEY, name TEXT)"))
+            for i in range(5):
+                session.execute(text("INSERT INTO iter_test (id, name) VALUES (:id, :name)"), {"id": i, "name": f"n{i}"})
+            session.commit()
+
+        rows = db.iter_query("SELECT id, name FROM iter_test ORDER BY id", batch_size=2)
+        assert next(rows) == {"id": 0, "name": "n0"}
+        assert len(list(rows)) == 4
+
+        tuples = list(db.iter_query("SELECT id, name FROM iter_test WHERE id > :id", {"id": 2}, as_tuples=True))
+        assert tuples == [(3, "n3"), (4, "n4")]
+
+    def test_empty_result_is_not_retried(self, mocker):
+        """Test that an empty result set returns immediately without sleeping."""
         db = Database(connection_string="sqlite:///:memory:", max_retries=2, retry_delay=0.1)
+        sleep = mocker.patch("app.services.database.time.sleep")
 
         # Create a simple table
         with db_manager.get_session() as session:
             session.execute(text("CREATE TABLE test_table (id INTEGER PRIMARY KEY, name TEXT)"))
             session.commit()
 
-        # First attempt returns empty, but should still return empty list (not retry indefinitely)
         results = db.execute_query("SELECT * FROM test_table WHERE id = 999")
 
         # Should return empty list, not None
         assert results == []
+        sleep.assert_not_called()
+
+    def test_transient_error_is_retried_with_backoff(self, mocker):
+        """Test that a dropped connection is retried and counted under the query label."""
+        db = Database(connection_string="sqlite:///:memory:", max_retries=3, retry_delay=0.1)
+        sleep = mocker.patch("app.services.database.time.sleep")
+        mocker.patch("app.services.database.random.uniform", return_value=1.0)
+        real_get_session = db_manager.get_session
+        dropped = OperationalError("SELECT 1", {}, Exception("server closed the connection"), connection_invalidated=True)
+        mocker.patch.object(db_manager, "get_session", side_effect=[dropped, dropped, real_get_session()])
+        before = retry_counts["flaky"]
+
+        results = db.execute_query("SELECT 1 AS one", label="flaky")
+
+        assert results == [{"one": 1}]
+        assert [c.args[0] for c in sleep.call_args_list] == [0.1, 0.2]
+        assert retry_counts["flaky"] - before == 2
+
+    def test_non_transient_error_is_not_retried(self, mocker):
+        """Test that a SQL error fails fast and returns None."""
+        db = Database(connection_string="sqlite:///:memory:")
+        sleep = mocker.patch("app.services.database.time.sleep")
+
+        assert db.execute_query("SELECT * FROM missing_table") is None
+        sleep.assert_not_called()
+
+    def test_swallowed_error_is_recorded(self):
+        """Test that a query returning None after an error is recorded for the current request."""
+        db = Database(connection_string="sqlite:///:memory:")
+
+        with recording_query_failures() as failures:
+            db.execute_query("SELECT 1")
+            db.execute_query("SELECT * FROM missing_table", label="missing")
+
+        assert failures == ["missing"]
+        assert db.execute_query("SELECT * FROM missing_table") is None
+
+    def test_retries_are_bounded(self, mocker):
+        """Test that a persistent transient error gives up after max_retries."""
+        db = Database(connection_string="sqlite:///:memory:", max_retries=2)
+        mocker.patch("app.services.database.time.sleep")
+        dropped = OperationalError("SELECT 1", {}, Exception("connection reset"), connection_invalidated=True)
+        get_session = mocker.patch.object(db_manager, "get_session", side_effect=dropped)
+
+        assert db.execute_query("SELECT 1") is None
+        assert get_session.call_count == 3
 
     def test_metadata_reflection_with_manager(self):
         """Test that metadata reflection works with the manager (lazy loading)."""
@@ -109,3 +174,18 @@ class TestDatabaseWithManager:
 
         assert results is not None
         assert results[0]["count"] == 2
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode: str | None):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+@pytest.mark.parametrize(
+    ("pgcode", "expected"),
+    [("40001", True), ("40P01", True), ("08006", True), ("57P01", True), ("42P01", False), ("57014", False), (None, False)],
+)
+def test_is_transient_classifies_sqlstate(pgcode, expected):
+    """Serialization failures, deadlocks and connection errors retry; SQL errors and timeouts do not."""
+    assert _is_transient(OperationalError("SELECT 1", {}, _PgError(pgcode))) is expected
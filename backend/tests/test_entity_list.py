@@ -0,0 +1,107 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.entity_list import (
+    ENTITY_LIST_CONFIGS,
+    AsyncEntityListService,
+    _build_list_queries,
+)
+
+COURT_DECISIONS = ENTITY_LIST_CONFIGS["court-decisions"]
+
+
+def _service(cls, db):
+    service = cls.__new__(cls)
+    service.db = db
+    return service
+
+
+class TestBuildListQueries:
+    def test_filters_paging_and_order(self):
+        list_sql, count_sql, params = _build_list_queries(
+            COURT_DECISIONS,
+            jurisdiction="che",
+            theme=None,
+            page=3,
+            page_size=10,
+            order_by="caseTitle",
+            order_dir="asc",
+            extra_filters={"case_rank": "5"},
+        )
+        assert params == {"juris": "CHE", "f_case_rank": "5"}
+        assert 'ORDER BY b."case_title" ASC NULLS LAST LIMIT 10 OFFSET 20' in list_sql
+        assert count_sql.startswith("SELECT COUNT(*) AS n FROM data_views.base_court_decisions b WHERE")
+
+    def test_unknown_order_column_falls_back_to_default(self):
+        list_sql, _, _ = _build_list_queries(
+            COURT_DECISIONS,
+            jurisdiction=None,
+            theme=None,
+            page=1,
+            page_size=10,
+            order_by="nope; DROP TABLE x",
+            order_dir=None,
+            extra_filters=None,
+        )
+        assert f'ORDER BY b."{COURT_DECISIONS.default_order_by}"' in list_sql
+
+    def test_theme_filter_joins_membership_view(self):
+        list_sql, count_sql, params = _build_list_queries(
+            COURT_DECISIONS,
+            jurisdiction=None,
+            theme="Public policy",
+            page=1,
+            page_size=10,
+            order_by=None,
+            order_dir=None,
+            extra_filters=None,
+        )
+        assert params == {"theme": "Public policy", "theme_slug": "court-decisions"}
+        for sql in (list_sql, count_sql):
+            assert "data_views.entity_theme_membership" in sql
+            assert "entity_has_theme" not in sql
+
+    def test_theme_ignored_for_entities_without_themes(self):
+        _, count_sql, params = _build_list_queries(
+            ENTITY_LIST_CONFIGS["specialists"],
+            jurisdiction=None,
+            theme="Public policy",
+            page=1,
+            page_size=10,
+            order_by=None,
+            order_dir=None,
+            extra_filters=None,
+        )
+        assert params == {}
+        assert "WHERE" not in count_sql
+
+
+class TestAsyncEntityListService:
+    @pytest.mark.asyncio
+    async def test_list_entity_returns_camel_cased_page_and_total(self):
+        db = AsyncMock()
+        db.execute_query.side_effect = [[{"id": 1, "cold_id": "CD-CHE-1", "case_title": "A v B"}], [{"n": 12}]]
+
+        items, total = await _service(AsyncEntityListService, db).list_entity(COURT_DECISIONS, jurisdiction="CHE")
+
+        assert [(i["coldId"], i["caseTitle"], i["caseCitation"]) for i in items] == [("CD-CHE-1", "A v B", None)]
+        assert total == 12
+        list_sql, count_sql = (call.args[0] for call in db.execute_query.await_args_list)
+        assert "LIMIT" in list_sql and count_sql.startswith("SELECT COUNT(*)")
+        assert all(call.args[1] == {"juris": "CHE"} for call in db.execute_query.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_failed_queries_give_an_empty_page(self):
+        db = AsyncMock()
+        db.execute_query.return_value = None
+
+        assert await _service(AsyncEntityListService, db).list_entity(COURT_DECISIONS) == ([], 0)
+
+    @pytest.mark.asyncio
+    async def test_count_all(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [{"k": "courtDecisions", "n": 4}, {"k": "literature", "n": None}]
+        counts = await _service(AsyncEntityListService, db).count_all("che")
+        assert counts == {"courtDecisions": 4, "literature": 0}
+        assert db.execute_query.await_args.args[1] == {"juris": "CHE"}
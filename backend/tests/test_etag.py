@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+
+from app.etag import FallbackETagMiddleware, generation_etag as _generation_etag, live_data_etag as _live_data_etag
+from app.services.database import Database
+from app.services.db_manager import db_manager
+
+
+def generation_etag(request: Request, response: Response) -> None:
+    asyncio.run(_generation_etag(request, response))
+
+
+def live_data_etag(request: Request, response: Response) -> None:
+    asyncio.run(_live_data_etag(request, response))
+
+
+def _request(path: str = "/api/v1/statistics/counts", query: str = "", if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": headers})
+
+
+@pytest.fixture
+def generation(monkeypatch):
+    monkeypatch.setattr(db_manager, "_refresh_generation", 4)
+    return monkeypatch
+
+
+def _etag(**kwargs) -> str:
+    response = Response()
+    generation_etag(_request(**kwargs), response)
+    return response.headers["etag"]
+
+
+class TestGenerationEtag:
+    def test_no_etag_while_generation_unknown(self, monkeypatch):
+        monkeypatch.setattr(db_manager, "_refresh_generation", None)
+        response = Response()
+        generation_etag(_request(if_none_match="*"), response)
+        assert "etag" not in response.headers
+
+    def test_etag_is_strong_and_stable(self, generation):
+        etag = _etag(query="table=Answers&id=1")
+        assert etag.startswith('"') and not etag.startswith("W/")
+        assert _etag(query="id=1&table=Answers") == etag
+
+    def test_etag_varies_with_params_path_and_generation(self, generation):
+        etag = _etag(query="jurisdiction=CHE")
+        assert _etag(query="jurisdiction=DEU") != etag
+        assert _etag(path="/api/v1/statistics/count-by-jurisdiction", query="jurisdiction=CHE") != etag
+        generation.setattr(db_manager, "_refresh_generation", 5)
+        assert _etag(query="jurisdiction=CHE") != etag
+
+    @pytest.mark.parametrize("header", ["{etag}", "W/{etag}", '"other", {etag}', "*"])
+    def test_matching_if_none_match_returns_304(self, generation, header):
+        etag = _etag()
+        with pytest.raises(HTTPException) as exc:
+            generation_etag(_request(if_none_match=header.format(etag=etag)), Response())
+        assert exc.value.status_code == 304
+        assert exc.value.headers == {"ETag": etag}
+
+    def test_stale_if_none_match_passes_through(self, generation):
+        response = Response()
+        generation_etag(_request(if_none_match='"stale"'), response)
+        assert response.headers["etag"] == _etag()
+
+
+@pytest.fixture
+def live_versions(monkeypatch):
+    monkeypatch.setattr(db_manager, "_refresh_generation", 4)
+    monkeypatch.setattr(db_manager, "_source_version", "12.40.1792260000.0")
+    return monkeypatch
+
+
+def _live_etag(**kwargs) -> str:
+    response = Response()
+    live_data_etag(_request(**kwargs), response)
+    return response.headers["etag"]
+
+
+class TestLiveDataEtag:
+    def test_no_etag_while_generation_unknown(self, live_versions):
+        live_versions.setattr(db_manager, "_refresh_generation", None)
+        response = Response()
+        live_data_etag(_request(if_none_match="*"), response)
+        assert "etag" not in response.headers
+
+    def test_falls_back_to_generation_etag_without_change_tracking(self, live_versions):
+        live_versions.setattr(db_manager, "_source_version", None)
+        assert _live_etag(query="jurisdiction=CHE") == _etag(query="jurisdiction=CHE")
+
+    def test_etag_changes_with_source_edits_between_refreshes(self, live_versions):
+        etag = _live_etag(query="jurisdiction=CHE")
+        live_versions.setattr(db_manager, "_source_version", "12.41.1792260060.0")
+        assert _live_etag(query="jurisdiction=CHE") != etag
+
+    def test_etag_changes_with_generation(self, live_versions):
+        etag = _live_etag()
+        live_versions.setattr(db_manager, "_refresh_generation", 5)
+        assert _live_etag() != etag
+
+    def test_differs_from_generation_etag(self, live_versions):
+        assert _live_etag() != _etag()
+
+    def test_matching_if_none_match_returns_304(self, live_versions):
+        etag = _live_etag()
+        with pytest.raises(HTTPException) as exc:
+            live_data_etag(_request(if_none_match=etag), Response())
+        assert exc.value.status_code == 304
+
+
+def _fallback_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(FallbackETagMiddleware)
+
+    @app.get("/rows", dependencies=[Depends(_live_data_etag)])
+    def rows(table: str) -> list[dict[str, Any]]:
+        return Database(connection_string="sqlite:///:memory:").execute_query(f"SELECT 1 AS one FROM {table}") or []
+
+    return app
+
+
+async def _get(app: FastAPI, query: str) -> tuple[int, dict[str, str]]:
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/rows",
+        "raw_path": b"/rows",
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    start = next(message for message in sent if message["type"] == "http.response.start")
+    return start["status"], {key.decode(): value.decode() for key, value in start["headers"]}
+
+
+class TestFallbackETagMiddleware:
+    @pytest.fixture(autouse=True)
+    def sqlite_pool(self):
+        db_manager._engine = None
+        db_manager._session_factory = None
+        yield
+        db_manager.dispose()
+
+    @pytest.mark.asyncio
+    async def test_successful_response_keeps_etag(self, live_versions):
+        status, headers = await _get(_fallback_app(), "table=(SELECT 1)")
+        assert status == 200
+        assert "etag" in headers
+
+    @pytest.mark.asyncio
+    async def test_response_after_swallowed_error_has_no_etag(self, live_versions):
+        status, headers = await _get(_fallback_app(), "table=missing_table")
+        assert status == 200
+        assert "etag" not in headers
+
+    @pytest.mark.asyncio
+    async def test_failures_do_not_leak_into_the_next_request(self, live_versions):
+        app = _fallback_app()
+        await _get(app, "table=missing_table")
+        _, headers = await _get(app, "table=(SELECT 1)")
+        assert "etag" in headers
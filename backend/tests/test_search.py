@@ -1,11 +1,35 @@
+import asyncio
+import csv
+import io
+import json
+import time
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
-from fastapi import HTTPException
+from fastapi import FastAPI, HTTPException, Response
 
-from app.routes.search import _coerce_filter_value, _parse_full_table_filter
+from app.routes.search import (
+    _coerce_filter_value,
+    _csv_lines,
+    _ndjson_lines,
+    _parse_full_table_filter,
+    _sparse_response,
+    get_async_search_service,
+    get_search_service,
+    router,
+)
 from app.schemas.details import TABLE_DETAIL_MODELS
 from app.schemas.entities import EntityBase
 from app.schemas.records import TABLE_RECORD_MODELS
-from app.schemas.responses import FullTextSearchResponse
+from app.schemas.relations import EntityRelations, RelationCounts
+from app.schemas.requests import MAX_DETAIL_BATCH, FTSFilterOption
+from app.schemas.responses import (
+    EntityDetailBatchResponse,
+    FullTextSearchResponse,
+    SearchFacetsResponse,
+    SearchSuggestResponse,
+)
 from app.schemas.search_result import (
     TABLE_SEARCH_MODELS,
     AnswerSearchResult,
@@ -14,6 +38,96 @@ from app.schemas.search_result import (
     SearchResultBase,
     validate_search_result,
 )
+from app.services.db_manager import db_manager
+from app.services.search import (
+    AsyncSearchService,
+    SearchService,
+    _decode_cursor,
+    _encode_cursor,
+    _projection_keys,
+    search_cache,
+    suggest_cache,
+)
+from app.services.search_cache import SearchResultCache
+
+
+@pytest.fixture(autouse=True)
+def _clear_search_cache():
+    search_cache.clear()
+    suggest_cache.clear()
+    SearchService._VIEW_COLUMNS.clear()
+    yield
+    search_cache.clear()
+    suggest_cache.clear()
+
+
+def _search_service_with_db(db: MagicMock) -> SearchService:
+    service = SearchService.__new__(SearchService)
+    service.db = db
+    return service
+
+
+def _async_search_service_with_db(db: AsyncMock) -> AsyncSearchService:
+    service = AsyncSearchService.__new__(AsyncSearchService)
+    service.db = db
+    return service
+
+
+async def _call_search_route(
+    db: AsyncMock, method: str, path: str, query: str = "", body: Any = None, sync_db: MagicMock | None = None
+) -> tuple[int, dict[str, str], Any]:
+    """Send one request through the search router with ``db`` behind ``AsyncSearchService``.
+
+    ``sync_db`` backs the ``SearchService`` used by the table export.
+    """
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_search_service] = lambda: _async_search_service_with_db(db)
+    app.dependency_overrides[get_search_service] = lambda: _search_service_with_db(sync_db or MagicMock())
+    requests = [{"type": "http.request", "body": b"" if body is None else json.dumps(body).encode()}]
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        if requests:
+            return requests.pop(0)
+        # Stay connected; streaming responses stop early on a disconnect.
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    start = next(message for message in sent if message["type"] == "http.response.start")
+    headers = {key.decode(): value.decode() for key, value in start["headers"]}
+    payload = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    if not headers.get("content-type", "").startswith("application/json"):
+        return start["status"], headers, payload.decode()
+    return start["status"], headers, json.loads(payload) if payload else None
+
+
+def _result_row(record_id: int, total: int = 1) -> dict:
+    return {
+        "source_table": "Answers",
+        "id": record_id,
+        "complete_record": {},
+        "sort_key": [0, 0, 0, -1.0, "Answers", record_id],
+        "total_count": total,
+    }
 
 
 class TestValidateSearchResult:
@@ -215,3 +329,744 @@ class TestParseFullTableFilter:
         with pytest.raises(HTTPException) as exc:
             _parse_full_table_filter(":value")
         assert exc.value.status_code == 400
+
+
+class TestSearchCursor:
+    def test_round_trip(self):
+        key = [1, -3, 0, -0.0607927, "Court Decisions", 42]
+        assert _decode_cursor(_encode_cursor(key)) == key
+
+    def test_cursor_is_url_safe(self):
+        cursor = _encode_cursor([0, 0, 0, -1.0, "Answers", 1])
+        assert "=" not in cursor
+        assert "+" not in cursor
+        assert "/" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", _encode_cursor([1, 2, 3]), "e30"])
+    def test_invalid_cursor_raises(self, cursor: str):
+        with pytest.raises(ValueError, match="Invalid search cursor"):
+            _decode_cursor(cursor)
+
+    @pytest.mark.asyncio
+    async def test_full_page_returns_next_cursor(self):
+        db = AsyncMock()
+        rows = [
+            {"source_table": "Answers", "id": i, "complete_record": {}, "rank": 1.0, "sort_key": [0, 0, 0, -1.0, "Answers", i]}
+            for i in (1, 2)
+        ]
+        for row in rows:
+            row["total_count"] = 5
+        db.execute_query.return_value = rows
+        result = await _async_search_service_with_db(db).full_text_search("autonomy", page_size=2)
+        assert db.execute_query.call_count == 1
+        assert result["total_matches"] == 5
+        assert _decode_cursor(result["next_cursor"]) == [0, 0, 0, -1.0, "Answers", 2]
+
+    @pytest.mark.asyncio
+    async def test_short_page_has_no_next_cursor(self):
+        db = AsyncMock()
+        rows = [
+            {
+                "source_table": "Answers",
+                "id": 1,
+                "complete_record": {},
+                "sort_key": [0, 0, 0, -1.0, "Answers", 1],
+                "total_count": 1,
+            }
+        ]
+        db.execute_query.return_value = rows
+        result = await _async_search_service_with_db(db).full_text_search("autonomy", page_size=2)
+        assert result["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_is_passed_as_after_key(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        cursor = _encode_cursor([0, 0, 0, -0.5, "Literature", 7])
+        await _async_search_service_with_db(db).full_text_search("autonomy", cursor=cursor)
+        search_params = db.execute_query.call_args_list[0].args[1]
+        assert search_params["after_key"] == '[0, 0, 0, -0.5, "Literature", 7]'
+
+    @pytest.mark.asyncio
+    async def test_keyset_responses_have_no_page(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        cursor = _encode_cursor([0, 0, 0, -0.5, "Literature", 7])
+        status, _, body = await _call_search_route(db, "GET", "/search/", f"search_string=x&cursor={cursor}")
+        assert status == 200
+        assert "page" not in body
+        status, _, body = await _call_search_route(db, "GET", "/search/", "search_string=x")
+        assert body["page"] == 1
+
+    def test_response_schema_lists_its_properties(self):
+        app = FastAPI()
+        app.include_router(router)
+        schema = app.openapi()["components"]["schemas"]["FullTextSearchResponse"]
+        assert {"totalMatches", "page", "pageSize", "nextCursor", "results"} <= set(schema["properties"])
+
+    @pytest.mark.asyncio
+    async def test_page_and_cursor_cannot_be_combined(self):
+        db = AsyncMock()
+        cursor = _encode_cursor([0, 0, 0, -0.5, "Literature", 7])
+        status, _, body = await _call_search_route(db, "GET", "/search/", f"search_string=x&page=2&cursor={cursor}")
+        assert status == 422
+        assert "cursor" in body["detail"]
+        db.execute_query.assert_not_called()
+
+
+class TestSearchTotal:
+    @pytest.mark.asyncio
+    async def test_empty_first_page_runs_no_separate_count_query(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        result = await _async_search_service_with_db(db).full_text_search("nothing matches")
+        labels = [call.kwargs["label"] for call in db.execute_query.call_args_list]
+        assert labels == ["search_all_v2", "search_fallback"]
+        assert result["total_matches"] == 0
+
+    @pytest.mark.parametrize("kwargs", [{"page": 5}, {"cursor": _encode_cursor([0, 0, 0, -0.5, "Literature", 7])}])
+    @pytest.mark.asyncio
+    async def test_page_past_end_reads_the_total_only_row(self, kwargs):
+        db = AsyncMock()
+        total_only = {"source_table": None, "id": None, "complete_record": None, "sort_key": None, "total_count": 12}
+        db.execute_query.return_value = [total_only]
+        result = await _async_search_service_with_db(db).full_text_search("autonomy", page_size=10, **kwargs)
+        assert result["total_matches"] == 12
+        assert result["results"] == []
+        assert result["next_cursor"] is None
+        assert db.execute_query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_estimate_total_is_forwarded_and_flagged(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [{"source_table": "Answers", "id": 1, "complete_record": {}, "total_count": 900}]
+        result = await _async_search_service_with_db(db).full_text_search("autonomy", estimate_total=True)
+        assert db.execute_query.call_args.args[1]["exact_count"] is False
+        assert result["total_is_estimate"] is True
+        assert result["total_matches"] == 900
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_take_the_estimated_total(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        cursor = _encode_cursor([0, 0, 0, -0.5, "Literature", 7])
+        result = await _async_search_service_with_db(db).full_text_search("autonomy", cursor=cursor)
+        assert db.execute_query.call_args.args[1]["exact_count"] is False
+        assert result["total_is_estimate"] is True
+
+
+class TestSearchFacetFilters:
+    def test_jurisdictions_and_themes_are_normalized_keys(self):
+        filters = [
+            FTSFilterOption(column="jurisdictions", values=[" Switzerland ", "DEU", ""]),
+            FTSFilterOption(column="themes", values=["Party Autonomy"]),
+            FTSFilterOption(column="tables", values=["Court Decisions"]),
+        ]
+        tables, jurisdictions, themes = SearchService._extract_filters(filters)
+        assert tables == ["Court Decisions"]
+        assert jurisdictions == ["switzerland", "deu"]
+        assert themes == ["party autonomy"]
+
+    @pytest.mark.asyncio
+    async def test_filter_case_does_not_change_cache_key(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        service = _async_search_service_with_db(db)
+        await service.full_text_search("x", [FTSFilterOption(column="jurisdictions", values=["CHE"])])
+        await service.full_text_search("x", [FTSFilterOption(column="jurisdictions", values=["che"])])
+        assert db.execute_query.call_count == 1
+        assert db.execute_query.call_args.args[1]["filter_jurisdictions"] == ["che"]
+
+
+class TestDidYouMean:
+    @pytest.mark.asyncio
+    async def test_empty_first_page_returns_corrected_results(self):
+        db = AsyncMock()
+        db.execute_query.side_effect = [[], [{**_result_row(1, total=7), "suggestion": "party autonomy"}]]
+        result = await _async_search_service_with_db(db).full_text_search("party autonmy", page_size=1)
+        assert result["did_you_mean"] == "party autonomy"
+        assert result["total_matches"] == 7
+        assert len(result["results"]) == 1
+        assert result["next_cursor"] is None
+        fallback = db.execute_query.call_args_list[1]
+        assert fallback.kwargs == {"label": "search_fallback"}
+        assert "page" not in fallback.args[1] and "after_key" not in fallback.args[1]
+
+    @pytest.mark.asyncio
+    async def test_no_suggestion_leaves_response_empty(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        result = await _async_search_service_with_db(db).full_text_search("xyzzy")
+        assert db.execute_query.call_count == 2
+        assert result["did_you_mean"] is None
+        assert result["total_matches"] == 0
+
+    @pytest.mark.parametrize("kwargs", [{"search_string": "  "}, {"search_string": "x", "page": 2}])
+    @pytest.mark.asyncio
+    async def test_fallback_only_for_a_term_on_the_first_page(self, kwargs):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        await _async_search_service_with_db(db).full_text_search(**kwargs)
+        labels = [call.kwargs["label"] for call in db.execute_query.call_args_list]
+        assert "search_fallback" not in labels
+
+    @pytest.mark.asyncio
+    async def test_matches_skip_the_fallback(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        result = await _async_search_service_with_db(db).full_text_search("autonomy")
+        assert db.execute_query.call_count == 1
+        assert result["did_you_mean"] is None
+
+
+class TestSearchResultCache:
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_served_from_cache(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        service = _async_search_service_with_db(db)
+        first = await service.full_text_search("Party  Autonomy")
+        second = await service.full_text_search(" party autonomy ")
+        assert db.execute_query.call_count == 1
+        assert second["results"] == first["results"]
+        assert second["query"] == " party autonomy "
+
+    @pytest.mark.asyncio
+    async def test_cached_response_survives_caller_mutation(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        service = _async_search_service_with_db(db)
+        (await service.full_text_search("autonomy")).pop("results")
+        assert len((await service.full_text_search("autonomy"))["results"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_results_survive_nested_mutation(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        service = _async_search_service_with_db(db)
+        (await service.full_text_search("autonomy"))["results"][0]["id"] = "changed"
+        (await service.full_text_search("autonomy"))["results"].append({"id": "extra"})
+        results = (await service.full_text_search("autonomy"))["results"]
+        assert [r["id"] for r in results] == [1]
+        assert db.execute_query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_filter_order_does_not_change_key(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        service = _async_search_service_with_db(db)
+        await service.full_text_search("x", [FTSFilterOption(column="tables", values=["Answers", "Literature"])])
+        await service.full_text_search("x", [FTSFilterOption(column="tables", values=["Literature", "Answers"])])
+        assert db.execute_query.call_count == 1
+
+    @pytest.mark.parametrize("change", [{"page": 2}, {"page_size": 10}, {"sort_by_date": True}, {"query_syntax": "websearch"}])
+    @pytest.mark.asyncio
+    async def test_paging_and_sort_are_part_of_key(self, change):
+        db = AsyncMock()
+        db.execute_query.return_value = [_result_row(1)]
+        service = _async_search_service_with_db(db)
+        await service.full_text_search("autonomy")
+        await service.full_text_search("autonomy", **change)
+        assert db.execute_query.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_results_are_not_cached(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        service = _async_search_service_with_db(db)
+        await service.full_text_search("autonomy")
+        await service.full_text_search("autonomy")
+        labels = [call.kwargs["label"] for call in db.execute_query.call_args_list]
+        assert labels.count("search_all_v2") == 2
+
+    def test_generation_change_invalidates(self):
+        generation = [1]
+        cache = SearchResultCache(generation_provider=lambda: generation[0])
+        cache.put("k", {"results": [1]})
+        assert cache.get("k") == {"results": [1]}
+        generation[0] = 2
+        assert cache.get("k") is None
+        assert cache.stats() == {"entries": 0, "hits": 1, "misses": 1}
+
+    def test_lru_eviction_and_ttl(self, monkeypatch):
+        cache = SearchResultCache(max_entries=2, ttl_seconds=10)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+        cache.put("c", {})
+        assert cache.get("b") is None
+        assert cache.get("a") == {}
+        clock = time.monotonic() + 11
+        monkeypatch.setattr("app.services.search_cache.time.monotonic", lambda: clock)
+        assert cache.get("a") is None
+
+
+class TestSearchFacets:
+    ROWS = [
+        {"facet": "total", "value": None, "hits": 5},
+        {"facet": "table", "value": "Literature", "hits": 2},
+        {"facet": "table", "value": "Answers", "hits": 3},
+        {"facet": "jurisdiction", "value": "Switzerland", "hits": 4},
+        {"facet": "theme", "value": "Party autonomy", "hits": 1},
+    ]
+
+    @pytest.mark.asyncio
+    async def test_rows_are_grouped_by_facet_and_ordered_by_hits(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self.ROWS
+        result = await _async_search_service_with_db(db).search_facets("autonomy")
+        assert result["total_matches"] == 5
+        assert list(result["tables"].items()) == [("Answers", 3), ("Literature", 2)]
+        assert result["jurisdictions"] == {"Switzerland": 4}
+        assert result["themes"] == {"Party autonomy": 1}
+        assert SearchFacetsResponse(**result).total_matches == 5
+
+    @pytest.mark.asyncio
+    async def test_filters_are_passed_as_keys_and_cached(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self.ROWS
+        service = _async_search_service_with_db(db)
+        filters = [FTSFilterOption(column="jurisdictions", values=["CHE"])]
+        await service.search_facets("autonomy", filters)
+        await service.search_facets("autonomy", filters)
+        assert db.execute_query.call_count == 1
+        assert db.execute_query.call_args.args[1]["filter_jurisdictions"] == ["che"]
+        assert db.execute_query.call_args.kwargs == {"label": "search_facets"}
+
+    @pytest.mark.asyncio
+    async def test_query_syntax_is_forwarded_and_keyed(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self.ROWS
+        service = _async_search_service_with_db(db)
+        await service.search_facets("autonomy")
+        await service.search_facets("autonomy", query_syntax="websearch")
+        assert db.execute_query.call_count == 2
+        assert db.execute_query.call_args.args[1]["query_syntax"] == "websearch"
+
+    @pytest.mark.asyncio
+    async def test_route_builds_filters_from_query_parameters(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self.ROWS
+        status, _, body = await _call_search_route(
+            db, "GET", "/search/facets", "search_string=autonomy&tables=Answers&jurisdictions=CHE&themes=Arbitration"
+        )
+        assert status == 200
+        assert body["totalMatches"] == 5
+        assert body["tables"] == {"Answers": 3, "Literature": 2}
+        assert [f["column"] for f in body["filters"]] == ["tables", "jurisdictions", "themes"]
+        params = db.execute_query.call_args.args[1]
+        assert (params["filter_tables"], params["filter_jurisdictions"], params["filter_themes"]) == (
+            ["Answers"],
+            ["che"],
+            ["arbitration"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_route_rejects_unknown_query_syntax(self):
+        db = AsyncMock()
+        status, _, _ = await _call_search_route(db, "GET", "/search/facets", "search_string=x&query_syntax=regex")
+        assert status == 422
+        db.execute_query.assert_not_called()
+
+
+class TestSearchSuggest:
+    ROWS = [{"label": "Switzerland", "source_table": "Jurisdictions", "id": "CHE"}]
+
+    @pytest.mark.asyncio
+    async def test_prefix_is_normalized_escaped_and_forwarded(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self.ROWS
+        result = await _async_search_service_with_db(db).suggest("  Art_19  100% ", ["Literature", "Court Decisions"], 5)
+        assert db.execute_query.call_args.args[1] == {
+            "prefix": "art\\_19 100\\%",
+            "filter_tables": ["Court Decisions", "Literature"],
+            "max_results": 5,
+        }
+        assert db.execute_query.call_args.kwargs == {"label": "search_suggest"}
+        assert SearchSuggestResponse(**result).suggestions[0].id == "CHE"
+
+    @pytest.mark.asyncio
+    async def test_hot_prefixes_are_cached(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self.ROWS
+        service = _async_search_service_with_db(db)
+        hits = suggest_cache.stats()["hits"]
+        await service.suggest("Swi")
+        result = await service.suggest("swi ")
+        assert db.execute_query.await_count == 1
+        assert result["prefix"] == "swi "
+        assert result["suggestions"] == self.ROWS
+        assert suggest_cache.stats()["hits"] == hits + 1
+
+    @pytest.mark.parametrize("change", [{"prefix": "swit"}, {"tables": ["Jurisdictions"]}, {"limit": 5}])
+    @pytest.mark.asyncio
+    async def test_other_prefixes_tables_and_limits_miss(self, change):
+        db = AsyncMock()
+        db.execute_query.return_value = self.ROWS
+        service = _async_search_service_with_db(db)
+        hits = suggest_cache.stats()["hits"]
+        await service.suggest("swi")
+        await service.suggest(**{"prefix": "swi", **change})
+        assert db.execute_query.await_count == 2
+        assert suggest_cache.stats()["hits"] == hits
+
+    @pytest.mark.asyncio
+    async def test_empty_answers_are_not_cached(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        service = _async_search_service_with_db(db)
+        await service.suggest("zz")
+        await service.suggest("zz")
+        assert db.execute_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_blank_prefix_skips_the_database(self):
+        db = AsyncMock()
+        assert await _async_search_service_with_db(db).suggest("   ") == {"prefix": "   ", "suggestions": []}
+        db.execute_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_route_serves_repeated_prefixes_from_the_cache(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self.ROWS
+        first = await _call_search_route(db, "GET", "/search/suggest", "prefix=Swi&limit=5")
+        second = await _call_search_route(db, "GET", "/search/suggest", "prefix=swi&limit=5")
+        assert first[0] == second[0] == 200
+        assert second[2] == {
+            "prefix": "swi",
+            "suggestions": [{"label": "Switzerland", "sourceTable": "Jurisdictions", "id": "CHE"}],
+        }
+        assert db.execute_query.await_count == 1
+
+
+class TestEntityDetailBatch:
+    @staticmethod
+    def _row(ord_, table, record_id, cold_id):
+        return {
+            "ord": ord_,
+            "source_table": table,
+            "record_id": record_id,
+            "cold_id": cold_id,
+            "base_record": {"title": cold_id},
+            "relations": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_keys_are_deduplicated_and_results_follow_request_order(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [
+            self._row(1, "Literature", 5, "LIT-5"),
+            self._row(2, "Literature", None, None),
+            self._row(3, "Court Decisions", 7, "CD-7"),
+        ]
+        keys = [("Literature", "LIT-5"), ("Literature", "LIT-404"), ("Literature", "LIT-5"), ("Court Decisions", "CD-7")]
+        result = await _async_search_service_with_db(db).get_entity_details(keys)
+
+        sql, params = db.execute_query.call_args.args
+        assert "WITH ORDINALITY" in sql
+        assert params == {
+            "table_names": ["Literature", "Literature", "Court Decisions"],
+            "cold_ids": ["LIT-5", "LIT-404", "CD-7"],
+            "fields": None,
+            "include_relations": None,
+            "relation_limit": None,
+        }
+        assert db.execute_query.call_args.kwargs == {"label": "get_entity_details"}
+        assert [detail["cold_id"] for detail in result["results"]] == ["LIT-5", "CD-7"]
+        assert result["missing"] == [{"table": "Literature", "id": "LIT-404"}]
+        assert EntityDetailBatchResponse(**result).missing[0].id == "LIT-404"
+
+    @pytest.mark.asyncio
+    async def test_unknown_table_is_rejected_before_querying(self):
+        db = AsyncMock()
+        with pytest.raises(ValueError, match="Unsupported table"):
+            await _async_search_service_with_db(db).get_entity_details([("Literature", "LIT-5"), ("Nope", "X-1")])
+        db.execute_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_route_returns_results_in_request_order(self):
+        db = AsyncMock()
+        # The query returns rows in any order; ord ties them back to the request.
+        db.execute_query.return_value = [
+            self._row(3, "Literature", 5, "LIT-5"),
+            self._row(1, "Court Decisions", 7, "CD-7"),
+            self._row(2, "Literature", None, None),
+        ]
+        items = [
+            {"table": "Court Decisions", "id": "CD-7"},
+            {"table": "Literature", "id": "LIT-404"},
+            {"table": "Literature", "id": "LIT-5"},
+            {"table": "Court Decisions", "id": "CD-7"},
+        ]
+        status, _, body = await _call_search_route(db, "POST", "/search/details/batch", body={"items": items})
+        assert status == 200
+        assert [(r["sourceTable"], r["coldId"]) for r in body["results"]] == [
+            ("Court Decisions", "CD-7"),
+            ("Literature", "LIT-5"),
+        ]
+        assert body["missing"] == [{"table": "Literature", "id": "LIT-404"}]
+
+    @pytest.mark.asyncio
+    async def test_route_enforces_the_batch_size_limit(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        item = {"table": "Literature", "id": "LIT-5"}
+        status, _, _ = await _call_search_route(db, "POST", "/search/details/batch", body={"items": [item] * MAX_DETAIL_BATCH})
+        assert status == 200
+        for items in ([item] * (MAX_DETAIL_BATCH + 1), []):
+            status, _, body = await _call_search_route(db, "POST", "/search/details/batch", body={"items": items})
+            assert status == 422
+            assert body["detail"][0]["loc"] == ["body", "items"]
+        assert db.execute_query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_route_rejects_unknown_tables_with_400(self):
+        db = AsyncMock()
+        status, _, _ = await _call_search_route(
+            db, "POST", "/search/details/batch", body={"items": [{"table": "Nope", "id": "X-1"}]}
+        )
+        assert status == 400
+        db.execute_query.assert_not_called()
+
+
+class TestFullTableExport:
+    ROWS = [
+        {"source_table": "Court Decisions", "id": "CD-CHE-1", "cold_id": "CD-CHE-1", "Case_Title": "A v B", "Themes": "x"},
+        {"source_table": "Court Decisions", "id": "CD-CHE-2", "cold_id": "CD-CHE-2", "Case_Title": "C, D", "Themes": None},
+    ]
+
+    def test_ndjson_emits_one_camel_cased_record_per_line(self):
+        lines = list(_ndjson_lines(iter(self.ROWS)))
+        assert len(lines) == 2
+        assert all(line.endswith("\n") for line in lines)
+        first = json.loads(lines[0])
+        assert first["coldId"] == "CD-CHE-1"
+        assert first["caseTitle"] == "A v B"
+
+    def test_csv_writes_header_once_and_quotes_values(self):
+        reader = csv.DictReader(io.StringIO("".join(_csv_lines(iter(self.ROWS)))))
+        records = list(reader)
+        assert [r["coldId"] for r in records] == ["CD-CHE-1", "CD-CHE-2"]
+        assert records[1]["caseTitle"] == "C, D"
+
+    @pytest.mark.parametrize("encode", [_ndjson_lines, _csv_lines])
+    def test_stream_error_aborts_the_transfer(self, encode):
+        def rows():
+            yield self.ROWS[0]
+            raise RuntimeError("connection lost")
+
+        lines = encode(rows())
+        assert next(lines)
+        with pytest.raises(RuntimeError, match="connection lost"):
+            list(lines)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("format_", ["ndjson", "csv"])
+    async def test_streamed_export_keeps_the_etag(self, monkeypatch, format_):
+        monkeypatch.setattr(db_manager, "_refresh_generation", 4)
+        sync_db = MagicMock()
+        sync_db.iter_query.return_value = iter([{"record_id": 1, "complete_record": {"cold_id": "LIT-1"}}])
+        status, headers, body = await _call_search_route(
+            AsyncMock(), "GET", "/search/full_table", f"table=Literature&format={format_}", sync_db=sync_db
+        )
+        assert status == 200
+        assert "LIT-1" in body
+        assert headers["etag"].startswith('"')
+
+    def test_iter_table_rejects_unknown_table_eagerly(self):
+        with pytest.raises(ValueError, match="Unsupported table"):
+            _search_service_with_db(MagicMock()).iter_table("Nope")
+
+    def test_iter_table_reads_in_batches(self):
+        db = MagicMock()
+        db.iter_query.return_value = iter([{"record_id": 1, "complete_record": {"cold_id": "LIT-1"}}] * 2)
+        records = list(_search_service_with_db(db).iter_table("Literature", batch_size=250))
+        assert db.iter_query.call_args.kwargs == {"batch_size": 250}
+        assert [r["id"] for r in records] == ["LIT-1", "LIT-1"]
+
+
+class TestEntityRelations:
+    @staticmethod
+    def _rows(count, start=1):
+        return [{"position": start + i, "item": {"id": start + i}} for i in range(count)]
+
+    def test_relation_kinds_match_the_relation_models(self):
+        assert SearchService.VALID_RELATION_KINDS == set(EntityRelations.model_fields)
+        assert set(RelationCounts.model_fields) == set(EntityRelations.model_fields)
+
+    @pytest.mark.asyncio
+    async def test_page_requests_one_extra_row_and_returns_the_next_position(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self._rows(3, start=11)
+        page = await _async_search_service_with_db(db).get_entity_relations("Jurisdictions", "CHE", "courtDecisions", 10, 2)
+        params = db.execute_query.call_args.args[1]
+        assert params == {"table_name": "Jurisdictions", "cold_id": "CHE", "kind": "court_decisions", "after": 10, "limit": 3}
+        assert page == {"kind": "court_decisions", "items": [{"id": 11}, {"id": 12}], "next_after": 12}
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_next_position(self):
+        db = AsyncMock()
+        db.execute_query.return_value = self._rows(2, start=13)
+        page = await _async_search_service_with_db(db).get_entity_relations("Jurisdictions", "CHE", "themes", 12, 2)
+        assert page["next_after"] is None
+        assert page["items"] == [{"id": 13}, {"id": 14}]
+
+    @pytest.mark.asyncio
+    async def test_page_past_the_end_is_empty(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        page = await _async_search_service_with_db(db).get_entity_relations("Jurisdictions", "CHE", "themes", 99)
+        assert page == {"kind": "themes", "items": [], "next_after": None}
+
+    @pytest.mark.parametrize(
+        "args",
+        [("Nope", "X", "themes", 0, 10), ("Jurisdictions", "CHE", "nope", 0, 10), ("Jurisdictions", "CHE", "themes", -1, 10)],
+    )
+    @pytest.mark.asyncio
+    async def test_invalid_requests_are_rejected_before_querying(self, args):
+        db = AsyncMock()
+        with pytest.raises(ValueError):
+            await _async_search_service_with_db(db).get_entity_relations(*args)
+        db.execute_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_route_follows_the_cursor_to_the_last_page(self):
+        db = AsyncMock()
+        db.execute_query.side_effect = [self._rows(3, start=1), self._rows(1, start=3)]
+        path = "/search/details/Jurisdictions/CHE/relations/themes"
+        status, _, first = await _call_search_route(db, "GET", path, "limit=2")
+        assert status == 200
+        assert ([item["id"] for item in first["items"]], first["nextAfter"]) == ([1, 2], 2)
+        status, _, last = await _call_search_route(db, "GET", path, f"after={first['nextAfter']}&limit=2")
+        assert ([item["id"] for item in last["items"]], last["nextAfter"]) == ([3], None)
+        assert db.execute_query.call_args.args[1]["after"] == 2
+
+    @pytest.mark.asyncio
+    async def test_route_rejects_unknown_kind_with_400(self):
+        db = AsyncMock()
+        status, _, body = await _call_search_route(db, "GET", "/search/details/Jurisdictions/CHE/relations/nope")
+        assert status == 400
+        assert body == {"detail": "Unsupported relation: nope"}
+        db.execute_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_detail_relation_limit_is_forwarded(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        await _async_search_service_with_db(db).get_entity_detail("Jurisdictions", "CHE", relation_limit=5)
+        sql, params = db.execute_query.call_args.args
+        assert "relation_counts" in sql
+        assert params["relation_limit"] == 5
+        with pytest.raises(ValueError):
+            await _async_search_service_with_db(db).get_entity_detail("Jurisdictions", "CHE", relation_limit=-1)
+
+
+class TestSparseFieldsets:
+    COLUMNS = [{"column_name": name} for name in ("id", "cold_id", "case_citation", "original_text", "themes")]
+
+    def test_field_names_are_snake_cased_split_and_deduplicated(self):
+        assert _projection_keys(None) is None
+        assert _projection_keys([""]) == []
+        assert _projection_keys(["caseCitation, date_of_judgment", "case_citation"]) == [
+            "case_citation",
+            "date_of_judgment",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_detail_projection_is_forwarded(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        await _async_search_service_with_db(db).get_entity_detail("Court Decisions", "CD-1", ["caseCitation"], [""])
+        sql, params = db.execute_query.call_args.args
+        assert "jsonb_each(d.relations)" in sql
+        assert params["fields"] == ["case_citation"]
+        assert params["include_relations"] == []
+
+    def test_full_table_selects_only_requested_columns(self):
+        db = MagicMock()
+        db.execute_query.side_effect = [self.COLUMNS, [{"record_id": 1, "complete_record": {"id": 1, "cold_id": "CD-1"}}]]
+        service = _search_service_with_db(db)
+        rows = service.full_table("Court Decisions", fields=["caseCitation", "bogus"])
+        sql = db.execute_query.call_args.args[0]
+        assert 'SELECT c."id", c."case_citation", c."cold_id"' in sql
+        assert "original_text" not in sql
+        assert "to_jsonb(c.*)" not in sql
+        assert "LEFT JOIN" not in sql
+        assert rows[0]["id"] == "CD-1"
+
+        db.execute_query.side_effect = [[]]
+        service.full_table("Court Decisions", fields=["themes"])
+        sql = db.execute_query.call_args.args[0]
+        assert "LEFT JOIN data_views.court_decisions sv" in sql
+        assert "'themes', sv.\"Themes\"" in sql
+        assert 'c."themes"' not in sql
+        assert db.execute_query.call_count == 3
+
+    def test_without_fields_the_whole_row_is_read(self):
+        db = MagicMock()
+        db.execute_query.return_value = []
+        _search_service_with_db(db).full_table("Literature")
+        assert "to_jsonb(c.*)" in db.execute_query.call_args.args[0]
+        assert db.execute_query.call_count == 1
+
+    def test_export_leaves_out_unselected_fields(self):
+        row = {"source_table": "Court Decisions", "id": "CD-1", "cold_id": "CD-1", "case_citation": "X"}
+        assert json.loads(next(_ndjson_lines(iter([row]), True))) == {
+            "sourceTable": "Court Decisions",
+            "id": "CD-1",
+            "coldId": "CD-1",
+            "caseCitation": "X",
+        }
+        assert "caseTitle" in json.loads(next(_ndjson_lines(iter([row]))))
+
+    def test_sparse_response_keeps_the_etag(self):
+        response = Response()
+        response.headers["ETag"] = '"abc"'
+        sparse = _sparse_response({"id": 1}, response)
+        assert sparse.headers["etag"] == '"abc"'
+        assert json.loads(sparse.body) == {"id": 1}
+
+
+class TestAsyncSearchService:
+    @pytest.mark.asyncio
+    async def test_entity_detail_rejects_unknown_table(self):
+        with pytest.raises(ValueError, match="Unsupported table"):
+            await _async_search_service_with_db(AsyncMock()).get_entity_detail("Nope", "X-1")
+
+    @pytest.mark.asyncio
+    async def test_entity_detail_flattens_base_record(self):
+        db = AsyncMock()
+        db.execute_query.return_value = [
+            {
+                "source_table": "Literature",
+                "record_id": 5,
+                "cold_id": "LIT-5",
+                "base_record": {"title": "T"},
+                "relations": None,
+            }
+        ]
+        detail = await _async_search_service_with_db(db).get_entity_detail("Literature", "LIT-5")
+        assert detail == {
+            "source_table": "Literature",
+            "id": 5,
+            "cold_id": "LIT-5",
+            "title": "T",
+            "relations": {},
+            "relation_counts": {},
+        }
+
+    @pytest.mark.asyncio
+    async def test_entity_detail_reads_the_cache_before_building_live(self):
+        db = AsyncMock()
+        db.execute_query.return_value = []
+        assert await _async_search_service_with_db(db).get_entity_detail("Literature", "L-5") is None
+        sql, params = db.execute_query.await_args.args
+        assert sql.index("data_views.entity_detail_cache") < sql.index("data_views.get_entity_detail")
+        assert "NOT EXISTS" in sql
+        assert params == {
+            "table_name": "Literature",
+            "cold_id": "L-5",
+            "fields": None,
+            "include_relations": None,
+            "relation_limit": None,
+        }